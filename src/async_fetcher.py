@@ -0,0 +1,250 @@
+"""Native asyncio fetch engine for single posts using a pooled httpx.AsyncClient."""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+from instaloader.exceptions import (
+    ConnectionException,
+    InstaloaderException,
+    LoginRequiredException,
+)
+from instaloader.instaloadercontext import default_user_agent
+
+from .call_usage import record_upstream_request
+from .governor import OutboundGovernor
+from .loader_pool import is_throttle_error
+
+# Same persisted GraphQL query instaloader's Post.from_shortcode uses
+POST_DOC_ID = "27128499623469141"
+GRAPHQL_URL = "https://www.instagram.com/graphql/query"
+MEDIA_TYPES = {1: "GraphImage", 2: "GraphVideo", 8: "GraphSidecar"}
+
+
+def media_to_node(media: dict[str, Any]) -> dict[str, Any]:
+    """
+    Map a web_info media item to a post node as cached by fetch_post.
+
+    Mirrors instaloader's ``Post._normalize_post_data``: the media item is
+    kept whole and the legacy keys ``Post`` reads are added, except that
+    play counts missing from the item are left out rather than fetched with
+    an extra request.
+
+    Args:
+        media: Item from ``xdt_api__v1__media__shortcode__web_info.items``
+
+    Returns:
+        Node that ``instaloader.Post`` (and ``project_node``) can read
+    """
+    media_type = media.get("media_type")
+    caption = media.get("caption")
+    caption_text = caption.get("text") if isinstance(caption, dict) else None
+    user = media.get("user") or {}
+    candidates = (media.get("image_versions2") or {}).get("candidates") or []
+    video_versions = media.get("video_versions") or []
+    return {
+        **media,
+        "shortcode": media["code"],
+        "id": media.get("pk"),
+        "__typename": MEDIA_TYPES.get(media_type, "GraphImage"),
+        "is_video": media_type == 2,
+        "taken_at_timestamp": media.get("taken_at"),
+        "owner": {
+            "id": user.get("pk"),
+            "username": user.get("username", ""),
+            "full_name": user.get("full_name", ""),
+        },
+        "display_url": candidates[0]["url"] if candidates else None,
+        "video_url": video_versions[0]["url"] if video_versions else None,
+        "video_duration": media.get("video_duration"),
+        "video_view_count": media.get("view_count"),
+        "edge_media_to_caption": {
+            "edges": [{"node": {"text": caption_text}}]
+            if caption_text is not None
+            else []
+        },
+        "edge_media_preview_like": {"count": media.get("like_count") or 0},
+        "edge_media_to_parent_comment": {
+            "count": media.get("comment_count") or 0,
+            "edges": [],
+        },
+    }
+
+
+class AsyncPostFetcher:
+    """
+    Fetch single posts and reels without threads.
+
+    Makes the same doc_id GraphQL request as ``Post.from_shortcode`` through
+    one long-lived ``httpx.AsyncClient`` with connection pooling and HTTP/2
+    multiplexing, so many concurrent fetches cost coroutines rather than
+    executor threads.
+    """
+
+    def __init__(
+        self,
+        cookies: dict[str, str] | None = None,
+        max_connections: int = 100,
+        timeout: float = 10.0,
+        http2: bool = True,
+        governor: OutboundGovernor | None = None,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            cookies: Optional session cookies (e.g. from an instaloader session)
+            max_connections: Maximum number of pooled connections
+            timeout: Request timeout in seconds
+            http2: Whether to negotiate HTTP/2
+            governor: Optional pacer for the requests to Instagram, told about 429s
+        """
+        self.cookies = dict(cookies or {})
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.http2 = http2
+        self.governor = governor
+        self._client: httpx.AsyncClient | None = None
+        self._csrf_lock: asyncio.Lock | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared AsyncClient on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                cookies=self.cookies,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={
+                    "User-Agent": default_user_agent(),
+                    "Accept": "*/*",
+                    "Accept-Language": "en-US,en;q=0.8",
+                    "Origin": "https://www.instagram.com",
+                    "Referer": "https://www.instagram.com/",
+                    "x-ig-app-id": "936619743392459",
+                },
+            )
+        return self._client
+
+    async def _acquire(self) -> None:
+        """Wait for the governor's next slot, billing the request to the call."""
+        if self.governor is not None:
+            await self.governor.acquire_async()
+        else:
+            record_upstream_request()
+
+    async def _csrf_token(self) -> str:
+        """Return the CSRF token, fetching the home page once if none is set."""
+        client = self._get_client()
+        token = client.cookies.get("csrftoken")
+        if token:
+            return token
+        if self._csrf_lock is None:
+            self._csrf_lock = asyncio.Lock()
+        async with self._csrf_lock:
+            token = client.cookies.get("csrftoken")
+            if not token:
+                await self._acquire()
+                response = await client.get("https://www.instagram.com/")
+                if response.status_code == 429:
+                    if self.governor is not None:
+                        self.governor.on_throttle()
+                    raise ConnectionException(
+                        "Network error while fetching post: 429 Too Many Requests"
+                    )
+                token = client.cookies.get("csrftoken") or ""
+        return token
+
+    async def fetch(self, shortcode: str) -> dict[str, Any]:
+        """
+        Fetch a post by shortcode.
+
+        Returns:
+            Raw post node (see ``media_to_node``)
+
+        Raises:
+            ValueError: If the post does not exist
+            LoginRequiredException: If the post requires authentication
+            ConnectionException: On network errors or throttling
+            InstaloaderException: On unexpected responses
+        """
+        client = self._get_client()
+        try:
+            csrf = await self._csrf_token()
+            await self._acquire()
+            response = await client.post(
+                GRAPHQL_URL,
+                data={
+                    "variables": json.dumps(
+                        {
+                            "shortcode": shortcode,
+                            "__relay_internal__pv__PolarisAIGMMediaWebLabelEnabledrelayprovider": False,
+                        },
+                        separators=(",", ":"),
+                    ),
+                    "doc_id": POST_DOC_ID,
+                    "server_timestamps": "true",
+                },
+                headers={"x-csrftoken": csrf},
+            )
+        except httpx.HTTPError as e:
+            raise ConnectionException(
+                f"Network error while fetching post: {e!s}"
+            ) from e
+
+        if response.is_redirect and "/accounts/login" in response.headers.get(
+            "location", ""
+        ):
+            raise LoginRequiredException(
+                "This post is private and requires authentication. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            )
+        if response.status_code == 404:
+            raise ValueError(f"Post not found: {shortcode}")
+        if response.status_code == 429:
+            if self.governor is not None:
+                self.governor.on_throttle()
+            raise ConnectionException(
+                "Network error while fetching post: 429 Too Many Requests"
+            )
+        if response.status_code != 200:
+            raise ConnectionException(
+                "Network error while fetching post: "
+                f"{response.status_code} {response.reason_phrase}"
+            )
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise InstaloaderException(f"Error fetching post: {e!s}") from e
+        # Like instaloader, treat a response whose status isn't "ok" as a
+        # failed request (e.g. "Please wait a few minutes"), not a missing post
+        if payload.get("status", "ok") != "ok":
+            error = ConnectionException(
+                "Network error while fetching post: "
+                f'Returned "{payload["status"]}" status, '
+                f'message "{payload.get("message", "")}".'
+            )
+            if self.governor is not None and is_throttle_error(error):
+                self.governor.on_throttle()
+            raise error
+        web_info = (payload.get("data") or {}).get(
+            "xdt_api__v1__media__shortcode__web_info"
+        ) or {}
+        items = web_info.get("items")
+        if not items:
+            raise ValueError(f"Post not found: {shortcode}")
+        try:
+            return media_to_node(items[0])
+        except (KeyError, TypeError) as e:
+            raise InstaloaderException(f"Error fetching post: {e!s}") from e
+
+    async def aclose(self) -> None:
+        """Close the shared AsyncClient."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,54 @@
+"""Accounting of the upstream work done on behalf of one tool call."""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class CallUsage:
+    """Counts of upstream requests and cache hits made for one tool call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.upstream_requests = 0
+        self.cache_hits = 0
+
+    def add(self, upstream_requests: int = 0, cache_hits: int = 0) -> None:
+        """Add to the counters (safe to call from worker threads)."""
+        with self._lock:
+            self.upstream_requests += upstream_requests
+            self.cache_hits += cache_hits
+
+
+_current_usage: ContextVar[CallUsage | None] = ContextVar("call_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[CallUsage]:
+    """
+    Collect the usage recorded in this context (and tasks/threads started from it).
+
+    Yields:
+        The CallUsage the recorded requests and cache hits are added to
+    """
+    usage = CallUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_upstream_request() -> None:
+    """Count one request sent to Instagram against the current tool call."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(upstream_requests=1)
+
+
+def record_cache_hit() -> None:
+    """Count one result served from a cache for the current tool call."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(cache_hits=1)
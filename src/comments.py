@@ -0,0 +1,78 @@
+"""Resumable, page-by-page reading of Instagram post comments."""
+
+from collections.abc import Iterator
+from typing import Any
+
+from instaloader import NodeIterator, Post, PostComment
+from instaloader.exceptions import LoginRequiredException
+
+
+def comment_to_dict(comment: PostComment) -> dict[str, Any]:
+    """
+    Convert an instaloader PostComment to a JSON-serializable dict.
+
+    Reply threads are only counted, not fetched, to avoid extra requests.
+    """
+    node = comment._node
+    iphone = node.get("iphone_struct") or {}
+    owner = iphone.get("user") or node.get("owner") or {}
+    return {
+        "id": str(comment.id),
+        "text": comment.text,
+        "author": owner.get("username"),
+        "created_at": comment.created_at_utc.isoformat(),
+        "likes": comment.likes_count,
+        "replies": iphone.get("child_comment_count")
+        or node.get("edge_threaded_comments", {}).get("count", 0),
+    }
+
+
+def iter_comment_pages(
+    post: Post, page_id: str | None = None
+) -> Iterator[tuple[list[PostComment], str | None]]:
+    """
+    Yield pages of a post's top-level comments, starting at ``page_id``.
+
+    Posts with at most one page of comments are read with
+    ``Post.get_comments()``. Larger posts use the same iPhone comments
+    endpoint that ``get_comments()`` falls back to, but page by page, so
+    reading can start at any page and stops as soon as the caller stops.
+
+    Args:
+        post: Post whose comments to read
+        page_id: Page to start at (a ``next_min_id`` from an earlier page), or
+            None for the first page
+
+    Yields:
+        Tuples of the page's comments and the id of the next page (None on the
+        last page)
+
+    Raises:
+        LoginRequiredException: If the loader is not logged in
+    """
+    if page_id is None and post.comments <= NodeIterator.page_length():
+        yield list(post.get_comments()), None
+        return
+
+    context = post._context
+    if not context.is_logged_in:
+        raise LoginRequiredException("Login required to access comments of a post.")
+    while True:
+        data = context.get_iphone_json(
+            f"api/v1/media/{post.mediaid}/comments/",
+            {
+                "can_support_threading": "true",
+                "permalink_enabled": "false",
+                **({"min_id": page_id} if page_id else {}),
+            },
+        )
+        page_id = data.get("next_min_id") or None
+        yield (
+            [
+                PostComment.from_iphone_struct(context, node, iter(()), post)
+                for node in data.get("comments", [])
+            ],
+            page_id,
+        )
+        if page_id is None:
+            return
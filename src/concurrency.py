@@ -0,0 +1,101 @@
+"""Per-key coordination of concurrent async calls."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    One shared in-flight call per key.
+
+    Concurrent ``run`` calls for a key await a single task instead of each
+    starting their own, and the key is forgotten once that task finishes.
+    The task is shielded, so one cancelled caller doesn't cancel it for the
+    others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[K, asyncio.Future[V]] = {}
+        self.coalesced = 0
+
+    def start(self, key: K, call: Callable[[], Awaitable[V]]) -> asyncio.Future[V]:
+        """Start ``call()`` as the in-flight task for ``key`` and return it."""
+        task = asyncio.ensure_future(call())
+        self._tasks[key] = task
+
+        def forget(_: asyncio.Future[V]) -> None:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+        task.add_done_callback(forget)
+        return task
+
+    async def run(
+        self,
+        key: K,
+        call: Callable[[], Awaitable[V]],
+        on_join: Callable[[], None] | None = None,
+    ) -> V:
+        """
+        Return the result of the in-flight task for ``key``.
+
+        Starts ``call()`` if no task for ``key`` is in flight; otherwise
+        joins the running one and calls ``on_join``, if given.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self.start(key, call)
+        else:
+            self.coalesced += 1
+            if on_join is not None:
+                on_join()
+        return await asyncio.shield(task)
+
+    def tasks(self) -> list[asyncio.Future[V]]:
+        """Return the tasks currently in flight."""
+        return list(self._tasks.values())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+class KeyedLock:
+    """
+    Async mutual exclusion per key.
+
+    Serializes read-modify-write sequences on the same key (e.g. one
+    hashtag's seen set) while calls for other keys run concurrently. A
+    key's lock exists only while some call holds or waits for it.
+    """
+
+    def __init__(self) -> None:
+        # key -> (lock, number of holders and waiters)
+        self._locks: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """Hold the lock of ``key`` for the duration of the ``async with`` block."""
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -0,0 +1,121 @@
+"""Dedicated, bounded thread pool for blocking instaloader calls."""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the executor's submission queue is full."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a bounded submission queue and live queue metrics.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more may
+    wait for a free worker. Submissions beyond that are rejected with
+    ExecutorBusyError instead of piling up behind a slow upstream.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        thread_name_prefix: str = "instaloader",
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queue: Maximum number of jobs waiting for a free worker
+            thread_name_prefix: Name prefix of the worker threads
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``func(*args)`` on a worker thread and await its result.
+
+        Like ``asyncio.to_thread``, the job runs in a copy of the caller's
+        context, so context variables (such as the tool call's usage
+        accounting) are visible on the worker thread.
+
+        Raises:
+            ExecutorBusyError: If the submission queue is full
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorBusyError(
+                    f"Executor queue is full ({self.max_queue} jobs waiting)"
+                )
+            self._queued += 1
+        submitted_at = time.monotonic()
+        started = threading.Event()
+        context = contextvars.copy_context()
+
+        def job():
+            wait = time.monotonic() - submitted_at
+            with self._lock:
+                started.set()
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._last_wait = wait
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        def on_done(future: concurrent.futures.Future) -> None:
+            # A job cancelled before it started never leaves the queue by itself
+            with self._lock:
+                if not started.is_set():
+                    self._queued -= 1
+
+        future = self._executor.submit(job)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, Any]:
+        """Return live worker and queue statistics."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "active_workers": self._active,
+                "queued_jobs": self._queued,
+                "max_queue": self.max_queue,
+                "completed_jobs": self._completed,
+                "rejected_jobs": self._rejected,
+                "avg_wait_seconds": round(self._total_wait / started, 4)
+                if started
+                else 0.0,
+                "max_wait_seconds": round(self._max_wait, 4),
+                "last_wait_seconds": round(self._last_wait, 4),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and shut down the worker threads."""
+        self._executor.shutdown(wait=wait)
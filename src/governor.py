@@ -0,0 +1,167 @@
+"""Adaptive (AIMD) pacing of outbound requests to Instagram."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+from instaloader import RateController
+from instaloader.instaloadercontext import InstaloaderContext
+
+from .call_usage import record_upstream_request
+
+
+class OutboundGovernor:
+    """
+    Process-wide pacer for requests to Instagram with AIMD rate control.
+
+    Requests are spaced ``1 / rate`` seconds apart. Every throttle response
+    (HTTP 429, "Please wait a few minutes") halves the rate, down to
+    ``min_rate``; afterwards the rate climbs back linearly by ``increase``
+    requests/second per second until it reaches ``max_rate`` again. Throttle
+    responses within ``cooldown`` seconds of a decrease count as the same
+    event, so a burst of concurrent 429s halves the rate only once. After
+    each decrease no request is sent for ``penalty`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = 5.0,
+        min_rate: float = 0.1,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        cooldown: float = 5.0,
+        penalty: float = 30.0,
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            max_rate: Starting and highest request rate (requests/second);
+                0 disables pacing
+            min_rate: Lowest request rate after repeated throttling
+            increase: Requests/second regained per second without throttling
+            decrease: Factor the rate is multiplied by on throttling
+            cooldown: Seconds after a decrease during which further throttle
+                responses don't decrease the rate again
+            penalty: Seconds every request waits after a decrease
+        """
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate) if max_rate > 0 else min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.penalty = penalty
+        self._lock = threading.Lock()
+        # Rate right after the last decrease, and when it happened
+        self._base_rate = max_rate
+        self._decreased_at = time.monotonic()
+        self._next_slot = 0.0
+        self.requests = 0
+        self.throttle_events = 0
+        self.decreases = 0
+        self.total_wait = 0.0
+
+    def _rate(self, now: float) -> float:
+        """Current allowed rate (caller holds the lock)."""
+        ramped = self._base_rate + self.increase * (now - self._decreased_at)
+        return min(self.max_rate, ramped)
+
+    @property
+    def rate(self) -> float:
+        """Currently allowed requests per second."""
+        with self._lock:
+            return self._rate(time.monotonic())
+
+    def reserve(self) -> float:
+        """Reserve the next request slot and return the seconds to wait for it."""
+        record_upstream_request()
+        if self.max_rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self._rate(now)
+            self.requests += 1
+            self.total_wait += slot - now
+            return slot - now
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until the next request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_throttle(self) -> None:
+        """Record a throttle response and back off multiplicatively."""
+        with self._lock:
+            self.throttle_events += 1
+            if self.max_rate <= 0:
+                return
+            now = time.monotonic()
+            if self.decreases and now - self._decreased_at < self.cooldown:
+                return
+            self._base_rate = max(self.min_rate, self._rate(now) * self.decrease)
+            self._decreased_at = now
+            self.decreases += 1
+            # Wait out the penalty, and at least a full interval at the new rate
+            backoff = max(self.penalty, 1 / self._base_rate)
+            self._next_slot = max(self._next_slot, now + backoff)
+
+    def backoff(self) -> float:
+        """Return the seconds until the next request slot opens (0 if open)."""
+        if self.max_rate <= 0:
+            return 0.0
+        with self._lock:
+            return max(0.0, self._next_slot - time.monotonic())
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current rate and throttle counters."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "rate": round(self._rate(now), 3) if self.max_rate > 0 else None,
+                "max_rate": self.max_rate,
+                "min_rate": self.min_rate,
+                "requests": self.requests,
+                "throttle_events": self.throttle_events,
+                "decreases": self.decreases,
+                "seconds_since_decrease": round(now - self._decreased_at, 1)
+                if self.decreases
+                else None,
+                "total_wait_seconds": round(self.total_wait, 3),
+            }
+
+
+class GovernedRateController(RateController):
+    """
+    instaloader RateController that paces every query through a governor.
+
+    instaloader's own per-query-type limits still apply. On a 429 the
+    governor backs off and the retry waits out its penalty, instead of
+    instaloader's multi-minute sleep. With pacing disabled, instaloader's
+    own 429 handling is used.
+    """
+
+    def __init__(self, context: InstaloaderContext, governor: OutboundGovernor):
+        super().__init__(context)
+        self.governor = governor
+
+    def wait_before_query(self, query_type: str) -> None:
+        self.governor.acquire()
+        super().wait_before_query(query_type)
+
+    def handle_429(self, query_type: str) -> None:
+        self.governor.on_throttle()
+        if self.governor.max_rate <= 0:
+            super().handle_429(query_type)
+            return
+        delay = self.governor.backoff()
+        if delay > 0:
+            self.sleep(delay)
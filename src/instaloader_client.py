@@ -1,33 +1,153 @@
 """Client wrapper for instaloader to fetch Instagram posts and reels."""
 
 import asyncio
+import contextlib
+import contextvars
+import datetime
 import os
+from collections.abc import Iterable
+from functools import partial
 from typing import Any
 
 import instaloader
-from instaloader import Post
+from instaloader import Hashtag, Post, Profile
 from instaloader.exceptions import (
+    BadResponseException,
     ConnectionException,
     InstaloaderException,
     LoginRequiredException,
+    PrivateProfileNotFollowedException,
     ProfileNotExistsException,
+    QueryReturnedNotFoundException,
 )
 
-from .url_parser import extract_shortcode
+from .async_fetcher import AsyncPostFetcher
+from .call_usage import record_cache_hit
+from .comments import comment_to_dict, iter_comment_pages
+from .concurrency import KeyedLock, SingleFlight
+from .executor import BoundedExecutor
+from .governor import GovernedRateController, OutboundGovernor
+from .link_resolver import ShareLinkResolver
+from .loader_pool import LoaderPool, SessionPool
+from .post_cache import LRUCache, NegativeCache, PostCache
+from .post_fields import (
+    DEFAULT_FIELDS,
+    IncompleteNodeError,
+    normalize_fields,
+    post_node,
+    project_loaded,
+    project_node,
+    project_post,
+)
+from .profile_feed import (
+    FeedReader,
+    decode_cursor,
+    encode_cursor,
+    profile_posts,
+    read_feed_page,
+)
+from .seen_filter import SeenSet, SeenSetStore
+from .sync_state import SyncState, SyncStateStore
+from .url_parser import (
+    PostRef,
+    extract_hashtag,
+    extract_username,
+    parse_post_ref,
+    parse_share_link,
+)
+
+# Instagram lets a profile pin up to three posts above newer ones
+PINNED_POSTS_MAX = 3
+
+
+def _consume_exception(task: asyncio.Future) -> None:
+    """Retrieve a background task's exception so it isn't reported as unhandled."""
+    if not task.cancelled():
+        task.exception()
 
 
 class InstaloaderClient:
     """Wrapper around instaloader for fetching Instagram content."""
 
-    def __init__(self, cookie_file: str | None = None):
+    def __init__(
+        self,
+        cookie_file: str | None = None,
+        cache: PostCache | None = None,
+        negative_cache: NegativeCache | None = None,
+        executor: BoundedExecutor | None = None,
+        loader_pool_size: int = 4,
+        session_bench_seconds: float = 300.0,
+        fetch_engine: str = "thread",
+        sync_state: SyncStateStore | None = None,
+        seen_store: SeenSetStore | None = None,
+        comment_pages: LRUCache | None = None,
+        governor: OutboundGovernor | None = None,
+        link_resolver: ShareLinkResolver | None = None,
+    ):
         """
         Initialize the Instaloader client.
 
         Args:
             cookie_file: Optional path to cookie file for authenticated sessions
+            cache: Optional post cache; defaults to an in-memory only cache
+            negative_cache: Optional cache of not-found/private lookups;
+                defaults to a 5-minute in-memory cache
+            executor: Optional thread pool for blocking instaloader calls;
+                defaults to a dedicated pool of 4 workers
+            loader_pool_size: Maximum number of Instaloader instances used
+                concurrently, each with its own HTTP session
+            session_bench_seconds: How long a logged-out or challenged session,
+                or a logged-in session that got a 429, is taken out of rotation
+            fetch_engine: "thread" to fetch posts with instaloader on the
+                executor, or "async" to use the native httpx engine
+            sync_state: Optional store of per-profile sync state; defaults to
+                an in-memory store
+            seen_store: Optional store of per-hashtag seen sets; defaults to
+                an in-memory store
+            comment_pages: Optional cache of fetched comment pages; defaults
+                to 1024 pages for 10 minutes
+            governor: Optional pacer shared by every request to Instagram;
+                defaults to 5 requests/second with AIMD backoff on throttling
+            link_resolver: Optional resolver of share links; defaults to an
+                in-memory cache paced by ``governor``
         """
-        self.loader = instaloader.Instaloader()
+        if fetch_engine not in ("thread", "async"):
+            raise ValueError(f"Unknown fetch engine: {fetch_engine}")
+        self.governor = governor if governor is not None else OutboundGovernor()
+        # Primary loader holds the authenticated session that pooled loaders clone
+        self.loader = self._create_loader()
         self.cookie_file = cookie_file
+        self.loader_pool_size = loader_pool_size
+        self.loader_pool = LoaderPool(self._new_loader, size=loader_pool_size)
+        # Every loaded session gets its own loader pool; fetches rotate over them
+        self.session_pool = SessionPool(
+            bench_seconds=session_bench_seconds, on_throttle=self.governor.on_throttle
+        )
+        self.cache = cache if cache is not None else PostCache()
+        self.negative_cache = (
+            negative_cache if negative_cache is not None else NegativeCache()
+        )
+        self.executor = executor if executor is not None else BoundedExecutor()
+        self.sync_state = sync_state if sync_state is not None else SyncStateStore()
+        self.link_resolver = (
+            link_resolver
+            if link_resolver is not None
+            else ShareLinkResolver(governor=self.governor)
+        )
+        self.seen_store = seen_store if seen_store is not None else SeenSetStore()
+        # Completed comment pages keyed by "shortcode:page_id"
+        self.comment_pages = (
+            comment_pages
+            if comment_pages is not None
+            else LRUCache(max_entries=1024, ttl=600)
+        )
+        # In-flight upstream fetches keyed by shortcode (single-flight)
+        self._inflight: SingleFlight[str, dict[str, Any]] = SingleFlight()
+        self.background_refreshes = 0
+        # Serialize load-update-store of one profile's sync state or one
+        # hashtag's seen set, so concurrent calls don't lose updates
+        self._sync_locks = KeyedLock()
+        self._poll_locks = KeyedLock()
         self._session_loaded = False
 
         # Load session from cookie file if provided
@@ -42,6 +162,22 @@ class InstaloaderClient:
                 # If loading fails, continue without authentication
                 pass
 
+        self.session_pool.add(
+            self.loader.context.username or "anonymous", self.loader_pool
+        )
+
+        # Optional thread-free engine for single posts, sharing the primary session
+        self.async_fetcher = (
+            AsyncPostFetcher(
+                cookies=self.loader.context.save_session()
+                if self._session_loaded
+                else None,
+                governor=self.governor,
+            )
+            if fetch_engine == "async"
+            else None
+        )
+
     def _load_session(self, cookie_file: str) -> None:
         """
         Load session from cookie file using instaloader's native API.
@@ -49,7 +185,9 @@ class InstaloaderClient:
         Note: Instaloader expects session files in its own format, typically
         created by running `instaloader --login username`. The cookie_file
         path can be:
-        - A directory containing session files (e.g., `/root/.config/instaloader/`)
+        - A directory containing session files (e.g., `/root/.config/instaloader/`);
+          every readable `session-*` file is loaded and added to the session pool,
+          the first one as the primary session
         - A specific session file path (e.g., `/root/.config/instaloader/session-username`)
         - A username string (instaloader will use default session path)
 
@@ -72,16 +210,22 @@ class InstaloaderClient:
                     if f.startswith("session-")
                     and os.path.isfile(os.path.join(cookie_file, f))
                 ]
-                if session_files:
-                    # Extract username from first session file found
+                self._session_loaded = False
+                for filename in sorted(session_files):
                     # Format: session-{username}
-                    username = session_files[0].replace("session-", "", 1)
-                    session_path = os.path.join(cookie_file, session_files[0])
-                    self.loader.load_session_from_file(username, session_path)
+                    username = filename.replace("session-", "", 1)
+                    session_path = os.path.join(cookie_file, filename)
+                    if self._session_loaded:
+                        # Further session files become additional pooled accounts
+                        self._add_session(username, session_path)
+                        continue
+                    # The first readable session file is the primary session
+                    try:
+                        self.loader.load_session_from_file(username, session_path)
+                    except Exception:
+                        # Skip unreadable session files, keep the ones that work
+                        continue
                     self._session_loaded = True
-                else:
-                    # No session files found in directory
-                    self._session_loaded = False
             elif os.path.isfile(cookie_file):
                 # It's a file - try to extract username from filename
                 # Format: session-{username} or just the file path
@@ -107,70 +251,196 @@ class InstaloaderClient:
             # Continue without authentication
             self._session_loaded = False
 
-    async def fetch_post(self, url_or_shortcode: str) -> dict[str, Any]:
+    def _create_loader(self) -> instaloader.Instaloader:
+        """Create an Instaloader whose queries are paced by the shared governor."""
+        return instaloader.Instaloader(
+            rate_controller=partial(GovernedRateController, governor=self.governor)
+        )
+
+    def _add_session(self, username: str, session_path: str) -> None:
+        """Load an additional session file and add it to the session pool."""
+        try:
+            loader = self._create_loader()
+            loader.load_session_from_file(username, session_path)
+        except Exception:
+            # Skip unreadable session files, keep the ones that work
+            return
+        self.session_pool.add(
+            username,
+            LoaderPool(partial(self._new_loader, loader), size=self.loader_pool_size),
+        )
+
+    def _new_loader(
+        self, primary: instaloader.Instaloader | None = None
+    ) -> instaloader.Instaloader:
+        """Create a pooled Instaloader with its own session cloned from ``primary``."""
+        primary = primary if primary is not None else self.loader
+        loader = self._create_loader()
+        if self._session_loaded:
+            context = primary.context
+            loader.context.load_session(context.username, context.save_session())
+        return loader
+
+    async def resolve_post_ref(self, url_or_ref: str | PostRef) -> PostRef:
+        """
+        Return the post a URL, shortcode, media ID or share link points to.
+
+        Everything but share links is parsed locally; share links are
+        resolved once through ``link_resolver`` and cached from then on.
+
+        Raises:
+            ValueError: If the input doesn't identify a post
+            ConnectionException: If a share link cannot be resolved
+        """
+        if isinstance(url_or_ref, PostRef):
+            return url_or_ref
+        ref = parse_post_ref(url_or_ref)
+        if ref is not None:
+            return ref
+        if parse_share_link(url_or_ref) is not None:
+            return await self.link_resolver.resolve(url_or_ref)
+        raise ValueError(f"Invalid Instagram URL or shortcode: {url_or_ref}")
+
+    async def fetch_post(
+        self, url_or_ref: str | PostRef, fields: Iterable[str] | None = None
+    ) -> dict[str, Any]:
         """
-        Fetch an Instagram post by URL or shortcode.
+        Fetch an Instagram post by URL, shortcode, share link or parsed PostRef.
 
         Args:
-            url_or_shortcode: Instagram post URL or shortcode
+            url_or_ref: Instagram post URL, shortcode, media ID, share link,
+                or a PostRef already parsed by the caller
+            fields: Optional subset of POST_FIELDS to return; only these
+                properties are read from the post, so unrequested ones never
+                trigger extra upstream lookups. Defaults to all fields.
 
         Returns:
-            Dictionary with post data including text and metadata
+            Dictionary with the requested post fields, ``resolved_fields``
+            listing them, plus ``cache_hit``, ``cache_age_seconds`` and
+            ``stale`` describing where it came from. Fields are projected
+            from the cached raw post node, so any projection is a cache hit
+            once the post has been fetched. Stale entries (past the soft TTL)
+            are returned immediately while a background fetch refreshes the
+            cache.
 
         Raises:
             ValueError: If URL is invalid
+            InvalidFieldsError: If ``fields`` names unknown fields
             InstaloaderException: If post cannot be fetched
             LoginRequiredException: If authentication is required for private content
         """
-        shortcode = extract_shortcode(url_or_shortcode)
-        if not shortcode:
-            raise ValueError(f"Invalid Instagram URL or shortcode: {url_or_shortcode}")
+        ref = await self.resolve_post_ref(url_or_ref)
+        fields = normalize_fields(fields)
 
-        # Run blocking instaloader operations in a thread pool
-        def _fetch_post_sync():
-            try:
-                post = Post.from_shortcode(self.loader.context, shortcode)
-
-                # Extract text content
-                caption = post.caption if post.caption else ""
-
-                return {
-                    "shortcode": post.shortcode,
-                    "text": caption,
-                    "author": post.owner_username,
-                    "timestamp": post.date_utc.isoformat() if post.date_utc else None,
-                    "likes": post.likes,
-                    "comments": post.comments,
-                    "is_video": post.is_video,
-                    "typename": post.typename,
-                }
-            except LoginRequiredException:
-                raise LoginRequiredException(
-                    "This post is private and requires authentication. "
-                    "Please provide a valid session cookie file via COOKIE_FILE environment variable."
-                ) from None
-            except ProfileNotExistsException:
-                raise ValueError(f"Post not found: {shortcode}") from None
-            except ConnectionException as e:
-                raise ConnectionException(
-                    f"Network error while fetching post: {e!s}"
-                ) from e
-            except InstaloaderException as e:
-                raise InstaloaderException(f"Error fetching post: {e!s}") from e
-
-        # Run in executor to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _fetch_post_sync)
-
-    async def fetch_reel(self, url_or_shortcode: str) -> dict[str, Any]:
-        """
-        Fetch an Instagram reel by URL or shortcode.
+        cached = self.cache.get(ref.key)
+        projected = None
+        if cached is not None:
+            with contextlib.suppress(IncompleteNodeError):
+                projected = project_node(cached.data, fields)
+        if projected is not None:
+            record_cache_hit()
+            stale = not self.cache.is_fresh(cached)
+            if stale and ref.key not in self._inflight:
+                # Stale-while-revalidate: serve the snapshot, refresh in background.
+                # The refresh runs in a fresh context so it isn't billed to this call.
+                self.background_refreshes += 1
+                task = contextvars.Context().run(self._start_fetch, ref)
+                task.add_done_callback(_consume_exception)
+            return {
+                **projected,
+                "resolved_fields": list(fields),
+                "cache_hit": True,
+                "cache_age_seconds": round(cached.age, 3),
+                "stale": stale,
+            }
+
+        # Fail fast on recently seen not-found/private posts
+        failure = self.negative_cache.get(ref.key, self._session_loaded)
+        if failure is not None:
+            record_cache_hit()
+            raise failure
+
+        # Coalesce concurrent fetches of the same post into one upstream call;
+        # joining a fetch that is already paid for costs like a cache hit
+        node = await self._inflight.run(
+            ref.key,
+            lambda: self._fetch_upstream(ref, fields),
+            on_join=record_cache_hit,
+        )
+        return {
+            **project_node(node, fields),
+            "resolved_fields": list(fields),
+            "cache_hit": False,
+            "cache_age_seconds": 0.0,
+            "stale": False,
+        }
+
+    def _start_fetch(
+        self, ref: PostRef, fields: tuple[str, ...] = DEFAULT_FIELDS
+    ) -> asyncio.Future:
+        """Start an upstream fetch and register it as in flight."""
+        return self._inflight.start(ref.key, lambda: self._fetch_upstream(ref, fields))
+
+    async def _fetch_upstream(
+        self, ref: PostRef, fields: tuple[str, ...] = DEFAULT_FIELDS
+    ) -> dict[str, Any]:
+        """Fetch a post's raw node from Instagram and store it in the cache."""
+        try:
+            if self.async_fetcher is not None:
+                node = await self.async_fetcher.fetch(ref.shortcode)
+            else:
+                # Run in the dedicated executor to avoid blocking the event loop
+                node = await self.executor.run(
+                    self._fetch_post_sync, ref.shortcode, fields
+                )
+        except (ValueError, LoginRequiredException) as e:
+            self.negative_cache.set(ref.key, self._session_loaded, e)
+            raise
+        self.cache.set(ref.key, node)
+        return node
+
+    def _fetch_post_sync(
+        self, shortcode: str, fields: tuple[str, ...] = DEFAULT_FIELDS
+    ) -> dict[str, Any]:
+        """Fetch a post's raw node with blocking instaloader calls (runs in a worker thread)."""
+        try:
+            with self.session_pool.checkout() as loader:
+                post = Post.from_shortcode(loader.context, shortcode)
+                # Reading the fields loads anything they need into the node
+                project_post(post, fields)
+                return post_node(post)
+        except LoginRequiredException:
+            raise LoginRequiredException(
+                "This post is private and requires authentication. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            ) from None
+        except (
+            ProfileNotExistsException,
+            QueryReturnedNotFoundException,
+            BadResponseException,
+        ):
+            # instaloader reports a missing or deleted post as a 404 or as a
+            # metadata response without items ("Fetching Post metadata failed.")
+            raise ValueError(f"Post not found: {shortcode}") from None
+        except ConnectionException as e:
+            raise ConnectionException(
+                f"Network error while fetching post: {e!s}"
+            ) from e
+        except InstaloaderException as e:
+            raise InstaloaderException(f"Error fetching post: {e!s}") from e
+
+    async def fetch_reel(
+        self, url_or_ref: str | PostRef, fields: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Fetch an Instagram reel by URL, shortcode or parsed PostRef.
 
         Note: Instagram reels are essentially posts with typename "GraphVideo".
         This method uses the same underlying logic as fetch_post.
 
         Args:
-            url_or_shortcode: Instagram reel URL or shortcode
+            url_or_ref: Instagram reel URL, shortcode or PostRef
+            fields: Optional subset of POST_FIELDS to return
 
         Returns:
             Dictionary with reel data including text and metadata
@@ -181,4 +451,446 @@ class InstaloaderClient:
             LoginRequiredException: If authentication is required for private content
         """
         # Reels are posts with video content, so we can use the same logic
-        return await self.fetch_post(url_or_shortcode)
+        return await self.fetch_post(url_or_ref, fields)
+
+    def _project_and_cache(self, post: Post) -> dict[str, Any]:
+        """Read the loaded fields of a feed post and cache its node (runs in a worker thread)."""
+        data = project_loaded(post)
+        self.cache.set(PostRef("post", post.shortcode).key, post_node(post))
+        return data
+
+    async def fetch_profile_posts(
+        self, url_or_username: str, limit: int = 12, cursor: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Fetch one page of a profile's posts, newest first.
+
+        Posts are read lazily from ``Profile.get_posts()``, so only about
+        ``limit`` posts are requested from Instagram and held in memory,
+        whatever the size of the profile. Fetched posts also warm the post
+        cache.
+
+        Args:
+            url_or_username: Instagram profile URL or username
+            limit: Maximum number of posts to return
+            cursor: ``next_cursor`` from a previous call to continue from
+
+        Returns:
+            Dictionary with ``username``, ``posts`` (the fetch_post fields the
+            feed page carries),
+            ``count``, ``next_cursor`` (None when the profile is exhausted) and
+            ``has_more``
+
+        Raises:
+            ValueError: If the username, cursor or profile is invalid
+            InstaloaderException: If the posts cannot be fetched
+            LoginRequiredException: If the profile is private
+        """
+        username = extract_username(url_or_username)
+        if not username:
+            raise ValueError(
+                f"Invalid Instagram profile URL or username: {url_or_username}"
+            )
+
+        posts, next_cursor = await self.executor.run(
+            self._fetch_profile_posts_sync, username, limit, cursor
+        )
+        return {
+            "username": username,
+            "posts": posts,
+            "count": len(posts),
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+
+    def _fetch_profile_posts_sync(
+        self, username: str, limit: int, cursor: str | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Read one page of a profile's feed (runs in a worker thread)."""
+        try:
+            with self.session_pool.checkout() as loader:
+                profile = Profile.from_username(loader.context, username)
+                posts, next_cursor = read_feed_page(
+                    lambda after: profile_posts(loader.context, profile, after),
+                    username,
+                    limit,
+                    cursor,
+                )
+                return [self._project_and_cache(post) for post in posts], next_cursor
+        except (LoginRequiredException, PrivateProfileNotFollowedException):
+            raise LoginRequiredException(
+                "This profile is private and requires authentication. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            ) from None
+        except ProfileNotExistsException:
+            raise ValueError(f"Profile not found: {username}") from None
+        except ConnectionException as e:
+            raise ConnectionException(
+                f"Network error while fetching profile: {e!s}"
+            ) from e
+        except InstaloaderException as e:
+            raise InstaloaderException(f"Error fetching profile: {e!s}") from e
+
+    async def sync_profile(
+        self, url_or_username: str, limit: int = 12
+    ) -> dict[str, Any]:
+        """
+        Fetch only the posts published since the last sync of a profile.
+
+        The feed is read newest first and paging stops at the first post
+        already seen (the stored newest shortcode or anything not newer than
+        its timestamp), so each sync costs about one upstream page per
+        ``limit`` new posts regardless of the profile size. The first sync
+        records the newest ``limit`` posts as a baseline.
+
+        Args:
+            url_or_username: Instagram profile URL or username
+            limit: Maximum number of new posts to return; if more are new, the
+                sync is ``truncated`` and ``gap_cursor`` continues into the rest
+
+        Returns:
+            Dictionary with ``username``, ``new_posts`` (newest first, same
+            keys as fetch_post), ``count``, ``first_sync``, ``truncated``,
+            ``gap_cursor`` (a fetch_profile_posts cursor, or None),
+            ``last_shortcode``/``last_timestamp`` (the newest post seen) and
+            ``previous_sync_at``
+
+        Raises:
+            ValueError: If the username or profile is invalid
+            InstaloaderException: If the posts cannot be fetched
+            LoginRequiredException: If the profile is private
+        """
+        username = extract_username(url_or_username)
+        if not username:
+            raise ValueError(
+                f"Invalid Instagram profile URL or username: {url_or_username}"
+            )
+
+        async with self._sync_locks.hold(username):
+            previous = self.sync_state.get(username)
+            posts, gap_cursor = await self.executor.run(
+                self._sync_profile_sync, username, limit, previous
+            )
+            last_shortcode, last_timestamp = self._newest_seen(posts, previous)
+            self.sync_state.set(username, last_shortcode, last_timestamp)
+
+        return {
+            "username": username,
+            "new_posts": posts,
+            "count": len(posts),
+            "first_sync": previous is None,
+            "truncated": gap_cursor is not None,
+            "gap_cursor": gap_cursor,
+            "last_shortcode": last_shortcode,
+            "last_timestamp": last_timestamp,
+            "previous_sync_at": previous.synced_at if previous else None,
+        }
+
+    @staticmethod
+    def _newest_seen(
+        posts: list[dict[str, Any]], previous: SyncState | None
+    ) -> tuple[str | None, str | None]:
+        """Return the shortcode and timestamp of the newest post seen so far."""
+        # Projected feed posts leave out fields the feed page doesn't carry
+        newest = max(posts, key=lambda p: p.get("timestamp") or "", default=None)
+        if newest is not None and (
+            previous is None
+            or previous.last_timestamp is None
+            or (newest.get("timestamp") or "") > previous.last_timestamp
+        ):
+            return newest.get("shortcode"), newest.get("timestamp")
+        if previous is not None:
+            return previous.last_shortcode, previous.last_timestamp
+        return None, None
+
+    def _sync_profile_sync(
+        self, username: str, limit: int, previous: SyncState | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Read a profile's feed down to the last seen post (runs in a worker thread)."""
+        known_before = (
+            datetime.datetime.fromisoformat(previous.last_timestamp)
+            if previous is not None and previous.last_timestamp
+            else None
+        )
+        try:
+            with self.session_pool.checkout() as loader:
+                profile = Profile.from_username(loader.context, username)
+                reader = FeedReader(
+                    lambda after: profile_posts(loader.context, profile, after),
+                    username,
+                )
+                posts: list[dict[str, Any]] = []
+                for position, post in enumerate(reader):
+                    if previous is not None:
+                        if post.shortcode == previous.last_shortcode:
+                            return posts, None
+                        if known_before is not None and post.date_utc <= known_before:
+                            # Old pinned posts can sit above the new ones
+                            if position < PINNED_POSTS_MAX:
+                                continue
+                            return posts, None
+                    posts.append(self._project_and_cache(post))
+                    if len(posts) >= limit:
+                        # A first sync is just a baseline; otherwise mark the gap
+                        return posts, reader.cursor() if previous else None
+                return posts, None
+        except (LoginRequiredException, PrivateProfileNotFollowedException):
+            raise LoginRequiredException(
+                "This profile is private and requires authentication. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            ) from None
+        except ProfileNotExistsException:
+            raise ValueError(f"Profile not found: {username}") from None
+        except ConnectionException as e:
+            raise ConnectionException(
+                f"Network error while fetching profile: {e!s}"
+            ) from e
+        except InstaloaderException as e:
+            raise InstaloaderException(f"Error fetching profile: {e!s}") from e
+
+    async def poll_hashtag(
+        self, url_or_hashtag: str, limit: int = 50, stop_after_seen: int = 12
+    ) -> dict[str, Any]:
+        """
+        Fetch the recent posts of a hashtag that earlier polls haven't returned.
+
+        Shortcodes returned by a poll are remembered in a per-hashtag seen set
+        (rotating Bloom filters of bounded size). Paging stops once
+        ``stop_after_seen`` already-seen posts come in a row, so a poll costs
+        about one upstream page when little is new.
+
+        Args:
+            url_or_hashtag: Hashtag name (with or without '#') or tag URL
+            limit: Maximum number of new posts to return
+            stop_after_seen: Length of the run of already-seen posts that ends
+                the poll
+
+        Returns:
+            Dictionary with ``hashtag``, ``new_posts`` (same keys as
+            fetch_post), ``count``, ``scanned`` (posts read from Instagram),
+            ``first_poll``, ``stopped_on_seen`` (whether a run of seen posts
+            ended the poll), ``truncated`` (whether ``limit`` ended it) and
+            ``seen`` (approximate size of the seen set)
+
+        Raises:
+            ValueError: If the hashtag is invalid or doesn't exist
+            InstaloaderException: If the posts cannot be fetched
+            LoginRequiredException: If Instagram requires a login
+        """
+        name = extract_hashtag(url_or_hashtag)
+        if not name:
+            raise ValueError(f"Invalid Instagram hashtag: {url_or_hashtag}")
+
+        async with self._poll_locks.hold(name):
+            seen, existed = self.seen_store.get(name)
+            posts, scanned, stopped_on_seen = await self.executor.run(
+                self._poll_hashtag_sync, name, seen, limit, stop_after_seen
+            )
+            self.seen_store.set(name, seen)
+
+        return {
+            "hashtag": name,
+            "new_posts": posts,
+            "count": len(posts),
+            "scanned": scanned,
+            "first_poll": not existed,
+            "stopped_on_seen": stopped_on_seen,
+            "truncated": len(posts) >= limit,
+            "seen": len(seen),
+        }
+
+    def _poll_hashtag_sync(
+        self, name: str, seen: SeenSet, limit: int, stop_after_seen: int
+    ) -> tuple[list[dict[str, Any]], int, bool]:
+        """Read a hashtag feed until enough seen posts in a row (runs in a worker thread)."""
+        try:
+            with self.session_pool.checkout() as loader:
+                hashtag = Hashtag.from_name(loader.context, name)
+                posts: list[dict[str, Any]] = []
+                scanned = 0
+                seen_run = 0
+                for post in hashtag.get_posts():
+                    scanned += 1
+                    if not seen.add(post.shortcode):
+                        seen_run += 1
+                        if seen_run >= stop_after_seen:
+                            return posts, scanned, True
+                        continue
+                    seen_run = 0
+                    posts.append(self._project_and_cache(post))
+                    if len(posts) >= limit:
+                        break
+                return posts, scanned, False
+        except LoginRequiredException:
+            raise LoginRequiredException(
+                "Instagram requires authentication to read this hashtag. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            ) from None
+        except QueryReturnedNotFoundException:
+            raise ValueError(f"Hashtag not found: {name}") from None
+        except ConnectionException as e:
+            raise ConnectionException(
+                f"Network error while fetching hashtag: {e!s}"
+            ) from e
+        except InstaloaderException as e:
+            raise InstaloaderException(f"Error fetching hashtag: {e!s}") from e
+
+    async def fetch_comments(
+        self,
+        url_or_ref: str | PostRef,
+        limit: int = 50,
+        since: datetime.datetime | None = None,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch a page of a post's top-level comments.
+
+        Upstream comment pages are requested one at a time and only until
+        ``limit`` comments are collected. Every completed page is cached per
+        shortcode, so following ``next_cursor`` (or repeating a call) serves
+        the pages already read from the cache and only requests new ones.
+
+        Args:
+            url_or_ref: Instagram post/reel URL, shortcode, share link or PostRef
+            limit: Maximum number of comments to return
+            since: Only return comments created at or after this UTC time;
+                paging stops at the first page entirely older than it
+            cursor: ``next_cursor`` from a previous call to continue from
+
+        Returns:
+            Dictionary with ``shortcode``, ``comments`` (id, text, author,
+            created_at, likes, replies), ``count``, ``next_cursor`` (None when
+            done), ``has_more``, ``pages_fetched`` (upstream requests) and
+            ``pages_cached`` (pages served from the cache)
+
+        Raises:
+            ValueError: If the URL, cursor or post is invalid
+            InstaloaderException: If the comments cannot be fetched
+            LoginRequiredException: If Instagram requires a login
+        """
+        ref = await self.resolve_post_ref(url_or_ref)
+        page_id, skip = decode_cursor(ref.shortcode, cursor) if cursor else (None, 0)
+
+        comments, next_cursor, fetched, cached = await self.executor.run(
+            self._fetch_comments_sync, ref, limit, since, page_id, skip
+        )
+        return {
+            "shortcode": ref.shortcode,
+            "comments": comments,
+            "count": len(comments),
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "pages_fetched": fetched,
+            "pages_cached": cached,
+        }
+
+    def _fetch_comments_sync(
+        self,
+        ref: PostRef,
+        limit: int,
+        since: datetime.datetime | None,
+        page_id: str | None,
+        skip: int,
+    ) -> tuple[list[dict[str, Any]], str | None, int, int]:
+        """Collect comments page by page, from cache or upstream (runs in a worker thread)."""
+        shortcode = ref.shortcode
+        comments: list[dict[str, Any]] = []
+        fetched = cached = 0
+        post = None
+        pages = None
+        try:
+            with contextlib.ExitStack() as stack:
+                while True:
+                    key = f"{ref.key}:{page_id or ''}"
+                    entry = self.comment_pages.get(key)
+                    if entry is not None:
+                        page, next_page_id = entry.data
+                        cached += 1
+                        record_cache_hit()
+                        # The upstream reader (if any) is no longer at this page
+                        pages = None
+                    else:
+                        if post is None:
+                            loader = stack.enter_context(self.session_pool.checkout())
+                            post = Post.from_shortcode(loader.context, shortcode)
+                        if pages is None:
+                            pages = iter_comment_pages(post, page_id)
+                        raw, next_page_id = next(pages)
+                        page = [comment_to_dict(comment) for comment in raw]
+                        self.comment_pages.set(key, (page, next_page_id))
+                        fetched += 1
+
+                    older = 0
+                    for index in range(skip, len(page)):
+                        comment = page[index]
+                        if (
+                            since is not None
+                            and datetime.datetime.fromisoformat(comment["created_at"])
+                            < since
+                        ):
+                            older += 1
+                            continue
+                        comments.append(comment)
+                        if len(comments) >= limit:
+                            if index + 1 < len(page):
+                                cursor = encode_cursor(shortcode, page_id, index + 1)
+                            elif next_page_id is not None:
+                                cursor = encode_cursor(shortcode, next_page_id, 0)
+                            else:
+                                cursor = None
+                            return comments, cursor, fetched, cached
+
+                    # A page with nothing new enough ends a "since" scan
+                    if next_page_id is None or (
+                        since is not None and older and older == len(page) - skip
+                    ):
+                        return comments, None, fetched, cached
+                    page_id, skip = next_page_id, 0
+        except LoginRequiredException:
+            raise LoginRequiredException(
+                "Instagram requires authentication to read comments. "
+                "Please provide a valid session cookie file via COOKIE_FILE environment variable."
+            ) from None
+        except (
+            ProfileNotExistsException,
+            QueryReturnedNotFoundException,
+            BadResponseException,
+        ):
+            raise ValueError(f"Post not found: {shortcode}") from None
+        except ConnectionException as e:
+            raise ConnectionException(
+                f"Network error while fetching comments: {e!s}"
+            ) from e
+        except InstaloaderException as e:
+            raise InstaloaderException(f"Error fetching comments: {e!s}") from e
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients of the async engine and the link resolver."""
+        if self.async_fetcher is not None:
+            await self.async_fetcher.aclose()
+        await self.link_resolver.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return live client statistics.
+
+        Returns:
+            Dictionary with cache, negative cache and executor counters,
+            per-session request counts and health, the number of upstream fetches
+            currently in flight, how many calls were coalesced onto them, how
+            many stale-while-revalidate refreshes were started, the number
+            of cached comment pages, share link resolution counters and the
+            outbound governor's current rate and throttle counters
+        """
+        return {
+            "cache": self.cache.stats(),
+            "negative_cache": self.negative_cache.stats(),
+            "executor": self.executor.stats(),
+            "sessions": self.session_pool.stats(),
+            "inflight_fetches": len(self._inflight),
+            "coalesced_requests": self._inflight.coalesced,
+            "background_refreshes": self.background_refreshes,
+            "cached_comment_pages": len(self.comment_pages),
+            "share_links": self.link_resolver.stats(),
+            "outbound": self.governor.stats(),
+        }
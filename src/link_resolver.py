@@ -0,0 +1,166 @@
+"""Resolution of Instagram share links to posts, with a persistent redirect cache."""
+
+import time
+from typing import Any
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import httpx
+from instaloader.exceptions import ConnectionException
+from instaloader.instaloadercontext import default_user_agent
+
+from .call_usage import record_cache_hit, record_upstream_request
+from .concurrency import SingleFlight
+from .governor import OutboundGovernor
+from .sqlite_store import SQLiteStore
+from .url_parser import PostRef, parse_post_ref, parse_share_link
+
+
+class ShareLinkResolver(SQLiteStore):
+    """
+    Resolve ``instagram.com/share/...`` links to the post they redirect to.
+
+    A share link is resolved with HEAD requests that don't follow redirects:
+    the ``Location`` of the first redirect that names a post ends the
+    resolution, so it usually costs one round trip. The link -> post mapping
+    never changes, so it is cached for good (in SQLite with a ``path``, so it
+    survives restarts), and concurrent resolutions of the same link share
+    one request.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        timeout: float = 10.0,
+        max_redirects: int = 3,
+        governor: OutboundGovernor | None = None,
+        base_url: str = "https://www.instagram.com",
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            path: Path of the SQLite database file, or None for in-memory only
+            timeout: Request timeout in seconds
+            max_redirects: Maximum number of redirects followed per link
+            governor: Optional pacer for the HEAD requests, told about 429s
+            base_url: Origin the share link paths are requested from
+        """
+        self.path = path
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.governor = governor
+        self.base_url = base_url.rstrip("/")
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: SingleFlight[str, PostRef] = SingleFlight()
+        self.resolutions = 0
+        self.cache_hits = 0
+        self._open_db(
+            path,
+            "CREATE TABLE IF NOT EXISTS share_links ("
+            "link TEXT PRIMARY KEY, kind TEXT NOT NULL, shortcode TEXT NOT NULL, "
+            "resolved_at REAL NOT NULL)",
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared AsyncClient on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"User-Agent": default_user_agent(), "Accept": "*/*"},
+            )
+        return self._client
+
+    def get(self, link: str) -> PostRef | None:
+        """Return the cached post of a canonical share link, if resolved before."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, shortcode FROM share_links WHERE link = ?", (link,)
+            ).fetchone()
+        return PostRef(*row) if row else None
+
+    def _set(self, link: str, ref: PostRef) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO share_links "
+                "(link, kind, shortcode, resolved_at) VALUES (?, ?, ?, ?)",
+                (link, ref.kind, ref.shortcode, time.time()),
+            )
+
+    async def resolve(self, url: str) -> PostRef:
+        """
+        Resolve a share link to the post it points to.
+
+        Raises:
+            ValueError: If ``url`` is not a share link or doesn't lead to a post
+            ConnectionException: On network errors or throttling
+        """
+        link = parse_share_link(url)
+        if link is None:
+            raise ValueError(f"Not an Instagram share link: {url}")
+
+        ref = self.get(link)
+        if ref is not None:
+            self.cache_hits += 1
+            record_cache_hit()
+            return ref
+
+        return await self._inflight.run(
+            link, lambda: self._resolve_upstream(link), on_join=record_cache_hit
+        )
+
+    async def _resolve_upstream(self, link: str) -> PostRef:
+        """Follow the redirects of a share link until one names a post, and cache it."""
+        client = self._get_client()
+        url = self.base_url + urlparse(link).path
+        for _ in range(self.max_redirects):
+            if self.governor is not None:
+                await self.governor.acquire_async()
+            else:
+                record_upstream_request()
+            try:
+                response = await client.head(url, follow_redirects=False)
+            except httpx.HTTPError as e:
+                raise ConnectionException(
+                    f"Network error while resolving share link: {e!s}"
+                ) from e
+            if response.status_code == 429:
+                if self.governor is not None:
+                    self.governor.on_throttle()
+                raise ConnectionException(
+                    "Network error while resolving share link: 429 Too Many Requests"
+                )
+            location = response.headers.get("location")
+            if not response.is_redirect or not location:
+                break
+            url = urljoin(url, location)
+            ref = parse_post_ref(url)
+            if ref is None:
+                # Anonymous requests may be sent to the login page first, with
+                # the post as the page to continue to
+                target = parse_qs(urlparse(url).query).get("next", [""])[0]
+                ref = parse_post_ref(urljoin("https://www.instagram.com/", target))
+            if ref is not None:
+                self.resolutions += 1
+                self._set(link, ref)
+                return ref
+        raise ValueError(f"Share link does not point to a post: {link}")
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of cached links and how resolutions were served."""
+        with self._lock:
+            cached = self._conn.execute("SELECT COUNT(*) FROM share_links").fetchone()[
+                0
+            ]
+        return {
+            "cached_links": cached,
+            "resolutions": self.resolutions,
+            "cache_hits": self.cache_hits,
+            "coalesced_requests": self._inflight.coalesced,
+            "inflight": len(self._inflight),
+        }
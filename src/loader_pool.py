@@ -0,0 +1,237 @@
+"""Thread-safe pools of Instaloader instances and Instagram sessions."""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import instaloader
+from instaloader.exceptions import (
+    AbortDownloadException,
+    TooManyRequestsException,
+)
+
+
+class LoaderPoolTimeoutError(RuntimeError):
+    """Raised when no Instaloader instance becomes available in time."""
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Return True if ``exc`` means Instagram is throttling our requests (HTTP 429)."""
+    if isinstance(exc, TooManyRequestsException):
+        return True
+    message = str(exc).lower()
+    return "429" in message or "please wait a few minutes" in message
+
+
+def is_session_error(exc: BaseException, authenticated: bool = True) -> bool:
+    """
+    Return True if ``exc`` shows the session itself is unusable for now.
+
+    That is a logged-out, challenged or checkpointed session (instaloader's
+    AbortDownloadException), or a throttled authenticated session. Content
+    that needs a login (LoginRequiredException) says nothing about the session,
+    and throttling of anonymous requests is per client, not per session.
+
+    Args:
+        exc: The exception raised by a request made with the session
+        authenticated: Whether the session is logged in
+    """
+    if isinstance(exc, AbortDownloadException):
+        return True
+    return authenticated and is_throttle_error(exc)
+
+
+class LoaderPool:
+    """
+    Pool of Instaloader instances, each with its own HTTP session.
+
+    Instances are created lazily by ``factory`` up to ``size`` and handed out
+    one per fetch via ``checkout()``, so worker threads never share a
+    ``requests.Session``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], instaloader.Instaloader],
+        size: int = 4,
+        checkout_timeout: float | None = 30.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Callable creating a new, ready-to-use Instaloader instance
+            size: Maximum number of Instaloader instances
+            checkout_timeout: Seconds to wait for a free instance (None waits forever)
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        self._idle: queue.LifoQueue[instaloader.Instaloader] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+
+    def _acquire(self) -> instaloader.Instaloader:
+        """Take an idle instance, create a new one, or wait for one to be returned."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise LoaderPoolTimeoutError(
+                f"No Instaloader instance available after {self.checkout_timeout}s"
+            ) from None
+
+    @contextmanager
+    def checkout(self) -> Iterator[instaloader.Instaloader]:
+        """
+        Check out an Instaloader instance for the duration of the block.
+
+        Raises:
+            LoaderPoolTimeoutError: If no instance is available in time
+        """
+        loader = self._acquire()
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        try:
+            yield loader
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(loader)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool size and usage statistics."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+            }
+
+
+class _SessionAccount:
+    """Per-session loader pool plus health counters."""
+
+    def __init__(self, name: str, pool: LoaderPool):
+        self.name = name
+        self.pool = pool
+        self.requests = 0
+        self.errors = 0
+        self.benched_until = 0.0
+
+
+class SessionPool:
+    """
+    Round-robin pool of Instagram sessions, each with its own LoaderPool.
+
+    Checkouts rotate over healthy sessions. A session that turns out to be
+    logged out or challenged, or an authenticated session that gets a 429, is
+    benched for ``bench_seconds``. If every
+    session is benched, the one whose bench expires first is used.
+    """
+
+    def __init__(
+        self,
+        bench_seconds: float = 300.0,
+        on_throttle: Callable[[], None] | None = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            bench_seconds: How long a failing session is taken out of rotation
+            on_throttle: Optional callback for requests that failed because
+                Instagram is throttling (e.g. to slow down outbound requests)
+        """
+        self.bench_seconds = bench_seconds
+        self.on_throttle = on_throttle
+        self._accounts: list[_SessionAccount] = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, pool: LoaderPool) -> None:
+        """Add a session named ``name`` served by ``pool``."""
+        with self._lock:
+            self._accounts.append(_SessionAccount(name, pool))
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def _select(self) -> _SessionAccount:
+        """Pick the next healthy session in round-robin order."""
+        with self._lock:
+            if not self._accounts:
+                raise RuntimeError("Session pool is empty")
+            now = time.monotonic()
+            count = len(self._accounts)
+            for offset in range(count):
+                account = self._accounts[(self._next + offset) % count]
+                if account.benched_until <= now:
+                    self._next = (self._next + offset + 1) % count
+                    break
+            else:
+                account = min(self._accounts, key=lambda a: a.benched_until)
+            account.requests += 1
+            return account
+
+    @contextmanager
+    def checkout(self) -> Iterator[instaloader.Instaloader]:
+        """
+        Check out an Instaloader instance from the next healthy session.
+
+        Session errors raised inside the block bench the session before the
+        exception propagates.
+        """
+        account = self._select()
+        with account.pool.checkout() as loader:
+            try:
+                yield loader
+            except BaseException as e:
+                if is_session_error(e, loader.context.is_logged_in):
+                    with self._lock:
+                        account.errors += 1
+                        account.benched_until = time.monotonic() + self.bench_seconds
+                if self.on_throttle is not None and is_throttle_error(e):
+                    self.on_throttle()
+                raise
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-session request counts, error rates and bench state."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                account.name: {
+                    "requests": account.requests,
+                    "errors": account.errors,
+                    "error_rate": round(account.errors / account.requests, 4)
+                    if account.requests
+                    else 0.0,
+                    "benched": account.benched_until > now,
+                    "benched_for_seconds": round(
+                        max(0.0, account.benched_until - now), 1
+                    ),
+                    "pool": account.pool.stats(),
+                }
+                for account in self._accounts
+            }
@@ -0,0 +1,326 @@
+"""Two-tier cache for fetched Instagram posts (in-memory LRU + on-disk SQLite)."""
+
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from .sqlite_store import SQLiteStore
+
+
+def compress_json(value: Any) -> bytes:
+    """Serialize ``value`` as compact, zlib-compressed JSON."""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+
+
+def decompress_json(blob: bytes) -> Any:
+    """Inverse of ``compress_json``."""
+    return json.loads(zlib.decompress(blob))
+
+
+class CacheEntry(NamedTuple):
+    """A cached value together with the time it was stored and the tier it came from."""
+
+    data: Any
+    stored_at: float
+    tier: str
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the entry was stored."""
+        return max(0.0, time.time() - self.stored_at)
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe in-memory LRU cache with a time-to-live.
+
+    Entries older than ``ttl`` seconds are treated as missing and dropped on
+    access. When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept (0 disables the cache)
+            ttl: Time-to-live of each entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, stored_at), ordered from least to most recently used
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for ``key``, or None if missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, stored_at = item
+            if time.time() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return CacheEntry(value, stored_at, "memory")
+
+    def set(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (
+                value,
+                time.time() if stored_at is None else stored_at,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(SQLiteStore):
+    """
+    Persistent, thread-safe cache tier backed by a SQLite database file.
+
+    Values are stored as JSON, except ``bytes`` values, which are stored
+    as-is and returned as ``bytes``. Expired rows are dropped on access, and once the
+    table grows past ``max_entries`` the oldest rows are evicted.
+    """
+
+    # Number of writes between two eviction passes
+    EVICT_EVERY = 100
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: float = 3600.0):
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of rows kept on disk
+            ttl: Time-to-live of each entry in seconds
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes_since_evict = 0
+        self._open_db(
+            path,
+            "CREATE TABLE IF NOT EXISTS posts ("
+            "key TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS posts_stored_at ON posts (stored_at)",
+        )
+        self._evict()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for ``key``, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, stored_at FROM posts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, stored_at = row
+            if time.time() - stored_at >= self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM posts WHERE key = ?", (key,))
+                return None
+        if not isinstance(data, bytes):
+            data = json.loads(data)
+        return CacheEntry(data, stored_at, "disk")
+
+    def set(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        """Store ``value`` under ``key``."""
+        payload = value if isinstance(value, bytes) else json.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO posts (key, data, stored_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() if stored_at is None else stored_at),
+            )
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= self.EVICT_EVERY
+        if evict:
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM posts WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        """Drop expired rows and trim the table to ``max_entries``, oldest first."""
+        with self._lock, self._conn:
+            self._writes_since_evict = 0
+            self._conn.execute(
+                "DELETE FROM posts WHERE stored_at <= ?", (time.time() - self.ttl,)
+            )
+            self._conn.execute(
+                "DELETE FROM posts WHERE key IN ("
+                "SELECT key FROM posts ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+class PostCache:
+    """
+    Cache of raw post nodes keyed by shortcode.
+
+    Each post is kept as its full instaloader node (``Post._node`` including
+    the fetched metadata), compressed with ``compress_json`` in both tiers,
+    so any field projection, including fields added later, can be derived
+    from a cached entry without another fetch. Entries in any other format
+    (such as the projected dicts cached by earlier versions) are dropped on
+    access.
+
+    Lookups go to the in-memory LRU (L1) first and fall back to the optional
+    SQLite store (L2). L2 hits are promoted into L1 with their original
+    timestamp so the reported age stays accurate.
+
+    Entries are fresh for ``ttl`` seconds. When ``stale_ttl`` is larger, they
+    are kept (and returned as stale) until ``stale_ttl`` so callers can serve
+    them while revalidating in the background.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        db_path: str | None = None,
+        db_max_entries: int = 100_000,
+        stale_ttl: float | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of posts kept in memory (L1)
+            ttl: Time in seconds a cached post is considered fresh (soft TTL)
+            db_path: Optional SQLite file for the persistent tier (L2)
+            db_max_entries: Maximum number of posts kept on disk
+            stale_ttl: Time in seconds after which a cached post is dropped
+                (hard TTL); defaults to ``ttl``, which disables stale serving
+        """
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl) if stale_ttl is not None else ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=self.stale_ttl)
+        self.disk = (
+            SQLiteCache(db_path, max_entries=db_max_entries, ttl=self.stale_ttl)
+            if db_path
+            else None
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, shortcode: str) -> CacheEntry | None:
+        """Return the cached node for ``shortcode`` (possibly stale), or None on a miss."""
+        entry = self.memory.get(shortcode)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(shortcode)
+            if entry is not None:
+                self.memory.set(shortcode, entry.data, stored_at=entry.stored_at)
+        if entry is not None:
+            if isinstance(entry.data, bytes):
+                entry = entry._replace(data=decompress_json(entry.data))
+            else:
+                self.delete(shortcode)
+                entry = None
+        if entry is None:
+            self.misses += 1
+        elif self.is_fresh(entry):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Return True if ``entry`` is younger than the soft TTL."""
+        return entry.age < self.ttl
+
+    def set(self, shortcode: str, node: dict[str, Any]) -> None:
+        """Store the raw post node for ``shortcode`` in every tier."""
+        blob = compress_json(node)
+        stored_at = time.time()
+        self.memory.set(shortcode, blob, stored_at=stored_at)
+        if self.disk is not None:
+            self.disk.set(shortcode, blob, stored_at=stored_at)
+
+    def delete(self, shortcode: str) -> None:
+        """Remove ``shortcode`` from every tier."""
+        self.memory.delete(shortcode)
+        if self.disk is not None:
+            self.disk.delete(shortcode)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk) if self.disk is not None else None,
+        }
+
+
+class NegativeCache:
+    """
+    Short-lived cache of failed post lookups (not found, private, login required).
+
+    Entries are keyed by shortcode and by whether the lookup was made with an
+    authenticated session, so an anonymous miss never masks an authenticated
+    success. Only the exception type and message are kept, and a fresh
+    exception is rebuilt on every hit.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of failed lookups remembered
+            ttl: Time-to-live of each failed lookup in seconds
+        """
+        self.ttl = ttl
+        self._entries = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.hits = 0
+
+    @staticmethod
+    def _key(shortcode: str, authenticated: bool) -> str:
+        return f"{'auth' if authenticated else 'anon'}:{shortcode}"
+
+    def get(self, shortcode: str, authenticated: bool) -> Exception | None:
+        """Return a new exception for a remembered failure, or None."""
+        entry = self._entries.get(self._key(shortcode, authenticated))
+        if entry is None:
+            return None
+        self.hits += 1
+        exc_type, message = entry.data
+        return exc_type(message)
+
+    def set(self, shortcode: str, authenticated: bool, exc: Exception) -> None:
+        """Remember that looking up ``shortcode`` failed with ``exc``."""
+        self._entries.set(self._key(shortcode, authenticated), (type(exc), str(exc)))
+
+    def stats(self) -> dict[str, Any]:
+        """Return the hit counter and number of remembered failures."""
+        return {"hits": self.hits, "entries": len(self._entries)}
@@ -0,0 +1,123 @@
+"""Projection of instaloader Posts and cached post nodes onto the post tool fields."""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from instaloader import Post
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a field projection names unknown fields."""
+
+
+class IncompleteNodeError(LookupError):
+    """Raised when a cached post node lacks the data for a requested field."""
+
+
+class _OfflineContext:
+    """Stand-in InstaloaderContext that refuses every upstream lookup."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise IncompleteNodeError(f"Post node has no data for lookup via {name}")
+
+
+def _comment_count(post: Post) -> int:
+    """Comment count, using the count iPhone API feed nodes carry if present."""
+    # Post.comments doesn't read it and would fetch the full metadata instead
+    count = post._node.get("comments")
+    return count if isinstance(count, int) else post.comments
+
+
+# Output field -> how to read it from a Post. Only the requested entries are
+# evaluated, so unrequested properties never trigger lazy upstream lookups.
+POST_FIELDS: dict[str, Callable[[Post], Any]] = {
+    "shortcode": lambda post: post.shortcode,
+    "text": lambda post: post.caption if post.caption else "",
+    "author": lambda post: post.owner_username,
+    "timestamp": lambda post: post.date_utc.isoformat() if post.date_utc else None,
+    "likes": lambda post: post.likes,
+    "comments": _comment_count,
+    "is_video": lambda post: post.is_video,
+    "typename": lambda post: post.typename,
+}
+
+DEFAULT_FIELDS: tuple[str, ...] = tuple(POST_FIELDS)
+
+
+def normalize_fields(fields: Iterable[str] | None) -> tuple[str, ...]:
+    """
+    Validate a field projection and put it in canonical order.
+
+    ``shortcode`` is always included so results stay identifiable.
+
+    Args:
+        fields: Requested field names, or None for all default fields
+
+    Returns:
+        Tuple of field names in POST_FIELDS order
+
+    Raises:
+        InvalidFieldsError: If any field is unknown
+    """
+    if fields is None:
+        return DEFAULT_FIELDS
+    requested = set(fields)
+    unknown = requested - POST_FIELDS.keys()
+    if unknown:
+        raise InvalidFieldsError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Available fields: {', '.join(POST_FIELDS)}"
+        )
+    requested.add("shortcode")
+    return tuple(name for name in POST_FIELDS if name in requested)
+
+
+def project_post(post: Post, fields: Iterable[str] = DEFAULT_FIELDS) -> dict[str, Any]:
+    """Read only ``fields`` from ``post``."""
+    return {name: POST_FIELDS[name](post) for name in fields}
+
+
+def project_loaded(
+    post: Post, fields: Iterable[str] = DEFAULT_FIELDS
+) -> dict[str, Any]:
+    """
+    Read ``fields`` from the data ``post`` already holds, without upstream requests.
+
+    Feed posts (profile and hashtag pages) come with a partial node, and
+    reading a field it lacks would cost one metadata request per post.
+    Fields without loaded data are left out instead.
+    """
+    offline = Post(_OfflineContext(), post._node, post._owner_profile)
+    data = {}
+    for name in fields:
+        try:
+            data[name] = POST_FIELDS[name](offline)
+        except (IncompleteNodeError, KeyError):
+            continue
+    return data
+
+
+def post_node(post: Post) -> dict[str, Any]:
+    """
+    Return the raw node of ``post`` for caching.
+
+    Includes everything instaloader has loaded for the post so far (the
+    full metadata and owner profile, if fetched), so reading the output
+    fields before calling this makes them derivable by ``project_node``.
+    """
+    return post._asdict()
+
+
+def project_node(
+    node: dict[str, Any], fields: Iterable[str] = DEFAULT_FIELDS
+) -> dict[str, Any]:
+    """
+    Read ``fields`` from a cached post node without any upstream request.
+
+    Raises:
+        IncompleteNodeError: If the node lacks data for one of the fields
+    """
+    try:
+        return project_post(Post(_OfflineContext(), node), fields)
+    except KeyError as e:
+        raise IncompleteNodeError(f"Post node has no {e}") from None
@@ -0,0 +1,240 @@
+"""Bounded, resumable paging over instaloader feed iterators."""
+
+import base64
+import binascii
+import itertools
+import json
+from collections.abc import Callable, Iterator
+from typing import Any, Generic, TypeVar
+
+from instaloader import (
+    FrozenNodeIterator,
+    InstaloaderContext,
+    NodeIterator,
+    Post,
+    Profile,
+)
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a resume cursor is malformed or belongs to another feed."""
+
+
+def encode_cursor(feed: str, after: str | None, skip: int) -> str:
+    """
+    Encode a resume position as an opaque cursor string.
+
+    Args:
+        feed: Identifier of the feed the cursor belongs to (e.g. the username)
+        after: GraphQL end cursor of the page before the current one, or None
+            for the first page
+        skip: Number of items of the current page already returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(
+        {"feed": feed, "after": after, "skip": skip}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(feed: str, cursor: str) -> tuple[str | None, int]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for ``feed``.
+
+    Returns:
+        Tuple of the GraphQL end cursor to resume after and items to skip
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or for another feed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        owner, after, skip = data["feed"], data["after"], data["skip"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from None
+    if owner != feed:
+        raise InvalidCursorError(f"Cursor does not belong to {feed}")
+    if not (after is None or isinstance(after, str)) or not isinstance(skip, int):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return after, max(0, skip)
+
+
+# The logged-in posts query of ``Profile.get_posts()`` in instaloader 4.15
+PROFILE_POSTS_DOC_ID = "28975909992013618"
+
+
+def resume_page(after: str) -> dict[str, Any]:
+    """Return an empty page whose ``page_info`` leads to the page after ``after``."""
+    return {"edges": [], "page_info": {"has_next_page": True, "end_cursor": after}}
+
+
+def thaw_after(iterator: NodeIterator[T], after: str) -> NodeIterator[T]:
+    """
+    Resume an unused iterator so its next item is the first one after ``after``.
+
+    Uses instaloader's resume API, so the iterator must not have requested a
+    page yet (i.e. it was built with ``first_data``).
+    """
+    frozen = iterator.freeze()
+    iterator.thaw(
+        FrozenNodeIterator(
+            query_hash=frozen.query_hash,
+            query_variables=frozen.query_variables,
+            query_referer=frozen.query_referer,
+            context_username=frozen.context_username,
+            total_index=0,
+            best_before=frozen.best_before,
+            remaining_data=resume_page(after),
+            first_node=None,
+            doc_id=frozen.doc_id,
+        )
+    )
+    return iterator
+
+
+def profile_posts(
+    context: InstaloaderContext, profile: Profile, after: str | None = None
+) -> NodeIterator[Post]:
+    """
+    Return a profile's posts iterator, starting after the end cursor ``after``.
+
+    Anonymous iterators start from the profile metadata and are resumed with
+    ``thaw_after``. The logged-in ``Profile.get_posts()`` requests its first
+    page on construction, so a resumed one is built here with the resume
+    page as its first data instead, costing no request until it is read.
+    """
+    if after is None or not context.is_logged_in:
+        iterator = profile.get_posts()
+        return iterator if after is None else thaw_after(iterator, after)
+    return NodeIterator(
+        context=context,
+        query_hash=None,
+        edge_extractor=lambda d: d["data"][
+            "xdt_api__v1__feed__user_timeline_graphql_connection"
+        ],
+        node_wrapper=lambda n: Post.from_iphone_struct(context, n),
+        query_variables={
+            "data": {
+                "count": 12,
+                "include_reel_media_seen_timestamp": True,
+                "include_relationship_info": True,
+                "latest_besties_reel_media": True,
+                "latest_reel_media": True,
+            },
+            "first": 12,
+            "include_multi_captions": True,
+            "username": profile.username,
+            "__relay_internal__pv__PolarisMultiCaptionCarouselEnabledrelayprovider": True,
+            "__relay_internal__pv__PolarisShortDramaEnabledrelayprovider": False,
+            "__relay_internal__pv__PolarisReelsRecoDebugOverlayEnabledrelayprovider": False,
+        },
+        query_referer=f"https://www.instagram.com/{profile.username}/",
+        first_data=resume_page(after),
+        doc_id=PROFILE_POSTS_DOC_ID,
+    )
+
+
+class FeedReader(Generic[T]):
+    """
+    Lazy, resumable view over a feed.
+
+    Iterating yields the feed's items starting at ``cursor``; upstream pages
+    are only requested as iteration crosses into them. ``cursor()`` returns
+    the position after the last item yielded, for a later resume.
+    """
+
+    def __init__(
+        self,
+        open_feed: Callable[[str | None], NodeIterator[T]],
+        feed: str,
+        cursor: str | None = None,
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            open_feed: Returns an unused NodeIterator starting after the given
+                end cursor (at the top for None), e.g. ``profile_posts``
+            feed: Identifier of the feed, bound into returned cursors
+            cursor: Cursor to resume from, or None to start at the top
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed or for another feed
+        """
+        self.feed = feed
+        self._after, self._skip = decode_cursor(feed, cursor) if cursor else (None, 0)
+        self.iterator = open_feed(self._after)
+        page = self.iterator.freeze().remaining_data or {}
+        self._page_info: dict[str, Any] = page.get("page_info") or {}
+        self._page_size = self._left = len(page.get("edges", []))
+        self._exhausted = False
+
+    def __iter__(self) -> Iterator[T]:
+        while True:
+            try:
+                item = next(self.iterator)
+            except StopIteration:
+                self._exhausted = True
+                return
+            # The frozen page holds the edges from the item just read onwards
+            page = self.iterator.freeze().remaining_data
+            page_info = page.get("page_info") or {}
+            if page_info.get("end_cursor") != self._page_info.get("end_cursor"):
+                self._after = self._page_info.get("end_cursor")
+                self._page_info = page_info
+                self._page_size = len(page["edges"])
+            self._left = len(page["edges"]) - 1
+            if self._skip:
+                self._skip -= 1
+                continue
+            yield item
+
+    def cursor(self) -> str | None:
+        """Return the cursor after the last item yielded, or None at the end of the feed."""
+        if self._exhausted:
+            return None
+        if self._skip:
+            return encode_cursor(self.feed, self._after, self._skip)
+        if self._left:
+            return encode_cursor(self.feed, self._after, self._page_size - self._left)
+        if self._page_info.get("has_next_page"):
+            return encode_cursor(self.feed, self._page_info["end_cursor"], 0)
+        return None
+
+
+def read_feed_page(
+    open_feed: Callable[[str | None], NodeIterator[T]],
+    feed: str,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[T], str | None]:
+    """
+    Read up to ``limit`` items from a feed.
+
+    The iterator is consumed lazily: at most one upstream page beyond the
+    position in ``cursor`` is fetched per ``limit`` items, and only the
+    returned items are held in memory, so the cost does not grow with the
+    size of the feed.
+
+    Args:
+        open_feed: Returns an unused NodeIterator starting after the given end
+            cursor (at the top for None), e.g. ``profile_posts``
+        feed: Identifier of the feed, bound into the returned cursor
+        limit: Maximum number of items to return
+        cursor: Cursor returned by a previous call, or None to start at the top
+
+    Returns:
+        Tuple of the items and the cursor for the next call, or None when the
+        feed is exhausted
+
+    Raises:
+        InvalidCursorError: If ``cursor`` is malformed or for another feed
+    """
+    reader = FeedReader(open_feed, feed, cursor)
+    items = list(itertools.islice(reader, limit))
+    return items, reader.cursor()
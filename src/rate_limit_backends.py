@@ -0,0 +1,456 @@
+"""Storage backends for RateLimitMiddleware (in-memory, SQLite and Redis)."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, Protocol
+from urllib.parse import unquote, urlparse
+
+from .sqlite_store import SQLiteStore
+
+
+class RateLimitBackendError(Exception):
+    """Raised when a backend cannot reach or update its shared state."""
+
+
+class RateLimitBackend(Protocol):
+    """
+    Store of per-key GCRA state.
+
+    ``acquire`` atomically checks and consumes one request of budget;
+    ``charge`` atomically applies an arbitrary (possibly negative) cost.
+    """
+
+    async def acquire(self, key: str, interval: float, burst: int) -> float: ...
+
+    async def charge(self, key: str, interval: float, cost: float) -> float: ...
+
+    async def reset(self) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+def gcra(
+    tat: float | None, now: float, interval: float, burst: int
+) -> tuple[float, float]:
+    """
+    Apply one request to a GCRA (generic cell rate algorithm) state.
+
+    Args:
+        tat: Stored theoretical arrival time, or None for a new key
+        now: Current time on the same clock as ``tat``
+        interval: Seconds of budget one request uses
+        burst: Maximum number of back-to-back requests
+
+    Returns:
+        Tuple of the new theoretical arrival time (unchanged when rejected)
+        and the seconds to wait before retrying (0 if the request is allowed)
+    """
+    tat = now if tat is None or tat < now else tat
+    wait = tat - now - (burst - 1) * interval
+    # Ignore float noise at the exact edge of the burst
+    if wait > 1e-9:
+        return tat, wait
+    return tat + interval, 0.0
+
+
+def gcra_charge(tat: float | None, now: float, interval: float, cost: float) -> float:
+    """
+    Unconditionally apply ``cost`` requests' worth of budget to a GCRA state.
+
+    Used to settle a call's real cost after it has been admitted: the
+    theoretical arrival time may move past the burst (a debt that later calls
+    wait out) and a negative ``cost`` refunds budget, but never beyond full.
+
+    Returns:
+        The new theoretical arrival time (at least ``now``)
+    """
+    tat = now if tat is None or tat < now else tat
+    return max(now, tat + cost * interval)
+
+
+class MemoryBackend:
+    """
+    Per-process GCRA state in a dict (one timestamp per key).
+
+    Keys whose budget has fully refilled carry no information and are swept
+    out every ``evict_interval`` seconds.
+    """
+
+    name = "memory"
+
+    def __init__(self, evict_interval: float = 60.0):
+        """
+        Initialize the backend.
+
+        Args:
+            evict_interval: Seconds between sweeps that drop idle keys
+        """
+        self.evict_interval = evict_interval
+        # key -> theoretical arrival time (monotonic clock)
+        self._tat: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_eviction = time.monotonic() + evict_interval
+        self.evicted_keys = 0
+
+    async def acquire(self, key: str, interval: float, burst: int) -> float:
+        """Atomically check and record a request; return the retry delay (0 if allowed)."""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_eviction:
+                self._evict_idle(now)
+            tat, retry_after = gcra(self._tat.get(key), now, interval, burst)
+            self._tat[key] = tat
+            return retry_after
+
+    async def charge(self, key: str, interval: float, cost: float) -> float:
+        """Apply ``cost`` requests to a key; return the seconds until its budget is full."""
+        with self._lock:
+            now = time.monotonic()
+            tat = gcra_charge(self._tat.get(key), now, interval, cost)
+            if tat > now:
+                self._tat[key] = tat
+            else:
+                self._tat.pop(key, None)
+            return tat - now
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop keys whose budget has fully refilled (caller holds the lock)."""
+        idle = [key for key, tat in self._tat.items() if tat <= now]
+        for key in idle:
+            del self._tat[key]
+        self.evicted_keys += len(idle)
+        self._next_eviction = now + self.evict_interval
+
+    async def reset(self) -> None:
+        """Forget all keys."""
+        with self._lock:
+            self._tat.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of tracked and evicted keys."""
+        return {
+            "backend": self.name,
+            "tracked_sessions": len(self._tat),
+            "evicted_sessions": self.evicted_keys,
+        }
+
+
+class SQLiteBackend(SQLiteStore):
+    """
+    GCRA state in a SQLite file shared by all workers on one host.
+
+    Every check-and-consume runs in its own ``BEGIN IMMEDIATE`` transaction,
+    so concurrent processes serialize on the database write lock. The
+    transactions run in worker threads, so waiting for that lock doesn't
+    stall the event loop. Times are wall-clock so every process agrees on
+    them.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, evict_interval: float = 60.0):
+        """
+        Initialize the backend, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            evict_interval: Seconds between sweeps that drop idle keys
+        """
+        self.path = path
+        self.evict_interval = evict_interval
+        self._next_eviction = time.time() + evict_interval
+        self.evicted_keys = 0
+        # Autocommit mode so transactions are opened explicitly
+        self._open_db(
+            path,
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, tat REAL NOT NULL)",
+            timeout=5.0,
+            isolation_level=None,
+        )
+
+    async def acquire(self, key: str, interval: float, burst: int) -> float:
+        """Atomically check and record a request; return the retry delay (0 if allowed)."""
+        return await asyncio.to_thread(self._acquire_sync, key, interval, burst)
+
+    def _acquire_sync(self, key: str, interval: float, burst: int) -> float:
+        """Run the check-and-consume transaction (blocks; runs in a worker thread)."""
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    now = time.time()
+                    if now >= self._next_eviction:
+                        self._evict_idle(now)
+                    row = self._conn.execute(
+                        "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+                    ).fetchone()
+                    tat, retry_after = gcra(
+                        row[0] if row else None, now, interval, burst
+                    )
+                    if retry_after == 0:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)",
+                            (key, tat),
+                        )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            raise RateLimitBackendError(f"SQLite rate limit store error: {e!s}") from e
+        return retry_after
+
+    async def charge(self, key: str, interval: float, cost: float) -> float:
+        """Apply ``cost`` requests to a key; return the seconds until its budget is full."""
+        return await asyncio.to_thread(self._charge_sync, key, interval, cost)
+
+    def _charge_sync(self, key: str, interval: float, cost: float) -> float:
+        """Run the charge transaction (blocks; runs in a worker thread)."""
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    now = time.time()
+                    row = self._conn.execute(
+                        "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+                    ).fetchone()
+                    tat = gcra_charge(row[0] if row else None, now, interval, cost)
+                    if tat > now:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)",
+                            (key, tat),
+                        )
+                    elif row:
+                        self._conn.execute(
+                            "DELETE FROM rate_limits WHERE key = ?", (key,)
+                        )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            raise RateLimitBackendError(f"SQLite rate limit store error: {e!s}") from e
+        return tat - now
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop keys whose budget has fully refilled (inside the transaction)."""
+        cursor = self._conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        self.evicted_keys += cursor.rowcount
+        self._next_eviction = now + self.evict_interval
+
+    async def reset(self) -> None:
+        """Forget all keys."""
+        await asyncio.to_thread(self._reset_sync)
+
+    def _reset_sync(self) -> None:
+        """Delete every key (blocks; runs in a worker thread)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits")
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of tracked keys and keys evicted by this process."""
+        with self._lock:
+            tracked = self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[
+                0
+            ]
+        return {
+            "backend": self.name,
+            "tracked_sessions": tracked,
+            "evicted_sessions": self.evicted_keys,
+        }
+
+
+class RedisBackend:
+    """
+    GCRA state in Redis (or any server speaking the Redis protocol).
+
+    The check-and-consume runs as one Lua script on the server, using the
+    server's clock, so it is atomic across every worker and node. Keys expire
+    once their budget has refilled, so idle sessions are evicted by Redis
+    itself. Talks RESP over one pooled asyncio connection; no client
+    library is required.
+    """
+
+    name = "redis"
+
+    ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local wait = tat - now - (burst - 1) * interval
+if wait > 1e-9 then return tostring(wait) end
+tat = tat + interval
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+return '0'
+"""
+
+    CHARGE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+tat = tat + tonumber(ARGV[1]) * tonumber(ARGV[2])
+if tat <= now then
+  redis.call('DEL', KEYS[1])
+  return '0'
+end
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+return tostring(tat - now)
+"""
+
+    RESET_SCRIPT = """
+local keys = redis.call('KEYS', ARGV[1])
+for _, key in ipairs(keys) do redis.call('DEL', key) end
+return #keys
+"""
+
+    def __init__(
+        self, url: str, prefix: str = "ratelimit:", timeout: float = 2.0
+    ) -> None:
+        """
+        Initialize the backend. The connection is opened on first use.
+
+        Args:
+            url: ``redis://[:password@]host[:port][/db]`` URL
+            prefix: Prefix of the keys holding rate limit state
+            timeout: Seconds to wait for the server before failing
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def _connect(self) -> None:
+        """Open the connection and authenticate/select the database."""
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            if self.username:
+                await self._roundtrip("AUTH", self.username, self.password)
+            else:
+                await self._roundtrip("AUTH", self.password)
+        if self.db:
+            await self._roundtrip("SELECT", str(self.db))
+
+    async def _roundtrip(self, *args: str) -> Any:
+        """Send one command and read its reply."""
+        assert self._writer is not None
+        payload = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode()
+            payload.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._writer.write(b"".join(payload))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        """Read one RESP reply."""
+        assert self._reader is not None
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RateLimitBackendError(f"Redis error: {body.decode()}")
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RateLimitBackendError(f"Unexpected Redis reply: {line!r}")
+
+    async def _command(self, *args: str) -> Any:
+        """Run a command, (re)connecting as needed; one command at a time."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections and locks belong to the loop that created them
+            self._loop, self._lock = loop, asyncio.Lock()
+            self._reader = self._writer = None
+        assert self._lock is not None
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._send(*args), self.timeout)
+            except RateLimitBackendError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                # A half-read reply leaves the connection unusable
+                self._close_connection()
+                raise RateLimitBackendError(
+                    f"Redis rate limit store unreachable: {e!s}"
+                ) from e
+
+    async def _send(self, *args: str) -> Any:
+        if self._writer is None:
+            try:
+                await self._connect()
+            except BaseException:
+                # Don't reuse a connection left unauthenticated or on db 0
+                self._close_connection()
+                raise
+        return await self._roundtrip(*args)
+
+    def _close_connection(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def acquire(self, key: str, interval: float, burst: int) -> float:
+        """Atomically check and record a request; return the retry delay (0 if allowed)."""
+        reply = await self._command(
+            "EVAL",
+            self.ACQUIRE_SCRIPT,
+            "1",
+            self.prefix + key,
+            repr(interval),
+            str(burst),
+        )
+        return float(reply)
+
+    async def charge(self, key: str, interval: float, cost: float) -> float:
+        """Apply ``cost`` requests to a key; return the seconds until its budget is full."""
+        reply = await self._command(
+            "EVAL",
+            self.CHARGE_SCRIPT,
+            "1",
+            self.prefix + key,
+            repr(interval),
+            repr(cost),
+        )
+        return float(reply)
+
+    async def reset(self) -> None:
+        """Delete every key under the prefix."""
+        await self._command("EVAL", self.RESET_SCRIPT, "0", self.prefix + "*")
+
+    async def aclose(self) -> None:
+        """Close the connection."""
+        self._close_connection()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the backend name and server address (state lives in Redis)."""
+        return {"backend": self.name, "server": f"{self.host}:{self.port}/{self.db}"}
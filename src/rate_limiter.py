@@ -1,23 +1,53 @@
 """Rate limiting middleware for FastMCP."""
 
-import time
-from collections import defaultdict
+from typing import Any
 
 from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
 from mcp import types as mt
 
+from .call_usage import track_usage
+from .rate_limit_backends import (
+    MemoryBackend,
+    RateLimitBackend,
+    RateLimitBackendError,
+)
+
 
 class RateLimitMiddleware(Middleware):
     """
-    Simple in-memory rate limiting middleware.
+    Rate limiting middleware using GCRA (generic cell rate algorithm).
+
+    Each session may make ``requests_per_window`` tool calls per
+    ``window_seconds`` on average, with bursts of up to ``burst`` calls. Only
+    one timestamp (the theoretical arrival time) is kept per session, so a
+    check costs O(1) time and memory regardless of the request rate.
 
-    Limits the number of tool calls per session within a sliding time window.
+    The state lives in a pluggable backend with atomic check-and-consume:
+    per-process memory (the default), a SQLite file shared by the workers on
+    one host, or a Redis server shared by every node. If a shared backend
+    fails, calls are let through rather than failing the whole server.
+
+    Calls are charged by the upstream work they cause rather than one unit
+    each. A call is admitted while the session has at least one request of
+    budget left; once it finishes, the session is charged one unit per
+    request sent to Instagram plus ``cache_hit_cost`` per result served from
+    a cache, and at least ``min_call_cost``, so calls that cause no upstream
+    work still use some budget. A batch of cold posts can therefore take the
+    session into debt,
+    which its following calls wait out. The remaining budget and a
+    ``retry_after`` hint are added to every tool result as ``rate_limit``.
     """
 
     def __init__(
         self,
         requests_per_window: int = 10,
         window_seconds: int = 60,
+        burst: int | None = None,
+        evict_interval: float | None = None,
+        backend: RateLimitBackend | None = None,
+        cache_hit_cost: float = 0.0,
+        min_call_cost: float = 0.1,
     ):
         """
         Initialize the rate limiter.
@@ -25,11 +55,33 @@ class RateLimitMiddleware(Middleware):
         Args:
             requests_per_window: Maximum number of requests allowed per time window
             window_seconds: Time window size in seconds
+            burst: Maximum number of back-to-back requests; defaults to
+                ``requests_per_window``
+            evict_interval: Seconds between sweeps that drop idle sessions
+                from the default in-memory backend; defaults to
+                ``window_seconds``
+            backend: Where the per-session state is kept; defaults to a
+                MemoryBackend
+            cache_hit_cost: Units charged per result served from a cache
+                (an upstream request costs 1)
+            min_call_cost: Units every call is charged at least, e.g. calls
+                rejected before any upstream work
         """
         self.requests_per_window = requests_per_window
         self.window_seconds = window_seconds
-        # Track requests: session_id -> list of timestamps
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self.burst = max(1, burst if burst is not None else requests_per_window)
+        # Seconds of budget one request uses
+        self._interval = window_seconds / max(1, requests_per_window)
+        self.backend = (
+            backend
+            if backend is not None
+            else MemoryBackend(
+                evict_interval if evict_interval is not None else window_seconds
+            )
+        )
+        self.cache_hit_cost = cache_hit_cost
+        self.min_call_cost = min_call_cost
+        self.backend_errors = 0
 
     def _get_session_id(self, context: MiddlewareContext) -> str:
         """Extract session ID from context, falling back to a default."""
@@ -40,22 +92,57 @@ class RateLimitMiddleware(Middleware):
                 return str(session_id)
         return "default"
 
-    def _clean_old_requests(self, session_id: str) -> None:
-        """Remove requests outside the current time window."""
-        now = time.time()
-        cutoff = now - self.window_seconds
-        self._requests[session_id] = [
-            ts for ts in self._requests[session_id] if ts > cutoff
-        ]
+    async def _acquire(self, session_id: str) -> float:
+        """
+        Atomically check and record one request of budget.
 
-    def _is_rate_limited(self, session_id: str) -> bool:
-        """Check if the session has exceeded the rate limit."""
-        self._clean_old_requests(session_id)
-        return len(self._requests[session_id]) >= self.requests_per_window
+        Returns:
+            0 if the request was allowed and recorded, otherwise the seconds
+            to wait before retrying
+        """
+        try:
+            return await self.backend.acquire(session_id, self._interval, self.burst)
+        except RateLimitBackendError:
+            # Fail open: an unreachable store shouldn't take the server down
+            self.backend_errors += 1
+            return 0.0
 
-    def _record_request(self, session_id: str) -> None:
-        """Record a new request for the session."""
-        self._requests[session_id].append(time.time())
+    async def _charge(self, session_id: str, cost: float) -> float | None:
+        """
+        Apply ``cost`` requests of budget to a session (negative refunds).
+
+        Returns:
+            Seconds until the session's budget is full again, or None if the
+            backend failed
+        """
+        try:
+            return await self.backend.charge(session_id, self._interval, cost)
+        except RateLimitBackendError:
+            self.backend_errors += 1
+            return None
+
+    def _budget(self, backlog: float) -> dict[str, float]:
+        """Describe the budget left when a session's budget is ``backlog`` seconds from full."""
+        return {
+            "remaining": round(max(0.0, self.burst - backlog / self._interval), 2),
+            "retry_after": round(
+                max(0.0, backlog - (self.burst - 1) * self._interval), 3
+            ),
+        }
+
+    async def reset(self) -> None:
+        """Forget all sessions, restoring every budget."""
+        await self.backend.reset()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the limiter configuration and backend state."""
+        return {
+            "requests_per_window": self.requests_per_window,
+            "window_seconds": self.window_seconds,
+            "burst": self.burst,
+            **self.backend.stats(),
+            "backend_errors": self.backend_errors,
+        }
 
     async def __call__(self, context: MiddlewareContext, call_next):
         """Rate limit tool calls."""
@@ -65,19 +152,53 @@ class RateLimitMiddleware(Middleware):
 
         session_id = self._get_session_id(context)
 
-        if self._is_rate_limited(session_id):
+        retry_after = await self._acquire(session_id)
+        if retry_after > 0:
             # Return a rate limit error as tool result
             return mt.CallToolResult(
                 content=[
                     mt.TextContent(
                         type="text",
                         text=f"Rate limit exceeded. Maximum {self.requests_per_window} "
-                        f"requests per {self.window_seconds} seconds allowed.",
+                        f"requests per {self.window_seconds} seconds allowed. "
+                        f"Retry in {retry_after:.1f} seconds.",
                     )
                 ],
+                structuredContent={
+                    "error": "Rate limit exceeded",
+                    "error_code": "RATE_LIMITED",
+                    "rate_limit": {
+                        "remaining": 0.0,
+                        "retry_after": round(retry_after, 3),
+                    },
+                },
                 isError=True,
             )
 
-        # Record this request and proceed
-        self._record_request(session_id)
-        return await call_next(context)
+        with track_usage() as usage:
+            try:
+                result = await call_next(context)
+            finally:
+                cost = max(
+                    self.min_call_cost,
+                    usage.upstream_requests + usage.cache_hits * self.cache_hit_cost,
+                )
+                # Admission already took one unit; settle the difference
+                backlog = await self._charge(session_id, cost - 1)
+
+        if not isinstance(result, ToolResult) or not isinstance(
+            result.structured_content, dict
+        ):
+            return result
+        rate_limit: dict[str, Any] = {
+            "cost": round(cost, 3),
+            "upstream_requests": usage.upstream_requests,
+            "cache_hits": usage.cache_hits,
+        }
+        if backlog is not None:
+            rate_limit.update(self._budget(backlog))
+        return ToolResult(
+            structured_content={**result.structured_content, "rate_limit": rate_limit},
+            meta=result.meta,
+            is_error=result.is_error,
+        )
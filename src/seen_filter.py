@@ -0,0 +1,215 @@
+"""Memory-bounded seen sets (rotating Bloom filters) with SQLite persistence."""
+
+import hashlib
+import math
+
+from .sqlite_store import SQLiteStore
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+
+    Uses double hashing of one BLAKE2b digest to derive ``hash_count`` bit
+    positions, so membership tests never return false negatives and return
+    false positives at roughly the configured error rate once ``count``
+    reaches the capacity the filter was sized for.
+    """
+
+    def __init__(
+        self,
+        size_bits: int,
+        hash_count: int,
+        bits: bytes | None = None,
+        count: int = 0,
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            size_bits: Number of bits in the filter
+            hash_count: Number of bit positions set per key
+            bits: Serialized bit array from ``to_bytes()``, or None for empty
+            count: Number of keys already added to ``bits``
+        """
+        self.size_bits = max(8, size_bits)
+        self.hash_count = max(1, hash_count)
+        self.bits = bytearray(bits) if bits else bytearray((self.size_bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Create an empty filter sized for ``capacity`` keys at ``error_rate``."""
+        capacity = max(1, capacity)
+        size_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hash_count = round(size_bits / capacity * math.log(2))
+        return cls(size_bits, hash_count)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Add ``key`` to the filter."""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def to_bytes(self) -> bytes:
+        """Return the bit array for persistence."""
+        return bytes(self.bits)
+
+
+class SeenSet:
+    """
+    Approximate set of seen keys with bounded memory.
+
+    Keys go into a current Bloom filter sized for ``capacity`` keys. When it
+    is full it becomes the previous generation and a fresh filter takes over,
+    so memory stays at two filters however many keys are added; keys older
+    than about two generations are eventually forgotten.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        current: BloomFilter | None = None,
+        previous: BloomFilter | None = None,
+    ):
+        """
+        Initialize the set.
+
+        Args:
+            capacity: Keys per generation
+            error_rate: False positive rate of a full generation
+            current: Current generation, or None for an empty one
+            previous: Previous generation, if any
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.current = current or BloomFilter.for_capacity(capacity, error_rate)
+        self.previous = previous
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.current or (
+            self.previous is not None and key in self.previous
+        )
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; return False if it was (probably) already present."""
+        if key in self:
+            return False
+        if self.current.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter.for_capacity(self.capacity, self.error_rate)
+        self.current.add(key)
+        return True
+
+    def __len__(self) -> int:
+        """Approximate number of remembered keys."""
+        return self.current.count + (self.previous.count if self.previous else 0)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the bit arrays."""
+        return len(self.current.bits) + (
+            len(self.previous.bits) if self.previous else 0
+        )
+
+
+class SeenSetStore(SQLiteStore):
+    """
+    SQLite-backed store of SeenSet by name (e.g. hashtag).
+
+    With a ``path`` the sets survive restarts; without one they are kept in
+    an in-memory database. Only the sets being used are loaded into memory.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file, or None for in-memory only
+            capacity: Keys per generation of newly created sets
+            error_rate: False positive rate of newly created sets
+        """
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._open_db(
+            path,
+            "CREATE TABLE IF NOT EXISTS seen_sets ("
+            "name TEXT PRIMARY KEY, capacity INTEGER NOT NULL, "
+            "error_rate REAL NOT NULL, size_bits INTEGER NOT NULL, "
+            "hash_count INTEGER NOT NULL, current_count INTEGER NOT NULL, "
+            "current BLOB NOT NULL, previous_count INTEGER, previous BLOB)",
+        )
+
+    def get(self, name: str) -> tuple[SeenSet, bool]:
+        """
+        Load the seen set for ``name``.
+
+        Returns:
+            Tuple of the set (empty if never stored) and whether it existed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT capacity, error_rate, size_bits, hash_count, current_count, "
+                "current, previous_count, previous FROM seen_sets WHERE name = ?",
+                (name,),
+            ).fetchone()
+        if row is None:
+            return SeenSet(self.capacity, self.error_rate), False
+        capacity, error_rate, size_bits, hash_count = row[:4]
+        current_count, current, previous_count, previous = row[4:]
+        return (
+            SeenSet(
+                capacity,
+                error_rate,
+                BloomFilter(size_bits, hash_count, current, current_count),
+                BloomFilter(size_bits, hash_count, previous, previous_count)
+                if previous is not None
+                else None,
+            ),
+            True,
+        )
+
+    def set(self, name: str, seen: SeenSet) -> None:
+        """Store the seen set for ``name``."""
+        previous = seen.previous
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO seen_sets (name, capacity, error_rate, "
+                "size_bits, hash_count, current_count, current, previous_count, "
+                "previous) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    seen.capacity,
+                    seen.error_rate,
+                    seen.current.size_bits,
+                    seen.current.hash_count,
+                    seen.current.count,
+                    seen.current.to_bytes(),
+                    previous.count if previous else None,
+                    previous.to_bytes() if previous else None,
+                ),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_sets").fetchone()[0]
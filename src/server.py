@@ -1,9 +1,14 @@
 """FastMCP server for Instagram content fetching."""
 
+import asyncio
+import datetime
 import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from typing import Annotated
 
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from instaloader.exceptions import (
     ConnectionException,
     InstaloaderException,
@@ -12,10 +17,26 @@ from instaloader.exceptions import (
 from pydantic import Field
 from starlette.responses import JSONResponse
 
+from .executor import BoundedExecutor, ExecutorBusyError
+from .governor import OutboundGovernor
 from .instaloader_client import InstaloaderClient
+from .link_resolver import ShareLinkResolver
+from .post_cache import LRUCache, NegativeCache, PostCache
+from .post_fields import POST_FIELDS, InvalidFieldsError
+from .profile_feed import InvalidCursorError
+from .rate_limit_backends import MemoryBackend, RedisBackend, SQLiteBackend
 from .rate_limiter import RateLimitMiddleware
-from .update_checker import check_for_updates
-from .url_parser import is_valid_instagram_url
+from .seen_filter import SeenSetStore
+from .sync_state import SyncStateStore
+from .update_checker import get_update_snapshot, update_refresher
+from .url_parser import (
+    PostRef,
+    extract_hashtag,
+    extract_username,
+    iter_post_links,
+    parse_post_ref,
+    parse_share_link,
+)
 
 # Load environment variables
 load_dotenv()
@@ -23,22 +44,344 @@ load_dotenv()
 # Get rate limit configuration from environment
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+RATE_LIMIT_BURST = os.getenv("RATE_LIMIT_BURST")
+# "memory" (per process), "sqlite" (workers on one host) or "redis" (all nodes)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_DB_PATH = os.getenv(
+    "RATE_LIMIT_DB_PATH", "/tmp/instaloader_rate_limits.sqlite3"
+)
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+# Units charged per cached result (an upstream request costs 1)
+RATE_LIMIT_CACHE_HIT_COST = float(os.getenv("RATE_LIMIT_CACHE_HIT_COST", "0"))
+RATE_LIMIT_MIN_CALL_COST = float(os.getenv("RATE_LIMIT_MIN_CALL_COST", "0.1"))
+
+if RATE_LIMIT_BACKEND == "sqlite":
+    rate_limit_backend = SQLiteBackend(
+        RATE_LIMIT_DB_PATH, evict_interval=RATE_LIMIT_WINDOW
+    )
+elif RATE_LIMIT_BACKEND == "redis":
+    rate_limit_backend = RedisBackend(RATE_LIMIT_REDIS_URL)
+elif RATE_LIMIT_BACKEND == "memory":
+    rate_limit_backend = MemoryBackend(evict_interval=RATE_LIMIT_WINDOW)
+else:
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
 
 # Initialize rate limiting middleware
 rate_limiter = RateLimitMiddleware(
     requests_per_window=RATE_LIMIT_REQUESTS,
     window_seconds=RATE_LIMIT_WINDOW,
+    burst=int(RATE_LIMIT_BURST) if RATE_LIMIT_BURST else None,
+    backend=rate_limit_backend,
+    cache_hit_cost=RATE_LIMIT_CACHE_HIT_COST,
+    min_call_cost=RATE_LIMIT_MIN_CALL_COST,
 )
 
+# Get update check configuration from environment (seconds, 0 disables)
+UPDATE_CHECK_INTERVAL = int(os.getenv("UPDATE_CHECK_INTERVAL", "86400"))
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Check for instaloader updates in the background while the server runs.
+
+    On shutdown, the pooled HTTP clients of the client (async engine and
+    share link resolver) are closed.
+    """
+    try:
+        async with update_refresher(UPDATE_CHECK_INTERVAL):
+            yield
+    finally:
+        await instaloader_client.aclose()
+
+
 # Initialize FastMCP server with middleware
-mcp = FastMCP("Instaloader MCP Server", middleware=[rate_limiter])
+mcp = FastMCP("Instaloader MCP Server", middleware=[rate_limiter], lifespan=lifespan)
 
 # Get configuration from environment
 MCP_PORT = int(os.getenv("MCP_PORT", "3336"))
 COOKIE_FILE = os.getenv("COOKIE_FILE")
 
+# Get post cache configuration from environment
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH")
+CACHE_DB_MAX_ENTRIES = int(os.getenv("CACHE_DB_MAX_ENTRIES", "100000"))
+CACHE_STALE_TTL = os.getenv("CACHE_STALE_TTL")
+NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "1024"))
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "300"))
+
+# Initialize post cache (in-memory L1, optional SQLite L2)
+post_cache = PostCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl=CACHE_TTL,
+    db_path=CACHE_DB_PATH,
+    db_max_entries=CACHE_DB_MAX_ENTRIES,
+    stale_ttl=int(CACHE_STALE_TTL) if CACHE_STALE_TTL else None,
+)
+
+# Initialize negative cache for not-found/private/login-required lookups
+negative_cache = NegativeCache(
+    max_entries=NEGATIVE_CACHE_MAX_ENTRIES,
+    ttl=NEGATIVE_CACHE_TTL,
+)
+
+# Get executor configuration from environment
+EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "4"))
+EXECUTOR_QUEUE_SIZE = int(os.getenv("EXECUTOR_QUEUE_SIZE", "64"))
+
+# Initialize dedicated thread pool for blocking instaloader calls
+executor = BoundedExecutor(
+    max_workers=EXECUTOR_WORKERS,
+    max_queue=EXECUTOR_QUEUE_SIZE,
+)
+
+# Get Instaloader pool configuration from environment
+LOADER_POOL_SIZE = int(os.getenv("LOADER_POOL_SIZE", str(EXECUTOR_WORKERS)))
+SESSION_BENCH_SECONDS = int(os.getenv("SESSION_BENCH_SECONDS", "300"))
+FETCH_ENGINE = os.getenv("FETCH_ENGINE", "thread")
+
+# Get outbound request pacing configuration from environment
+OUTBOUND_RATE = float(os.getenv("OUTBOUND_RATE", "5"))
+OUTBOUND_MIN_RATE = float(os.getenv("OUTBOUND_MIN_RATE", "0.1"))
+OUTBOUND_RATE_INCREASE = float(os.getenv("OUTBOUND_RATE_INCREASE", "0.05"))
+OUTBOUND_THROTTLE_PENALTY = float(os.getenv("OUTBOUND_THROTTLE_PENALTY", "30"))
+
+# Initialize the process-wide pacer for requests to Instagram
+outbound_governor = OutboundGovernor(
+    max_rate=OUTBOUND_RATE,
+    min_rate=OUTBOUND_MIN_RATE,
+    increase=OUTBOUND_RATE_INCREASE,
+    penalty=OUTBOUND_THROTTLE_PENALTY,
+)
+
+# Get profile sync state configuration from environment
+SYNC_STATE_DB_PATH = os.getenv("SYNC_STATE_DB_PATH")
+
+# Initialize per-profile sync state (persistent when SYNC_STATE_DB_PATH is set)
+sync_state = SyncStateStore(SYNC_STATE_DB_PATH)
+
+# Get hashtag polling configuration from environment
+HASHTAG_STATE_DB_PATH = os.getenv("HASHTAG_STATE_DB_PATH")
+HASHTAG_SEEN_CAPACITY = int(os.getenv("HASHTAG_SEEN_CAPACITY", "100000"))
+HASHTAG_SEEN_ERROR_RATE = float(os.getenv("HASHTAG_SEEN_ERROR_RATE", "0.001"))
+HASHTAG_POLL_MAX_LIMIT = int(os.getenv("HASHTAG_POLL_MAX_LIMIT", "100"))
+
+# Initialize per-hashtag seen sets (persistent when HASHTAG_STATE_DB_PATH is set)
+seen_store = SeenSetStore(
+    HASHTAG_STATE_DB_PATH,
+    capacity=HASHTAG_SEEN_CAPACITY,
+    error_rate=HASHTAG_SEEN_ERROR_RATE,
+)
+
+# Get comments tool configuration from environment
+COMMENTS_MAX_LIMIT = int(os.getenv("COMMENTS_MAX_LIMIT", "200"))
+COMMENT_CACHE_MAX_PAGES = int(os.getenv("COMMENT_CACHE_MAX_PAGES", "1024"))
+COMMENT_CACHE_TTL = int(os.getenv("COMMENT_CACHE_TTL", "600"))
+
+# Initialize cache of fetched comment pages
+comment_pages = LRUCache(max_entries=COMMENT_CACHE_MAX_PAGES, ttl=COMMENT_CACHE_TTL)
+
+# Get share link resolution configuration from environment
+SHARE_LINK_DB_PATH = os.getenv("SHARE_LINK_DB_PATH")
+
+# Initialize share link resolver (persistent when SHARE_LINK_DB_PATH is set)
+link_resolver = ShareLinkResolver(SHARE_LINK_DB_PATH, governor=outbound_governor)
+
 # Initialize instaloader client
-instaloader_client = InstaloaderClient(cookie_file=COOKIE_FILE)
+instaloader_client = InstaloaderClient(
+    cookie_file=COOKIE_FILE,
+    cache=post_cache,
+    negative_cache=negative_cache,
+    executor=executor,
+    loader_pool_size=LOADER_POOL_SIZE,
+    session_bench_seconds=SESSION_BENCH_SECONDS,
+    fetch_engine=FETCH_ENGINE,
+    sync_state=sync_state,
+    seen_store=seen_store,
+    comment_pages=comment_pages,
+    governor=outbound_governor,
+    link_resolver=link_resolver,
+)
+
+# Get batch tool configuration from environment
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+# Get profile feed configuration from environment
+PROFILE_POSTS_MAX_LIMIT = int(os.getenv("PROFILE_POSTS_MAX_LIMIT", "50"))
+
+
+def _post_input(url: str) -> PostRef | str | None:
+    """
+    Validate a post URL without network access.
+
+    Returns:
+        The parsed reference, the URL itself for a share link (resolved by
+        the client on fetch), or None if it doesn't identify a post
+    """
+    ref = parse_post_ref(url)
+    if ref is None and parse_share_link(url) is not None:
+        return url
+    return ref
+
+
+def _invalid_url_response(url: str, path: str) -> dict:
+    """Build the error dict for a URL that is not a valid Instagram URL."""
+    return {
+        "error": "Invalid Instagram URL format",
+        "error_code": "INVALID_URL_FORMAT",
+        "message": f"The provided URL '{url}' is not a valid Instagram URL format. Expected format: https://www.instagram.com/{path}/{'{shortcode}'}/, shortcode or media ID.",
+        "url": url,
+    }
+
+
+def _invalid_username_response(username: str) -> dict:
+    """Build the error dict for a value that is not a valid Instagram username."""
+    return {
+        "error": "Invalid Instagram username",
+        "error_code": "INVALID_USERNAME",
+        "message": f"The provided value '{username}' is not a valid Instagram username or profile URL. Expected format: https://www.instagram.com/{'{username}'}/ or username only.",
+        "url": username,
+    }
+
+
+def _error_response(e: Exception, url: str, kind: str = "post") -> dict:
+    """
+    Map an exception raised while fetching a post or reel to an error dict.
+
+    Args:
+        e: The exception raised by the client
+        url: The URL or shortcode that was requested
+        kind: "post", "reel", "profile" or "hashtag", used in error names and codes
+    """
+    if isinstance(e, InvalidFieldsError):
+        return {
+            "error": "Invalid fields",
+            "error_code": "INVALID_FIELDS",
+            "message": str(e),
+            "url": url,
+        }
+    if isinstance(e, InvalidCursorError):
+        return {
+            "error": "Invalid cursor",
+            "error_code": "INVALID_CURSOR",
+            "message": f"{str(e)}. Pass the next_cursor returned by a previous call for the same {kind}, or omit it to start from the newest posts.",
+            "url": url,
+        }
+    if isinstance(e, LoginRequiredException):
+        return {
+            "error": "Authentication required",
+            "error_code": "AUTHENTICATION_REQUIRED",
+            "message": f"{str(e)} Please provide a valid session cookie file via COOKIE_FILE environment variable. You can create one by running 'instaloader --login your_username'.",
+            "url": url,
+        }
+    if isinstance(e, ConnectionException):
+        return {
+            "error": "Network error",
+            "error_code": "NETWORK_ERROR",
+            "message": f"Failed to connect to Instagram: {str(e)}. Please check your internet connection and try again.",
+            "url": url,
+            "retry_hint": "This may be a temporary network issue. Please retry after a few moments.",
+        }
+    if isinstance(e, ValueError):
+        return {
+            "error": f"{kind.capitalize()} not found",
+            "error_code": f"{kind.upper()}_NOT_FOUND",
+            "message": f"{str(e)} The {kind} may have been deleted, made private, or the URL/shortcode is incorrect.",
+            "url": url,
+        }
+    if isinstance(e, ExecutorBusyError):
+        return {
+            "error": "Server busy",
+            "error_code": "SERVER_BUSY",
+            "message": f"Too many fetches are queued: {str(e)}.",
+            "url": url,
+            "retry_hint": "The server is at capacity. Please retry after a few moments.",
+        }
+    if isinstance(e, InstaloaderException):
+        return {
+            "error": f"Error fetching {kind}",
+            "error_code": "INSTALOADER_ERROR",
+            "message": f"An error occurred while fetching the {kind}: {str(e)}",
+            "url": url,
+        }
+    return {
+        "error": "Unexpected error",
+        "error_code": "UNEXPECTED_ERROR",
+        "message": f"An unexpected error occurred: {str(e)}",
+        "url": url,
+    }
+
+
+async def _fetch_batch(
+    items: list[tuple[str, PostRef | None]],
+    ctx: Context,
+    stream: bool,
+    logger_name: str,
+) -> tuple[list[dict] | None, bool, int, int]:
+    """
+    Fetch batch items with bounded concurrency, streaming or collecting results.
+
+    A failing item never fails the batch: it gets an error dict with the same
+    error codes as fetch_instagram_post.
+
+    Args:
+        items: (input URL, parsed reference, share link or None if invalid)
+            pairs
+        ctx: Context of the tool call, used to stream items
+        stream: Whether to send items as notifications instead of returning them
+        logger_name: Logger name of the streamed log notifications
+
+    Returns:
+        Tuple of the per-item results (None when streamed), whether the items
+        were streamed, and the numbers of succeeded and failed items
+    """
+    # Notifications need a client session; in-process calls get inline results
+    stream = stream and ctx.request_context is not None
+    results: list[dict] | None = None if stream else [{}] * len(items)
+    completed = 0
+    failed = 0
+
+    async def fetch_item(url: str, ref: PostRef | str | None) -> dict:
+        if ref is None:
+            return _invalid_url_response(url, "p")
+        try:
+            return {**await instaloader_client.fetch_post(ref), "url": url}
+        except Exception as e:
+            return _error_response(e, url, "post")
+
+    async def worker(
+        queue: Iterator[tuple[int, tuple[str, PostRef | str | None]]],
+    ) -> None:
+        nonlocal completed, failed
+        for index, (url, ref) in queue:
+            result = await fetch_item(url, ref)
+            completed += 1
+            if "error_code" in result:
+                failed += 1
+            if results is not None:
+                results[index] = result
+                continue
+            await ctx.report_progress(
+                completed,
+                len(items),
+                f"{url}: {result.get('error_code', 'OK')}",
+            )
+            await ctx.info(
+                f"Batch item {index}: {url}",
+                logger_name=logger_name,
+                extra={"index": index, "result": result},
+            )
+
+    # A fixed set of workers pulls from one shared iterator, so at most
+    # BATCH_CONCURRENCY fetches (and coroutines) exist however big the batch is
+    queue = iter(enumerate(items))
+    await asyncio.gather(
+        *(worker(queue) for _ in range(max(1, min(BATCH_CONCURRENCY, len(items)))))
+    )
+
+    return results, stream, completed - failed, failed
 
 
 @mcp.tool()
@@ -47,19 +390,33 @@ async def fetch_instagram_post(
         ...,
         description=(
             "Instagram post URL (e.g., https://www.instagram.com/p/DRr-n4XER3x/) "
-            "or shortcode (e.g., DRr-n4XER3x)."
+            "shortcode (e.g., DRr-n4XER3x), numeric media ID "
+            "(e.g., 3777388131940113905) or share link "
+            "(e.g., https://www.instagram.com/share/p/BAabc123/)."
         ),
     ),
+    fields: Annotated[
+        list[str] | None,
+        Field(
+            description=(
+                "Optional subset of fields to return ("
+                + ", ".join(POST_FIELDS)
+                + "). Only these are read from Instagram; defaults to all."
+            ),
+        ),
+    ] = None,
 ) -> dict:
     """
     Fetch an Instagram post by URL or shortcode and return its text content as JSON.
 
     Args:
-        url: Instagram post URL (e.g., "https://www.instagram.com/p/DRr-n4XER3x/")
-             or shortcode (e.g., "DRr-n4XER3x")
+        url: Instagram post URL (e.g., "https://www.instagram.com/p/DRr-n4XER3x/"),
+             shortcode (e.g., "DRr-n4XER3x"), media ID (e.g., "3777388131940113905")
+             or share link (resolved once, then cached)
+        fields: Optional list of fields to return; shortcode is always included
 
     Returns:
-        Dictionary containing:
+        Dictionary containing the requested fields of:
         - text: Post caption/text content
         - shortcode: Post shortcode
         - author: Author username
@@ -67,65 +424,33 @@ async def fetch_instagram_post(
         - likes: Number of likes
         - comments: Number of comments
         - is_video: Whether post is a video
+        - typename: GraphImage, GraphVideo or GraphSidecar
+        and always:
+        - resolved_fields: The fields that were resolved and returned
+        - cache_hit: Whether the post was served from the cache
+        - cache_age_seconds: Age of the cached post data in seconds
+        - stale: Whether the cached post is past its soft TTL (refreshing in background)
         - update_info: Instaloader version update information
     """
     try:
-        # Validate URL format
-        if not is_valid_instagram_url(url):
-            return {
-                "error": "Invalid Instagram URL format",
-                "error_code": "INVALID_URL_FORMAT",
-                "message": f"The provided URL '{url}' is not a valid Instagram URL format. Expected format: https://www.instagram.com/p/{'{shortcode}'}/ or shortcode only.",
-                "url": url,
-            }
+        # Parse and validate the URL once; the parsed reference is passed on
+        ref = _post_input(url)
+        if ref is None:
+            return _invalid_url_response(url, "p")
 
         # Fetch post data
-        post_data = await instaloader_client.fetch_post(url)
+        post_data = await instaloader_client.fetch_post(ref, fields)
 
         # Get update information
-        update_info = await check_for_updates()
+        update_info = get_update_snapshot()
 
         # Combine post data with update info
         return {
             **post_data,
             "update_info": update_info,
         }
-    except LoginRequiredException as e:
-        return {
-            "error": "Authentication required",
-            "error_code": "AUTHENTICATION_REQUIRED",
-            "message": f"{str(e)} Please provide a valid session cookie file via COOKIE_FILE environment variable. You can create one by running 'instaloader --login your_username'.",
-            "url": url,
-        }
-    except ConnectionException as e:
-        return {
-            "error": "Network error",
-            "error_code": "NETWORK_ERROR",
-            "message": f"Failed to connect to Instagram: {str(e)}. Please check your internet connection and try again.",
-            "url": url,
-            "retry_hint": "This may be a temporary network issue. Please retry after a few moments.",
-        }
-    except ValueError as e:
-        return {
-            "error": "Post not found",
-            "error_code": "POST_NOT_FOUND",
-            "message": f"{str(e)} The post may have been deleted, made private, or the URL/shortcode is incorrect.",
-            "url": url,
-        }
-    except InstaloaderException as e:
-        return {
-            "error": "Error fetching post",
-            "error_code": "INSTALOADER_ERROR",
-            "message": f"An error occurred while fetching the post: {str(e)}",
-            "url": url,
-        }
     except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "error_code": "UNEXPECTED_ERROR",
-            "message": f"An unexpected error occurred: {str(e)}",
-            "url": url,
-        }
+        return _error_response(e, url, "post")
 
 
 @mcp.tool()
@@ -134,19 +459,30 @@ async def fetch_instagram_reel(
         ...,
         description=(
             "Instagram reel URL (e.g., https://www.instagram.com/reel/ABC123/) "
-            "or shortcode (e.g., ABC123)."
+            "shortcode (e.g., ABC123), numeric media ID or share link."
         ),
     ),
+    fields: Annotated[
+        list[str] | None,
+        Field(
+            description=(
+                "Optional subset of fields to return ("
+                + ", ".join(POST_FIELDS)
+                + "). Only these are read from Instagram; defaults to all."
+            ),
+        ),
+    ] = None,
 ) -> dict:
     """
     Fetch an Instagram reel by URL or shortcode and return its text content as JSON.
 
     Args:
         url: Instagram reel URL (e.g., "https://www.instagram.com/reel/ABC123/")
-             or shortcode (e.g., "ABC123")
+             shortcode (e.g., "ABC123") or media ID
+        fields: Optional list of fields to return; shortcode is always included
 
     Returns:
-        Dictionary containing:
+        Dictionary containing the requested fields of:
         - text: Reel caption/text content
         - shortcode: Reel shortcode
         - author: Author username
@@ -154,65 +490,476 @@ async def fetch_instagram_reel(
         - likes: Number of likes
         - comments: Number of comments
         - is_video: Always True for reels
+        - typename: GraphVideo for reels
+        and always:
+        - resolved_fields: The fields that were resolved and returned
+        - cache_hit: Whether the reel was served from the cache
+        - cache_age_seconds: Age of the cached reel data in seconds
+        - stale: Whether the cached reel is past its soft TTL (refreshing in background)
         - update_info: Instaloader version update information
     """
     try:
-        # Validate URL format
-        if not is_valid_instagram_url(url):
-            return {
-                "error": "Invalid Instagram URL format",
-                "error_code": "INVALID_URL_FORMAT",
-                "message": f"The provided URL '{url}' is not a valid Instagram URL format. Expected format: https://www.instagram.com/reel/{'{shortcode}'}/ or shortcode only.",
-                "url": url,
-            }
+        # Parse and validate the URL once; the parsed reference is passed on
+        ref = _post_input(url)
+        if ref is None:
+            return _invalid_url_response(url, "reel")
 
         # Fetch reel data (reels are posts with video content)
-        reel_data = await instaloader_client.fetch_reel(url)
+        reel_data = await instaloader_client.fetch_reel(ref, fields)
 
         # Get update information
-        update_info = await check_for_updates()
+        update_info = get_update_snapshot()
 
         # Combine reel data with update info
         return {
             **reel_data,
             "update_info": update_info,
         }
-    except LoginRequiredException as e:
+    except Exception as e:
+        return _error_response(e, url, "reel")
+
+
+@mcp.tool()
+async def fetch_instagram_posts_batch(
+    urls: Annotated[
+        list[str],
+        Field(
+            description=(
+                "Instagram post/reel URLs, share links, shortcodes or media IDs "
+                "to fetch. "
+                "Duplicates (by media) are fetched once."
+            ),
+        ),
+    ],
+    ctx: Context,
+    stream: Annotated[
+        bool,
+        Field(
+            description=(
+                "Send each item as a notification as soon as it completes and "
+                "return only a summary. Set to false to get every item in the "
+                "final result instead."
+            ),
+        ),
+    ] = True,
+) -> dict:
+    """
+    Fetch many Instagram posts or reels concurrently in one call.
+
+    Inputs are deduplicated by media ID and fetched with bounded concurrency
+    (BATCH_CONCURRENCY). A failing item never fails the batch: each item gets
+    either its post data or an error dict with the same error codes as
+    fetch_instagram_post.
+
+    When streaming, every completed item is sent straight away as a progress
+    notification plus an ``info`` log notification whose ``extra`` holds
+    ``{"index": ..., "result": ...}``, and is not kept on the server. Without
+    a client session to stream to, results are returned inline.
+
+    Args:
+        urls: Instagram post/reel URLs, shortcodes or media IDs (at most BATCH_MAX_ITEMS)
+        stream: Whether to stream items instead of returning them
+
+    Returns:
+        Dictionary containing:
+        - results: Only when not streaming; one entry per unique shortcode (in
+          input order) plus one per invalid URL; each has the input ``url`` and
+          either post data or ``error``/``error_code``/``message``
+        - streamed: Whether the items were sent as notifications
+        - requested: Number of inputs received
+        - unique: Number of unique shortcodes fetched
+        - succeeded: Number of items fetched successfully
+        - failed: Number of items with an error
+        - update_info: Instaloader version update information
+    """
+    if len(urls) > BATCH_MAX_ITEMS:
         return {
-            "error": "Authentication required",
-            "error_code": "AUTHENTICATION_REQUIRED",
-            "message": f"{str(e)} Please provide a valid session cookie file via COOKIE_FILE environment variable. You can create one by running 'instaloader --login your_username'.",
-            "url": url,
+            "error": "Batch too large",
+            "error_code": "BATCH_TOO_LARGE",
+            "message": f"A batch may contain at most {BATCH_MAX_ITEMS} URLs, got {len(urls)}. Split the request into smaller batches.",
         }
-    except ConnectionException as e:
+
+    # Deduplicate by normalized post reference (or canonical share link),
+    # keeping the first URL seen for each
+    items: list[tuple[str, PostRef | str | None]] = []
+    seen: set[str] = set()
+    for url in urls:
+        ref = _post_input(url)
+        if ref is None:
+            items.append((url, None))
+            continue
+        key = ref.key if isinstance(ref, PostRef) else parse_share_link(ref)
+        if key not in seen:
+            seen.add(key)
+            items.append((url, ref))
+
+    results, stream, succeeded, failed = await _fetch_batch(
+        items, ctx, stream, "fetch_instagram_posts_batch"
+    )
+
+    summary = {
+        "streamed": stream,
+        "requested": len(urls),
+        "unique": len(seen),
+        "succeeded": succeeded,
+        "failed": failed,
+        "update_info": get_update_snapshot(),
+    }
+    return summary if results is None else {"results": results, **summary}
+
+
+@mcp.tool()
+async def extract_instagram_links(
+    text: Annotated[
+        str,
+        Field(
+            description=(
+                "Any text containing Instagram links, e.g. a chat transcript "
+                "or a scraped page."
+            ),
+        ),
+    ],
+    ctx: Context,
+    fetch: Annotated[
+        bool,
+        Field(
+            description=(
+                "Also fetch every linked post, like fetch_instagram_posts_batch."
+            ),
+        ),
+    ] = False,
+    stream: Annotated[
+        bool,
+        Field(
+            description=(
+                "When fetching, send each item as a notification as soon as it "
+                "completes instead of returning it in the result."
+            ),
+        ),
+    ] = False,
+) -> dict:
+    """
+    Find every Instagram post, reel and IGTV link in a text, optionally fetching them.
+
+    The text is scanned once; links are normalized and deduplicated by post,
+    so ``/p/X/`` and ``/reel/X/`` count as one. With ``fetch``, the first
+    BATCH_MAX_ITEMS links are fetched exactly as fetch_instagram_posts_batch
+    would.
+
+    Args:
+        text: Text to scan
+        fetch: Whether to fetch the linked posts
+        stream: Whether to stream fetched items instead of returning them
+
+    Returns:
+        Dictionary containing:
+        - links: One entry per distinct post in order of appearance, with
+          ``kind`` (post, reel or tv), ``shortcode`` and canonical ``url``
+        - count: Number of distinct posts found
+        and when fetching:
+        - results: Only when not streaming; one entry per fetched link with
+          the canonical ``url`` and either post data or an error
+        - streamed, succeeded, failed: As for fetch_instagram_posts_batch
+        - skipped: Links not fetched because of BATCH_MAX_ITEMS
+        - update_info: Instaloader version update information
+    """
+    refs = list(iter_post_links(text))
+    response: dict = {
+        "links": [
+            {"kind": ref.kind, "shortcode": ref.shortcode, "url": ref.url}
+            for ref in refs
+        ],
+        "count": len(refs),
+    }
+    if not fetch:
+        return response
+
+    items: list[tuple[str, PostRef | None]] = [
+        (ref.url, ref) for ref in refs[:BATCH_MAX_ITEMS]
+    ]
+    results, stream, succeeded, failed = await _fetch_batch(
+        items, ctx, stream, "extract_instagram_links"
+    )
+    if results is not None:
+        response["results"] = results
+    return {
+        **response,
+        "streamed": stream,
+        "succeeded": succeeded,
+        "failed": failed,
+        "skipped": len(refs) - len(items),
+        "update_info": get_update_snapshot(),
+    }
+
+
+@mcp.tool()
+async def fetch_instagram_profile_posts(
+    username: str = Field(
+        ...,
+        description=(
+            "Instagram username (e.g., instagram) or profile URL "
+            "(e.g., https://www.instagram.com/instagram/)."
+        ),
+    ),
+    limit: int = Field(
+        12,
+        ge=1,
+        le=PROFILE_POSTS_MAX_LIMIT,
+        description="Maximum number of posts to return in this page.",
+    ),
+    cursor: str | None = Field(
+        None,
+        description=(
+            "next_cursor from a previous call to continue where it stopped; "
+            "omit to start from the newest post."
+        ),
+    ),
+) -> dict:
+    """
+    Fetch a page of a profile's posts, newest first, with a resume cursor.
+
+    Posts are read lazily from the profile feed, so each call only requests
+    about ``limit`` posts from Instagram however large the profile is. Pass
+    ``next_cursor`` back as ``cursor`` to get the following page.
+
+    Args:
+        username: Instagram username or profile URL
+        limit: Maximum number of posts to return (at most PROFILE_POSTS_MAX_LIMIT)
+        cursor: Resume cursor from a previous call
+
+    Returns:
+        Dictionary containing:
+        - username: Normalized username
+        - posts: Posts with the fetch_instagram_post fields the feed page includes
+        - count: Number of posts in this page
+        - next_cursor: Cursor for the next page, or null at the end of the feed
+        - has_more: Whether more posts are available
+        - update_info: Instaloader version update information
+    """
+    try:
+        if not extract_username(username):
+            return _invalid_username_response(username)
+
+        page = await instaloader_client.fetch_profile_posts(username, limit, cursor)
+
         return {
-            "error": "Network error",
-            "error_code": "NETWORK_ERROR",
-            "message": f"Failed to connect to Instagram: {str(e)}. Please check your internet connection and try again.",
-            "url": url,
-            "retry_hint": "This may be a temporary network issue. Please retry after a few moments.",
+            **page,
+            "update_info": get_update_snapshot(),
         }
-    except ValueError as e:
+    except Exception as e:
+        return _error_response(e, username, "profile")
+
+
+@mcp.tool()
+async def sync_instagram_profile(
+    username: str = Field(
+        ...,
+        description=(
+            "Instagram username (e.g., instagram) or profile URL "
+            "(e.g., https://www.instagram.com/instagram/)."
+        ),
+    ),
+    limit: int = Field(
+        12,
+        ge=1,
+        le=PROFILE_POSTS_MAX_LIMIT,
+        description="Maximum number of new posts to return.",
+    ),
+) -> dict:
+    """
+    Return only the posts a profile published since its last sync.
+
+    The server remembers the newest post it has seen per profile and stops
+    reading the feed as soon as it reaches it, so a sync costs about one
+    upstream request per ``limit`` new posts whatever the profile size. The
+    first sync of a profile returns its newest ``limit`` posts as a baseline.
+
+    Args:
+        username: Instagram username or profile URL
+        limit: Maximum number of new posts to return (at most PROFILE_POSTS_MAX_LIMIT)
+
+    Returns:
+        Dictionary containing:
+        - username: Normalized username
+        - new_posts: New posts, newest first, with the fetch_instagram_post fields
+          the feed page includes
+        - count: Number of new posts
+        - first_sync: Whether this was the first sync of the profile
+        - truncated: Whether more than ``limit`` posts were new
+        - gap_cursor: When truncated, a fetch_instagram_profile_posts cursor
+          for the remaining new posts; otherwise null
+        - last_shortcode: Shortcode of the newest post seen
+        - last_timestamp: Timestamp of the newest post seen
+        - previous_sync_at: Unix time of the previous sync, or null
+        - update_info: Instaloader version update information
+    """
+    try:
+        if not extract_username(username):
+            return _invalid_username_response(username)
+
+        delta = await instaloader_client.sync_profile(username, limit)
+
         return {
-            "error": "Reel not found",
-            "error_code": "REEL_NOT_FOUND",
-            "message": f"{str(e)} The reel may have been deleted, made private, or the URL/shortcode is incorrect.",
-            "url": url,
+            **delta,
+            "update_info": get_update_snapshot(),
         }
-    except InstaloaderException as e:
+    except Exception as e:
+        return _error_response(e, username, "profile")
+
+
+@mcp.tool()
+async def poll_instagram_hashtag(
+    hashtag: str = Field(
+        ...,
+        description=(
+            "Hashtag with or without '#' (e.g., sunset) or tag URL "
+            "(e.g., https://www.instagram.com/explore/tags/sunset/)."
+        ),
+    ),
+    limit: int = Field(
+        50,
+        ge=1,
+        le=HASHTAG_POLL_MAX_LIMIT,
+        description="Maximum number of new posts to return.",
+    ),
+    stop_after_seen: int = Field(
+        12,
+        ge=1,
+        le=100,
+        description="Stop paging after this many already-seen posts in a row.",
+    ),
+) -> dict:
+    """
+    Return the recent posts of a hashtag that earlier polls haven't returned.
+
+    Each hashtag has a persistent, fixed-size seen set, so repeated polls only
+    return new posts and stop paging once a run of already-seen posts shows
+    up.
+
+    Args:
+        hashtag: Hashtag name or tag URL
+        limit: Maximum number of new posts to return (at most HASHTAG_POLL_MAX_LIMIT)
+        stop_after_seen: Length of the run of seen posts that ends the poll
+
+    Returns:
+        Dictionary containing:
+        - hashtag: Normalized hashtag name
+        - new_posts: New posts with the fetch_instagram_post fields the feed page includes
+        - count: Number of new posts
+        - scanned: Number of posts read from Instagram
+        - first_poll: Whether the hashtag had not been polled before
+        - stopped_on_seen: Whether a run of seen posts ended the poll
+        - truncated: Whether ``limit`` ended the poll (poll again for more)
+        - seen: Approximate number of posts remembered for the hashtag
+        - update_info: Instaloader version update information
+    """
+    try:
+        if not extract_hashtag(hashtag):
+            return {
+                "error": "Invalid Instagram hashtag",
+                "error_code": "INVALID_HASHTAG",
+                "message": f"The provided value '{hashtag}' is not a valid hashtag. Expected format: https://www.instagram.com/explore/tags/{'{hashtag}'}/, #hashtag or hashtag only.",
+                "url": hashtag,
+            }
+
+        poll = await instaloader_client.poll_hashtag(hashtag, limit, stop_after_seen)
+
         return {
-            "error": "Error fetching reel",
-            "error_code": "INSTALOADER_ERROR",
-            "message": f"An error occurred while fetching the reel: {str(e)}",
-            "url": url,
+            **poll,
+            "update_info": get_update_snapshot(),
         }
     except Exception as e:
+        return _error_response(e, hashtag, "hashtag")
+
+
+@mcp.tool()
+async def fetch_instagram_comments(
+    url: str = Field(
+        ...,
+        description=(
+            "Instagram post or reel URL (e.g., https://www.instagram.com/p/DRr-n4XER3x/) "
+            "shortcode (e.g., DRr-n4XER3x), numeric media ID "
+            "(e.g., 3777388131940113905) or share link "
+            "(e.g., https://www.instagram.com/share/p/BAabc123/)."
+        ),
+    ),
+    limit: int = Field(
+        50,
+        ge=1,
+        le=COMMENTS_MAX_LIMIT,
+        description="Maximum number of comments to return.",
+    ),
+    since: str | None = Field(
+        None,
+        description=(
+            "Only return comments created at or after this ISO 8601 time "
+            "(UTC if no offset is given), e.g. 2025-01-01T00:00:00Z."
+        ),
+    ),
+    cursor: str | None = Field(
+        None,
+        description=(
+            "next_cursor from a previous call to continue where it stopped; "
+            "omit to start from the first page."
+        ),
+    ),
+) -> dict:
+    """
+    Fetch a page of the top-level comments of an Instagram post or reel.
+
+    Comments are read from Instagram one page at a time and reading stops as
+    soon as ``limit`` comments are collected. Pages already read are cached
+    per post, so following ``next_cursor`` only requests new pages.
+
+    Args:
+        url: Instagram post/reel URL or shortcode
+        limit: Maximum number of comments to return (at most COMMENTS_MAX_LIMIT)
+        since: Only return comments created at or after this time
+        cursor: Resume cursor from a previous call
+
+    Returns:
+        Dictionary containing:
+        - shortcode: Post shortcode
+        - comments: Comments with id, text, author, created_at, likes and replies
+        - count: Number of comments in this page
+        - next_cursor: Cursor for the next page, or null when done
+        - has_more: Whether more comments are available
+        - pages_fetched: Comment pages requested from Instagram by this call
+        - pages_cached: Comment pages served from the cache
+        - update_info: Instaloader version update information
+    """
+    try:
+        ref = _post_input(url)
+        if ref is None:
+            return _invalid_url_response(url, "p")
+
+        since_utc = None
+        if since:
+            try:
+                # fromisoformat rejects a "Z" suffix before Python 3.11
+                if since[-1:] in ("Z", "z"):
+                    since = since[:-1] + "+00:00"
+                since_utc = datetime.datetime.fromisoformat(since)
+            except ValueError:
+                return {
+                    "error": "Invalid since timestamp",
+                    "error_code": "INVALID_SINCE",
+                    "message": f"The provided value '{since}' is not an ISO 8601 timestamp, e.g. 2025-01-01T00:00:00Z.",
+                    "url": url,
+                }
+            if since_utc.tzinfo is not None:
+                since_utc = since_utc.astimezone(datetime.timezone.utc).replace(
+                    tzinfo=None
+                )
+
+        page = await instaloader_client.fetch_comments(ref, limit, since_utc, cursor)
+
         return {
-            "error": "Unexpected error",
-            "error_code": "UNEXPECTED_ERROR",
-            "message": f"An unexpected error occurred: {str(e)}",
-            "url": url,
+            **page,
+            "update_info": get_update_snapshot(),
         }
+    except Exception as e:
+        return _error_response(e, url, "post")
 
 
 @mcp.custom_route("/health", methods=["GET"])
@@ -221,6 +968,14 @@ async def health_check(request):
     return JSONResponse({"status": "healthy", "service": "instaloader-mcp"})
 
 
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request):
+    """Runtime statistics endpoint (cache, upstream fetch and rate limit counters)."""
+    return JSONResponse(
+        {**instaloader_client.stats(), "rate_limiter": rate_limiter.stats()}
+    )
+
+
 # ASGI app for production deployment with uvicorn
 app = mcp.http_app()
 
@@ -0,0 +1,53 @@
+"""Shared setup of the SQLite databases backing caches and persistent state."""
+
+import os
+import sqlite3
+import threading
+from typing import Any
+
+
+def open_sqlite(path: str | None, **kwargs: Any) -> sqlite3.Connection:
+    """
+    Open a SQLite connection that may be used from any thread.
+
+    Creates the parent directory of ``path`` if needed and switches file
+    databases to WAL mode, so readers in other processes don't block
+    writers. Without a ``path`` the database is kept in memory.
+
+    Args:
+        path: Path of the SQLite database file, or None for in-memory only
+        **kwargs: Further arguments for ``sqlite3.connect``
+    """
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path or ":memory:", check_same_thread=False, **kwargs)
+    if path:
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class SQLiteStore:
+    """
+    Mixin for classes keeping their state in one shared SQLite connection.
+
+    Every use of ``_conn`` must hold ``_lock``, since the connection is
+    shared by the executor threads and the event loop.
+    """
+
+    _conn: sqlite3.Connection
+    _lock: threading.Lock
+
+    def _open_db(self, path: str | None, *schema: str, **kwargs: Any) -> None:
+        """Open the database at ``path`` and run the ``schema`` statements."""
+        self._lock = threading.Lock()
+        self._conn = open_sqlite(path, **kwargs)
+        with self._lock, self._conn:
+            for statement in schema:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,80 @@
+"""Persistent per-profile sync state for incremental profile syncs."""
+
+import time
+from typing import NamedTuple
+
+from .sqlite_store import SQLiteStore
+
+
+class SyncState(NamedTuple):
+    """
+    Newest post seen for a profile and when it was last synced.
+
+    ``last_timestamp`` is an ISO timestamp (UTC).
+    """
+
+    last_shortcode: str | None
+    last_timestamp: str | None
+    synced_at: float
+
+
+class SyncStateStore(SQLiteStore):
+    """
+    SQLite-backed store of SyncState by username.
+
+    With a ``path`` the state survives restarts (e.g. on the session volume);
+    without one it is kept in an in-memory database.
+    """
+
+    def __init__(self, path: str | None = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file, or None for in-memory only
+        """
+        self.path = path
+        self._open_db(
+            path,
+            "CREATE TABLE IF NOT EXISTS profile_sync ("
+            "username TEXT PRIMARY KEY, last_shortcode TEXT, last_timestamp TEXT, "
+            "synced_at REAL NOT NULL)",
+        )
+
+    def get(self, username: str) -> SyncState | None:
+        """Return the stored state for ``username``, or None if never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_shortcode, last_timestamp, synced_at "
+                "FROM profile_sync WHERE username = ?",
+                (username,),
+            ).fetchone()
+        return SyncState(*row) if row else None
+
+    def set(
+        self,
+        username: str,
+        last_shortcode: str | None,
+        last_timestamp: str | None,
+    ) -> SyncState:
+        """Store the state for ``username`` and return it."""
+        state = SyncState(last_shortcode, last_timestamp, time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profile_sync "
+                "(username, last_shortcode, last_timestamp, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (username, *state),
+            )
+        return state
+
+    def delete(self, username: str) -> None:
+        """Forget the state for ``username`` so the next sync starts over."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM profile_sync WHERE username = ?", (username,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profile_sync").fetchone()[0]
@@ -1,14 +1,24 @@
 """Update checking mechanism for instaloader package."""
 
+import asyncio
+import contextlib
 import datetime
+from collections.abc import AsyncIterator
 
 import httpx
 import instaloader
 
+from .concurrency import SingleFlight
+
 # Cache for update information
 _update_cache: dict | None = None
 _cache_timestamp: datetime.datetime | None = None
 CACHE_DURATION = datetime.timedelta(days=1)
+# Delay before retrying a check that failed to reach PyPI
+RETRY_INTERVAL = datetime.timedelta(minutes=10)
+
+# The PyPI request in flight, shared by concurrent refreshes (single-flight)
+_refresh: SingleFlight[str, dict] = SingleFlight()
 
 
 def get_installed_version() -> str:
@@ -65,13 +75,29 @@ async def check_for_updates() -> dict:
         - update_available: bool
         - update_check_error: Optional[str]
     """
-    global _update_cache, _cache_timestamp
-
     # Return cached result if still valid
     if is_cache_valid() and _update_cache is not None:
         return _update_cache.copy()
 
-    # Fetch new update information
+    return await refresh_updates()
+
+
+async def refresh_updates() -> dict:
+    """
+    Check PyPI for updates now and cache the result.
+
+    Concurrent calls share one request to PyPI.
+
+    Returns:
+        The update information, as returned by check_for_updates
+    """
+    return (await _refresh.run("pypi", _fetch_update_info)).copy()
+
+
+async def _fetch_update_info() -> dict:
+    """Fetch the latest version from PyPI and replace the cached result."""
+    global _update_cache, _cache_timestamp
+
     installed = get_installed_version()
     latest = await get_latest_version()
 
@@ -93,3 +119,64 @@ async def check_for_updates() -> dict:
     _cache_timestamp = datetime.datetime.now()
 
     return result
+
+
+def get_update_snapshot() -> dict:
+    """
+    Return the last update check result without any network access.
+
+    The result is kept current by ``run_update_refresher``; it is returned
+    even past CACHE_DURATION while a refresh is due.
+
+    Returns:
+        Dictionary with the same keys as check_for_updates; before the first
+        check completes, ``latest_version`` is None and ``update_check_error``
+        says the check is pending
+    """
+    if _update_cache is not None:
+        return _update_cache.copy()
+    return {
+        "installed_version": get_installed_version(),
+        "latest_version": None,
+        "update_available": False,
+        "update_check_error": "Update check pending",
+    }
+
+
+async def run_update_refresher(
+    interval: float = CACHE_DURATION.total_seconds(),
+    retry_interval: float = RETRY_INTERVAL.total_seconds(),
+) -> None:
+    """
+    Refresh the update information forever (until cancelled).
+
+    Args:
+        interval: Seconds between successful checks
+        retry_interval: Seconds before retrying a check that failed
+    """
+    while True:
+        result = await refresh_updates()
+        delay = retry_interval if result["update_check_error"] else interval
+        await asyncio.sleep(min(delay, interval))
+
+
+@contextlib.asynccontextmanager
+async def update_refresher(
+    interval: float = CACHE_DURATION.total_seconds(),
+) -> AsyncIterator[None]:
+    """
+    Run ``run_update_refresher`` in the background for the duration of the context.
+
+    Args:
+        interval: Seconds between checks; 0 or less disables checking
+    """
+    if interval <= 0:
+        yield
+        return
+    task = asyncio.ensure_future(run_update_refresher(interval))
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
@@ -1,44 +1,239 @@
 """URL parsing utilities for extracting Instagram shortcodes from URLs."""
 
 import re
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import NamedTuple
 
+# URL path segment -> PostRef kind
+_KINDS = {"p": "post", "reel": "reel", "tv": "tv"}
+_PATHS = {kind: path for path, kind in _KINDS.items()}
 
-def extract_shortcode(url_or_shortcode: str) -> str | None:
+# A post/reel/tv URL on instagram.com or the instagr.am short domain,
+# optionally under a username: instagram.com/{username}/p/{shortcode}/
+# (share links, instagram.com/share/reel/{token}/, carry a token instead)
+_POST_URL = (
+    r"(?:instagram\.com|instagr\.am)/(?:(?!share/)[A-Za-z0-9._]+/)?"
+    r"(?P<path>p|reel|tv)/(?P<code>[A-Za-z0-9_-]+)"
+)
+
+# A share link, which only redirects to the post
+_SHARE_LINK_RE = re.compile(
+    r"^\s*(?:https?://)?(?:www\.)?(?:instagram\.com|instagr\.am)/share/"
+    r"(?:(?P<path>p|reel|tv)/)?(?P<token>[A-Za-z0-9_-]+)/?(?:[?#]\S*)?\s*$"
+)
+
+# One pass recognizes a numeric media ID (optionally with the "_{owner id}"
+# suffix of Instagram's full IDs), a bare shortcode or a post URL. Shortcodes
+# of public posts have at most 11 characters, so 12+ digits are an ID.
+_POST_REF_RE = re.compile(
+    r"^\s*(?P<id>\d{12,})(?:_\d+)?\s*$"
+    r"|^[\s/]*(?P<bare>[A-Za-z0-9_-]+)[\s/]*$|" + _POST_URL
+)
+
+# Post links embedded in free text
+_POST_LINK_RE = re.compile(r"\b" + _POST_URL)
+
+# Characters kept between chunks so a link split across two chunks is found;
+# longer than any post link
+_LINK_CARRY = 128
+
+# Distinct inputs whose parse result is memoized
+POST_REF_MEMO_SIZE = 4096
+
+# Shortcodes are media IDs written in base 64 with this alphabet
+_SHORTCODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_SHORTCODE_DIGITS = {char: value for value, char in enumerate(_SHORTCODE_ALPHABET)}
+
+# Longer shortcodes (private posts) carry more than the media ID
+SHORTCODE_MAX_ID_LENGTH = 11
+
+
+def shortcode_to_media_id(shortcode: str) -> int:
     """
-    Extract shortcode from an Instagram URL or return the shortcode if already provided.
+    Convert a shortcode to its numeric media ID, without any network request.
+
+    Raises:
+        ValueError: If the shortcode is empty, has invalid characters or is
+            longer than SHORTCODE_MAX_ID_LENGTH
+    """
+    if not shortcode or len(shortcode) > SHORTCODE_MAX_ID_LENGTH:
+        raise ValueError(f"Shortcode has no media ID form: {shortcode}")
+    media_id = 0
+    for char in shortcode:
+        digit = _SHORTCODE_DIGITS.get(char)
+        if digit is None:
+            raise ValueError(f"Invalid shortcode character {char!r}: {shortcode}")
+        media_id = media_id * 64 + digit
+    return media_id
+
+
+def media_id_to_shortcode(media_id: int | str) -> str:
+    """
+    Convert a numeric media ID to its shortcode, without any network request.
+
+    Args:
+        media_id: Media ID as an int or digit string; a "_{owner id}" suffix
+            (as in Instagram's full IDs) is ignored
+
+    Raises:
+        ValueError: If the media ID is not a positive integer
+    """
+    if isinstance(media_id, str):
+        media_id = media_id.split("_", 1)[0]
+        if not media_id.isdigit():
+            raise ValueError(f"Invalid media ID: {media_id}")
+        media_id = int(media_id)
+    if media_id <= 0:
+        raise ValueError(f"Invalid media ID: {media_id}")
+    chars = []
+    while media_id:
+        media_id, digit = divmod(media_id, 64)
+        chars.append(_SHORTCODE_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+class PostRef(NamedTuple):
+    """Normalized reference to an Instagram post, reel or IGTV video."""
+
+    kind: str
+    shortcode: str
+
+    @property
+    def url(self) -> str:
+        """Canonical URL of the post."""
+        return f"https://www.instagram.com/{_PATHS[self.kind]}/{self.shortcode}/"
+
+    @property
+    def media_id(self) -> int | None:
+        """Numeric media ID, or None for shortcodes without an ID form."""
+        try:
+            return shortcode_to_media_id(self.shortcode)
+        except ValueError:
+            return None
+
+    @property
+    def key(self) -> str:
+        """
+        Identity of the underlying media, used as the cache and dedup key.
+
+        The numeric media ID (the shortcode if it has no ID form), so
+        ``/p/X/``, ``/reel/X/``, ``/tv/X/`` and the ID itself are one entry.
+        """
+        media_id = self.media_id
+        return str(media_id) if media_id is not None else self.shortcode
+
+
+@lru_cache(maxsize=POST_REF_MEMO_SIZE)
+def parse_post_ref(url_or_shortcode: str) -> PostRef | None:
+    """
+    Parse an Instagram post/reel/tv URL, shortcode or media ID into a PostRef.
 
     Supports:
     - https://www.instagram.com/p/{shortcode}/
     - https://instagram.com/p/{shortcode}/ (without www)
     - https://www.instagram.com/reel/{shortcode}/ (for reels)
-    - Direct shortcode input
+    - https://www.instagram.com/tv/{shortcode}/ (for IGTV)
+    - https://www.instagram.com/{username}/p/{shortcode}/
+    - https://instagr.am/p/{shortcode}/ (short domain)
+    - Direct shortcode input (kind "post")
+    - Numeric media ID (12+ digits, optionally "{media id}_{owner id}"),
+      converted to its shortcode locally (kind "post")
+
+    Results are memoized, so repeated lookups of the same input are cheap.
 
     Args:
         url_or_shortcode: Instagram URL or shortcode string
 
     Returns:
-        Extracted shortcode, or None if URL format is invalid
+        The normalized reference, or None if the input is not a post reference
     """
-    # If it's already a shortcode (no http/https and no slashes except at start/end)
-    if not url_or_shortcode.startswith("http"):
-        # Clean up any trailing/leading whitespace or slashes
-        shortcode = url_or_shortcode.strip().strip("/")
-        # Validate it looks like a shortcode (alphanumeric, hyphens, underscores)
-        if re.match(r"^[a-zA-Z0-9_-]+$", shortcode):
-            return shortcode
-
-    # Patterns for Instagram URLs
-    patterns = [
-        r"instagram\.com/p/([a-zA-Z0-9_-]+)",
-        r"instagram\.com/reel/([a-zA-Z0-9_-]+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url_or_shortcode)
-        if match:
-            return match.group(1)
+    match = _POST_REF_RE.search(url_or_shortcode)
+    if match is None:
+        return None
+    if match.group("id") is not None:
+        return PostRef("post", media_id_to_shortcode(match.group("id")))
+    if match.group("bare") is not None:
+        if url_or_shortcode.startswith("http"):
+            return None
+        return PostRef("post", match.group("bare"))
+    return PostRef(_KINDS[match.group("path")], match.group("code"))
 
-    return None
+
+def iter_post_links(text: str | Iterable[str]) -> Iterator[PostRef]:
+    """
+    Find every Instagram post/reel/tv link in a text, in one linear pass.
+
+    The text may be given whole or as an iterable of chunks (e.g. lines of a
+    file or pieces of a download), so arbitrarily large inputs are scanned
+    without being held in memory at once. Links split across chunks are
+    still found. Each post is yielded once, at its first link; bare
+    shortcodes in the text are not treated as links.
+
+    Args:
+        text: The text, or an iterable of consecutive chunks of it
+
+    Yields:
+        The normalized reference of each distinct post, in order of appearance
+    """
+    chunks = (text,) if isinstance(text, str) else text
+    seen: set[str] = set()
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk if carry else chunk
+        resume = max(0, len(buffer) - _LINK_CARRY)
+        for match in _POST_LINK_RE.finditer(buffer):
+            if match.end() == len(buffer):
+                # The shortcode may continue in the next chunk
+                resume = min(resume, match.start())
+                break
+            resume = max(resume, match.end())
+            ref = PostRef(_KINDS[match.group("path")], match.group("code"))
+            if ref.key not in seen:
+                seen.add(ref.key)
+                yield ref
+        carry = buffer[resume:]
+    # Whatever is left ends the text, so a trailing link is complete
+    for match in _POST_LINK_RE.finditer(carry):
+        ref = PostRef(_KINDS[match.group("path")], match.group("code"))
+        if ref.key not in seen:
+            seen.add(ref.key)
+            yield ref
+
+
+def parse_share_link(url: str) -> str | None:
+    """
+    Normalize an Instagram share link (``instagram.com/share/...``).
+
+    Share links only name a post through a redirect, so they can't be parsed
+    into a PostRef locally; see ``link_resolver.ShareLinkResolver``.
+
+    Args:
+        url: Candidate share link
+
+    Returns:
+        The canonical share link (without tracking parameters), or None if
+        ``url`` is not a share link
+    """
+    match = _SHARE_LINK_RE.match(url)
+    if match is None:
+        return None
+    path = f"{match.group('path')}/" if match.group("path") else ""
+    return f"https://www.instagram.com/share/{path}{match.group('token')}/"
+
+
+def extract_shortcode(url_or_shortcode: str) -> str | None:
+    """
+    Extract shortcode from an Instagram URL or return the shortcode if already provided.
+
+    Args:
+        url_or_shortcode: Instagram URL or shortcode string
+
+    Returns:
+        Extracted shortcode, or None if URL format is invalid
+    """
+    ref = parse_post_ref(url_or_shortcode)
+    return ref.shortcode if ref is not None else None
 
 
 def is_valid_instagram_url(url: str) -> bool:
@@ -51,4 +246,60 @@ def is_valid_instagram_url(url: str) -> bool:
     Returns:
         True if valid Instagram URL format, False otherwise
     """
-    return extract_shortcode(url) is not None
+    return parse_post_ref(url) is not None
+
+
+def extract_username(url_or_username: str) -> str | None:
+    """
+    Extract a username from an Instagram profile URL or return it if already provided.
+
+    Supports:
+    - https://www.instagram.com/{username}/
+    - @{username}
+    - Direct username input
+
+    Args:
+        url_or_username: Instagram profile URL or username string
+
+    Returns:
+        Lowercased username, or None if the input is not a valid profile reference
+    """
+    value = url_or_username.strip()
+    if value.startswith("http"):
+        match = re.search(r"instagram\.com/([A-Za-z0-9._]+)/?(?:[?#].*)?$", value)
+        if not match or match.group(1) in ("p", "reel", "explore", "stories"):
+            return None
+        value = match.group(1)
+    value = value.lstrip("@").strip("/")
+    # Instagram usernames: letters, digits, periods and underscores, max 30
+    if re.match(r"^[A-Za-z0-9._]{1,30}$", value):
+        return value.lower()
+    return None
+
+
+def extract_hashtag(url_or_hashtag: str) -> str | None:
+    """
+    Extract a hashtag name from an Instagram tag URL or return it if already provided.
+
+    Supports:
+    - https://www.instagram.com/explore/tags/{hashtag}/
+    - #{hashtag}
+    - Direct hashtag input
+
+    Args:
+        url_or_hashtag: Instagram hashtag URL or hashtag string
+
+    Returns:
+        Lowercased hashtag without the leading '#', or None if invalid
+    """
+    value = url_or_hashtag.strip()
+    if value.startswith("http"):
+        match = re.search(r"instagram\.com/explore/tags/([^/?#]+)", value)
+        if not match:
+            return None
+        value = match.group(1)
+    value = value.lstrip("#").strip("/")
+    # Hashtags are letters (any script), digits and underscores
+    if re.match(r"^\w+$", value):
+        return value.lower()
+    return None
@@ -0,0 +1,210 @@
+"""Tests for the httpx-based async fetch engine."""
+
+import httpx
+import pytest
+from instaloader.exceptions import ConnectionException, LoginRequiredException
+
+from src.async_fetcher import POST_DOC_ID, AsyncPostFetcher, media_to_node
+from src.call_usage import track_usage
+from src.governor import OutboundGovernor
+from src.post_fields import project_node
+
+MEDIA = {
+    "code": "ASYNC1",
+    "media_type": 2,
+    "caption": {"text": "Async caption"},
+    "user": {"username": "Reeler"},
+    "taken_at": 1735689600,
+    "like_count": 42,
+    "comment_count": 7,
+}
+
+
+def _fetcher(handler) -> AsyncPostFetcher:
+    """Build a fetcher whose client talks to a mock transport."""
+    fetcher = AsyncPostFetcher(http2=False)
+    fetcher._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), cookies={"csrftoken": "tok"}
+    )
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_client_negotiates_http2():
+    """The shared client is built for HTTP/2, whose "h2" dependency is installed."""
+    fetcher = AsyncPostFetcher()
+    client = fetcher._get_client()
+    assert client._transport._pool._http2 is True
+    await fetcher.aclose()
+
+
+def test_media_to_node():
+    """web_info media items map to nodes that project to the fetch_post fields."""
+    assert project_node(media_to_node(MEDIA)) == {
+        "shortcode": "ASYNC1",
+        "text": "Async caption",
+        "author": "reeler",
+        "timestamp": "2025-01-01T00:00:00",
+        "likes": 42,
+        "comments": 7,
+        "is_video": True,
+        "typename": "GraphVideo",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_success():
+    """A successful GraphQL response is mapped into post data."""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = request.content.decode()
+        seen["csrf"] = request.headers.get("x-csrftoken")
+        return httpx.Response(
+            200,
+            json={
+                "data": {"xdt_api__v1__media__shortcode__web_info": {"items": [MEDIA]}}
+            },
+        )
+
+    fetcher = _fetcher(handler)
+    result = await fetcher.fetch("ASYNC1")
+    await fetcher.aclose()
+
+    assert result["shortcode"] == "ASYNC1"
+    assert result["code"] == "ASYNC1"
+    assert project_node(result, ["text"])["text"] == "Async caption"
+    assert POST_DOC_ID in seen["body"]
+    assert seen["csrf"] == "tok"
+
+
+@pytest.mark.asyncio
+async def test_fetch_empty_items_is_not_found():
+    """A response without items raises ValueError."""
+    fetcher = _fetcher(lambda request: httpx.Response(200, json={"data": {}}))
+    with pytest.raises(ValueError, match="Post not found"):
+        await fetcher.fetch("GONE1")
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_login_redirect():
+    """A redirect to the login page raises LoginRequiredException."""
+    fetcher = _fetcher(
+        lambda request: httpx.Response(
+            302, headers={"location": "https://www.instagram.com/accounts/login/"}
+        )
+    )
+    with pytest.raises(LoginRequiredException, match="private"):
+        await fetcher.fetch("PRIV1")
+    await fetcher.aclose()
+
+
+def _home_then_graphql(request: httpx.Request) -> httpx.Response:
+    """Serve the CSRF cookie on the home page and a post on GraphQL."""
+    if request.method == "GET":
+        return httpx.Response(200, headers={"set-cookie": "csrftoken=fresh; Path=/"})
+    return httpx.Response(
+        200,
+        json={"data": {"xdt_api__v1__media__shortcode__web_info": {"items": [MEDIA]}}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_csrf_request_is_paced_and_billed():
+    """The home page request for the CSRF token goes through the governor."""
+    fetcher = AsyncPostFetcher(http2=False, governor=OutboundGovernor(max_rate=100.0))
+    fetcher._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_home_then_graphql)
+    )
+    with track_usage() as usage:
+        await fetcher.fetch("ASYNC1")
+        await fetcher.fetch("ASYNC1")
+    await fetcher.aclose()
+
+    assert fetcher.governor.stats()["requests"] == 3
+    assert usage.upstream_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_csrf_request_is_billed_without_governor():
+    """Without a governor both requests are still billed to the call."""
+    fetcher = AsyncPostFetcher(http2=False)
+    fetcher._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_home_then_graphql)
+    )
+    with track_usage() as usage:
+        await fetcher.fetch("ASYNC1")
+    await fetcher.aclose()
+
+    assert usage.upstream_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_csrf_request_throttled():
+    """A 429 on the home page is reported to the governor and raised."""
+    fetcher = AsyncPostFetcher(
+        http2=False, governor=OutboundGovernor(max_rate=100.0, penalty=0)
+    )
+    fetcher._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429))
+    )
+    with pytest.raises(ConnectionException, match="429"):
+        await fetcher.fetch("ASYNC1")
+    await fetcher.aclose()
+
+    assert fetcher.governor.stats()["requests"] == 1
+    assert fetcher.governor.stats()["throttle_events"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_throttled():
+    """A 429 response raises ConnectionException mentioning 429."""
+    fetcher = _fetcher(lambda request: httpx.Response(429))
+    fetcher.governor = OutboundGovernor(max_rate=100.0)
+    with pytest.raises(ConnectionException, match="429"):
+        await fetcher.fetch("ABC123")
+    await fetcher.aclose()
+
+    assert fetcher.governor.stats()["requests"] == 1
+    assert fetcher.governor.stats()["throttle_events"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_status():
+    """A 200 with a non-ok status is a failed request, not a missing post."""
+    fetcher = _fetcher(
+        lambda request: httpx.Response(
+            200, json={"status": "fail", "message": "Please wait a few minutes"}
+        )
+    )
+    fetcher.governor = OutboundGovernor(max_rate=100.0, penalty=0)
+    with pytest.raises(ConnectionException, match="Please wait a few minutes"):
+        await fetcher.fetch("ABC123")
+    assert fetcher.governor.stats()["throttle_events"] == 1
+    await fetcher.aclose()
+
+    fetcher._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"status": "fail"})
+        ),
+        cookies={"csrftoken": "tok"},
+    )
+    with pytest.raises(ConnectionException, match='"fail" status'):
+        await fetcher.fetch("ABC123")
+    await fetcher.aclose()
+
+    assert fetcher.governor.stats()["throttle_events"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_network_error():
+    """Transport errors raise ConnectionException."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    fetcher = _fetcher(handler)
+    with pytest.raises(ConnectionException, match="Network error"):
+        await fetcher.fetch("ABC123")
+    await fetcher.aclose()
@@ -0,0 +1,83 @@
+"""Tests for page-by-page comment reading."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from instaloader.exceptions import LoginRequiredException
+
+from src.comments import comment_to_dict, iter_comment_pages
+
+
+def _iphone_comment(pk, created_at=1735689600):
+    return {
+        "pk": str(pk),
+        "created_at": created_at,
+        "text": f"comment {pk}",
+        "comment_like_count": 2,
+        "child_comment_count": 1,
+        "user": {"username": "commenter"},
+    }
+
+
+def _large_post(pages):
+    """Mock a post with more comments than fit one page, served from ``pages``."""
+    post = MagicMock()
+    post.comments = 100
+    post.mediaid = 42
+    post._context.is_logged_in = True
+    post._context.get_iphone_json.side_effect = lambda path, params: pages[
+        params.get("min_id")
+    ]
+    return post
+
+
+def test_small_post_uses_get_comments():
+    """Posts with one page of comments are read through Post.get_comments()."""
+    post = MagicMock()
+    post.comments = 2
+    post.get_comments.return_value = ["c1", "c2"]
+
+    assert list(iter_comment_pages(post)) == [(["c1", "c2"], None)]
+
+
+def test_large_post_pages_lazily_from_page_id():
+    """Pages are requested one at a time starting at the given page."""
+    pages = {
+        None: {"comments": [_iphone_comment(1)], "next_min_id": "p2"},
+        "p2": {"comments": [_iphone_comment(2)], "next_min_id": "p3"},
+        "p3": {"comments": [_iphone_comment(3)]},
+    }
+    post = _large_post(pages)
+
+    reader = iter_comment_pages(post, "p2")
+    comments, next_page = next(reader)
+    assert [c.text for c in comments] == ["comment 2"]
+    assert next_page == "p3"
+    assert post._context.get_iphone_json.call_count == 1
+
+    comments, next_page = next(reader)
+    assert next_page is None
+
+
+def test_large_post_requires_login():
+    """Reading beyond the embedded comments needs a session."""
+    post = _large_post({})
+    post._context.is_logged_in = False
+    with pytest.raises(LoginRequiredException):
+        next(iter_comment_pages(post))
+
+
+def test_comment_to_dict():
+    """iPhone comments are converted with author and reply count."""
+    pages = {None: {"comments": [_iphone_comment(7)]}}
+    comment = next(iter_comment_pages(_large_post(pages)))[0][0]
+
+    data = comment_to_dict(comment)
+    assert data == {
+        "id": "7",
+        "text": "comment 7",
+        "author": "commenter",
+        "created_at": "2025-01-01T00:00:00",
+        "likes": 2,
+        "replies": 1,
+    }
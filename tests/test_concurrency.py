@@ -0,0 +1,105 @@
+"""Tests for per-key coordination of async calls."""
+
+import asyncio
+
+import pytest
+
+from src.concurrency import KeyedLock, SingleFlight
+
+
+class TestKeyedLock:
+    """Tests for KeyedLock."""
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_serialized(self):
+        """Holders of one key run one at a time."""
+        locks = KeyedLock()
+        events = []
+
+        async def hold(name):
+            async with locks.hold("tag"):
+                events.append(f"{name} in")
+                await asyncio.sleep(0.01)
+                events.append(f"{name} out")
+
+        await asyncio.gather(hold("a"), hold("b"))
+        assert events == ["a in", "a out", "b in", "b out"]
+
+    @pytest.mark.asyncio
+    async def test_other_keys_run_concurrently(self):
+        """A held key doesn't block other keys."""
+        locks = KeyedLock()
+        async with locks.hold("one"):
+            async with locks.hold("two"):
+                assert len(locks) == 2
+
+    @pytest.mark.asyncio
+    async def test_unused_locks_are_dropped(self):
+        """A key's lock is forgotten once nobody holds or waits for it."""
+        locks = KeyedLock()
+        with pytest.raises(RuntimeError):
+            async with locks.hold("tag"):
+                raise RuntimeError("boom")
+        assert len(locks) == 0
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_task(self):
+        """Callers of one key get the result of a single call."""
+        flight = SingleFlight()
+        joined = []
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(
+            *(
+                flight.run("key", call, on_join=lambda: joined.append(1))
+                for _ in range(5)
+            )
+        )
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.coalesced == len(joined) == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Cancelling one caller leaves the shared call running for the rest."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        first = asyncio.ensure_future(flight.run("key", call))
+        second = asyncio.ensure_future(flight.run("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == "result"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_retried(self):
+        """A failed call is forgotten, so the next caller starts a new one."""
+        flight = SingleFlight()
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def succeed():
+            return "result"
+
+        with pytest.raises(RuntimeError):
+            await flight.run("key", fail)
+        assert "key" not in flight
+        assert await flight.run("key", succeed) == "result"
@@ -0,0 +1,74 @@
+"""Tests for the bounded executor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.executor import BoundedExecutor, ExecutorBusyError
+
+
+class TestBoundedExecutor:
+    """Tests for BoundedExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        """Jobs run on a worker thread and return their result."""
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        try:
+            result = await executor.run(lambda a, b: a + b, 2, 3)
+            assert result == 5
+            stats = executor.stats()
+            assert stats["completed_jobs"] == 1
+            assert stats["active_workers"] == 0
+            assert stats["queued_jobs"] == 0
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_propagates_exception(self):
+        """Exceptions raised by the job reach the caller."""
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+
+        def fail():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                await executor.run(fail)
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Submissions beyond max_queue waiting jobs are rejected."""
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        running = threading.Event()
+
+        def block():
+            running.set()
+            release.wait(5)
+
+        try:
+            first = asyncio.ensure_future(executor.run(block))
+            await asyncio.get_running_loop().run_in_executor(None, running.wait, 5)
+            second = asyncio.ensure_future(executor.run(block))
+            await asyncio.sleep(0)
+
+            stats = executor.stats()
+            assert stats["active_workers"] == 1
+            assert stats["queued_jobs"] == 1
+
+            with pytest.raises(ExecutorBusyError):
+                await executor.run(block)
+            assert executor.stats()["rejected_jobs"] == 1
+
+            release.set()
+            await asyncio.gather(first, second)
+            stats = executor.stats()
+            assert stats["completed_jobs"] == 2
+            assert stats["max_wait_seconds"] > 0
+        finally:
+            release.set()
+            executor.shutdown()
@@ -0,0 +1,149 @@
+"""Tests for the adaptive outbound request governor."""
+
+import time
+from unittest.mock import patch
+
+import instaloader
+import pytest
+
+from src.call_usage import track_usage
+from src.governor import GovernedRateController, OutboundGovernor
+
+
+class FakeClock:
+    """Controllable stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("src.governor.time.monotonic", fake):
+        yield fake
+
+
+class TestOutboundGovernor:
+    """Tests for OutboundGovernor pacing and AIMD control."""
+
+    def test_requests_are_spaced_by_rate(self, clock):
+        """Consecutive reservations are 1/rate seconds apart."""
+        governor = OutboundGovernor(max_rate=4.0)
+        assert [governor.reserve() for _ in range(3)] == [0.0, 0.25, 0.5]
+
+        clock.now += 10
+        assert governor.reserve() == 0.0
+        assert governor.stats()["requests"] == 4
+
+    def test_requests_are_billed_to_the_tool_call(self, clock):
+        """Every reserved slot counts as an upstream request of the current call."""
+        governor = OutboundGovernor(max_rate=0)
+        with track_usage() as usage:
+            governor.reserve()
+            governor.reserve()
+        assert usage.upstream_requests == 2
+
+    def test_throttle_halves_rate(self, clock):
+        """A throttle response halves the rate and delays the next request."""
+        governor = OutboundGovernor(max_rate=4.0, penalty=0)
+        governor.reserve()
+        governor.on_throttle()
+
+        assert governor.rate == 2.0
+        assert governor.reserve() == 0.5
+        assert governor.stats()["throttle_events"] == 1
+
+    def test_throttle_holds_requests_for_penalty(self, clock):
+        """After a throttle response no request goes out before the penalty ends."""
+        governor = OutboundGovernor(max_rate=4.0, penalty=30.0)
+        governor.on_throttle()
+
+        assert governor.backoff() == 30.0
+        assert governor.reserve() == 30.0
+        clock.now += 40
+        assert governor.backoff() == 0.0
+
+    def test_concurrent_throttles_count_once(self, clock):
+        """Throttles within the cooldown don't decrease the rate again."""
+        governor = OutboundGovernor(max_rate=4.0, cooldown=5.0)
+        for _ in range(5):
+            governor.on_throttle()
+        assert governor.rate == 2.0
+
+        clock.now += 6
+        governor.on_throttle()
+        stats = governor.stats()
+        assert stats["throttle_events"] == 6
+        assert stats["decreases"] == 2
+        assert governor.rate == pytest.approx((2.0 + 0.05 * 6) / 2)
+
+    def test_rate_never_drops_below_minimum(self, clock):
+        """Repeated throttling stops at min_rate."""
+        governor = OutboundGovernor(max_rate=1.0, min_rate=0.2, cooldown=0)
+        for _ in range(10):
+            governor.on_throttle()
+        assert governor.rate == 0.2
+
+    def test_rate_ramps_back_additively(self, clock):
+        """Without throttling the rate climbs linearly back to max_rate."""
+        governor = OutboundGovernor(max_rate=4.0, increase=0.1)
+        governor.on_throttle()
+
+        clock.now += 10
+        assert governor.rate == pytest.approx(3.0)
+        clock.now += 100
+        assert governor.rate == 4.0
+
+    def test_zero_rate_disables_pacing(self, clock):
+        """max_rate=0 never waits but still counts throttles."""
+        governor = OutboundGovernor(max_rate=0)
+        assert [governor.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        governor.on_throttle()
+        assert governor.stats()["throttle_events"] == 1
+        assert governor.stats()["rate"] is None
+
+
+class TestGovernedRateController:
+    """Tests for the instaloader RateController integration."""
+
+    def test_queries_are_paced_by_governor(self, clock):
+        """Every instaloader query reserves a governor slot."""
+        governor = OutboundGovernor(max_rate=100.0)
+        loader = instaloader.Instaloader(
+            rate_controller=lambda ctx: GovernedRateController(ctx, governor)
+        )
+        controller = loader.context._rate_controller
+
+        controller.wait_before_query("other")
+        controller.wait_before_query("iphone")
+
+        assert governor.stats()["requests"] == 2
+
+    def test_429_waits_out_penalty(self, clock):
+        """A 429 halves the governor rate and sleeps its penalty, not instaloader's."""
+        governor = OutboundGovernor(max_rate=4.0, penalty=30.0)
+        controller = GovernedRateController(instaloader.Instaloader().context, governor)
+        with patch.object(controller, "sleep") as sleep:
+            controller.handle_429("other")
+
+        sleep.assert_called_once_with(30.0)
+        assert governor.rate == 2.0
+
+    def test_retry_after_429_waits_for_cooldown(self):
+        """A query retried after a 429 is sent no sooner than the penalty."""
+        governor = OutboundGovernor(max_rate=100.0, penalty=0.3)
+        loader = instaloader.Instaloader(
+            rate_controller=lambda ctx: GovernedRateController(ctx, governor)
+        )
+        controller = loader.context._rate_controller
+        controller.wait_before_query("other")
+
+        start = time.monotonic()
+        controller.handle_429("other")
+        controller.wait_before_query("other")
+
+        assert time.monotonic() - start >= 0.3
@@ -1,18 +1,59 @@
 """Unit tests for InstaloaderClient with mocked instaloader."""
 
+import asyncio
+import datetime
 import os
 import tempfile
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from instaloader import Post
 from instaloader.exceptions import (
     ConnectionException,
     InstaloaderException,
     LoginRequiredException,
     ProfileNotExistsException,
+    QueryReturnedNotFoundException,
 )
 
+from src.call_usage import record_upstream_request, track_usage
 from src.instaloader_client import InstaloaderClient
+from src.post_cache import PostCache, compress_json
+from src.url_parser import PostRef
+
+
+def _node(
+    shortcode,
+    text="",
+    author="someone",
+    day=1,
+    likes=0,
+    comments=0,
+    is_video=False,
+):
+    """Build a raw post node, published on 2025-01-<day>."""
+    published = datetime.datetime(2025, 1, day, tzinfo=datetime.timezone.utc)
+    return {
+        "shortcode": shortcode,
+        "edge_media_to_caption": {"edges": [{"node": {"text": text}}] if text else []},
+        "owner": {"id": "1", "username": author},
+        "taken_at_timestamp": published.timestamp(),
+        "edge_media_preview_like": {"count": likes},
+        "edge_media_to_comment": {"count": comments},
+        "is_video": is_video,
+        "__typename": "GraphVideo" if is_video else "GraphImage",
+    }
+
+
+def _key(shortcode):
+    """Cache key of a shortcode (its media ID)."""
+    return PostRef("post", shortcode).key
+
+
+def _post(shortcode, **overrides):
+    """Build an instaloader Post over a complete node (no lookups needed)."""
+    return Post(None, _node(shortcode, **overrides))
 
 
 class TestInstaloaderClientInit:
@@ -82,6 +123,61 @@ class TestLoadSession:
             )
             assert client._session_loaded is True
 
+    @patch("instaloader.Instaloader")
+    def test_load_session_directory_with_multiple_session_files(self, mock_loader_cls):
+        """Every session file in a directory is added to the session pool."""
+        mock_loader_cls.side_effect = lambda **kwargs: MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("session-alice", "session-bob", "session-carol"):
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write("fake session")
+
+            client = InstaloaderClient()
+            client._load_session(tmpdir)
+
+            client.loader.load_session_from_file.assert_called_once_with(
+                "alice", os.path.join(tmpdir, "session-alice")
+            )
+            assert client._session_loaded is True
+            # Primary (anonymous at construction) plus bob and carol
+            assert set(client.session_pool.stats()) >= {"bob", "carol"}
+            assert len(client.session_pool) == 3
+
+    @patch("instaloader.Instaloader")
+    def test_load_session_directory_skips_unreadable_files(self, mock_loader_cls):
+        """A bad first session file doesn't stop the others from loading."""
+        loaders = []
+
+        def load_session_from_file(username, path):
+            if username == "aaa":
+                raise OSError("corrupt session file")
+
+        def new_loader(**kwargs):
+            loader = MagicMock()
+            loader.load_session_from_file.side_effect = load_session_from_file
+            loaders.append(loader)
+            return loader
+
+        mock_loader_cls.side_effect = new_loader
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("session-aaa", "session-bob", "session-carol"):
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write("fake session")
+
+            client = InstaloaderClient()
+            client._load_session(tmpdir)
+
+            attempts = [
+                call.args
+                for loader in loaders
+                for call in loader.load_session_from_file.call_args_list
+            ]
+            assert [username for username, _ in attempts] == ["aaa", "bob", "carol"]
+            assert client._session_loaded is True
+            assert client.loader.load_session_from_file.call_args.args[0] == "bob"
+            assert "carol" in client.session_pool.stats()
+            assert "aaa" not in client.session_pool.stats()
+
     @patch("instaloader.Instaloader")
     def test_load_session_directory_without_session_files(self, mock_loader_cls):
         """Empty directory sets _session_loaded to False."""
@@ -119,6 +215,54 @@ class TestLoadSession:
                 os.unlink(session_path)
 
 
+class TestLoaderPoolIntegration:
+    """Test that the client checks out pooled Instaloader instances."""
+
+    def test_pooled_loader_clones_loaded_session(self):
+        """Pooled loaders receive the primary loader's session cookies."""
+        client = InstaloaderClient()
+        client.loader = MagicMock()
+        client.loader.context.username = "testuser"
+        client.loader.context.save_session.return_value = {"csrftoken": "tok"}
+        client._session_loaded = True
+
+        with client.loader_pool.checkout() as loader:
+            assert loader is not client.loader
+            assert loader.context.username == "testuser"
+            assert loader.context.save_session()["csrftoken"] == "tok"
+
+    def test_loaders_share_outbound_governor(self):
+        """Every loader paces its queries through the client's governor."""
+        from src.governor import GovernedRateController
+
+        client = InstaloaderClient()
+        for loader in (client.loader, client._new_loader()):
+            controller = loader.context._rate_controller
+            assert isinstance(controller, GovernedRateController)
+            assert controller.governor is client.governor
+        assert client.stats()["outbound"]["max_rate"] == client.governor.max_rate
+
+    def test_pooled_loaders_have_separate_sessions(self):
+        """Each pooled loader has its own requests session."""
+        client = InstaloaderClient()
+        with client.loader_pool.checkout() as a, client.loader_pool.checkout() as b:
+            assert a.context._session is not b.context._session
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_fetch_uses_pooled_loader(self, mock_post_cls):
+        """fetch_post passes a pooled loader's context to instaloader."""
+        mock_post_cls.from_shortcode.side_effect = ConnectionException("Timeout")
+
+        client = InstaloaderClient()
+        with pytest.raises(ConnectionException):
+            await client.fetch_post("POOL1")
+
+        context = mock_post_cls.from_shortcode.call_args[0][0]
+        assert context is not client.loader.context
+        assert client.loader_pool.stats()["checkouts"] == 1
+
+
 class TestFetchPost:
     """Test fetch_post with mocked instaloader Post."""
 
@@ -126,15 +270,9 @@ class TestFetchPost:
     @patch("src.instaloader_client.Post")
     async def test_fetch_post_success(self, mock_post_cls):
         """Successful fetch returns expected dict structure."""
-        mock_post = MagicMock()
-        mock_post.shortcode = "ABC123"
-        mock_post.caption = "Test caption"
-        mock_post.owner_username = "testuser"
-        mock_post.date_utc.isoformat.return_value = "2025-01-01T00:00:00"
-        mock_post.likes = 42
-        mock_post.comments = 5
-        mock_post.is_video = False
-        mock_post.typename = "GraphImage"
+        mock_post = _post(
+            "ABC123", text="Test caption", author="testuser", likes=42, comments=5
+        )
         mock_post_cls.from_shortcode.return_value = mock_post
 
         client = InstaloaderClient()
@@ -150,15 +288,7 @@ class TestFetchPost:
     @patch("src.instaloader_client.Post")
     async def test_fetch_post_empty_caption(self, mock_post_cls):
         """Post with no caption returns empty string for text."""
-        mock_post = MagicMock()
-        mock_post.shortcode = "NOCAP1"
-        mock_post.caption = None
-        mock_post.owner_username = "someone"
-        mock_post.date_utc.isoformat.return_value = "2025-01-01T00:00:00"
-        mock_post.likes = 0
-        mock_post.comments = 0
-        mock_post.is_video = False
-        mock_post.typename = "GraphImage"
+        mock_post = _post("NOCAP1")
         mock_post_cls.from_shortcode.return_value = mock_post
 
         client = InstaloaderClient()
@@ -218,6 +348,71 @@ class TestFetchPost:
             await client.fetch_post("https://www.instagram.com/p/ABC123/")
 
 
+class TestFieldProjection:
+    """Test fetching a subset of post fields."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_only_requested_fields_are_read(self, mock_post_cls):
+        """A caption-only fetch doesn't touch other post properties."""
+        node = _node("ABC123", text="Only the caption")
+        # Reading the author would now fail instead of looking it up
+        del node["owner"]
+        mock_post_cls.from_shortcode.return_value = Post(None, node)
+
+        client = InstaloaderClient()
+        result = await client.fetch_post("ABC123", fields=["text"])
+
+        assert result["text"] == "Only the caption"
+        assert result["resolved_fields"] == ["shortcode", "text"]
+        assert "likes" not in result
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_projections_are_served_from_cached_node(self, mock_post_cls):
+        """Once a post is cached, any field projection is a cache hit."""
+        mock_post_cls.from_shortcode.return_value = _post("ABC123", text="cap", likes=7)
+        client = InstaloaderClient()
+
+        await client.fetch_post("ABC123", fields=["text"])
+        likes = await client.fetch_post("ABC123", fields=["likes"])
+        full = await client.fetch_post("ABC123")
+
+        assert likes["cache_hit"] is True
+        assert likes["likes"] == 7
+        assert full["cache_hit"] is True
+        assert full["text"] == "cap"
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_incomplete_cached_node_is_refetched(self, mock_post_cls):
+        """Fields a cached node can't provide are fetched from upstream."""
+        cache = PostCache()
+        node = _node("ABC123", text="cap")
+        del node["owner"]
+        cache.set(_key("ABC123"), node)
+        mock_post_cls.from_shortcode.return_value = _post("ABC123", author="owner")
+        client = InstaloaderClient(cache=cache)
+
+        assert (await client.fetch_post("ABC123", fields=["text"]))["cache_hit"]
+        result = await client.fetch_post("ABC123", fields=["author"])
+
+        assert result["cache_hit"] is False
+        assert result["author"] == "owner"
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_field_rejected(self):
+        """Unknown fields raise before anything is fetched."""
+        from src.post_fields import InvalidFieldsError
+
+        client = InstaloaderClient()
+        with pytest.raises(InvalidFieldsError):
+            await client.fetch_post("ABC123", fields=["nope"])
+
+
 class TestFetchReel:
     """Test fetch_reel delegates to fetch_post."""
 
@@ -225,15 +420,14 @@ class TestFetchReel:
     @patch("src.instaloader_client.Post")
     async def test_fetch_reel_delegates_to_fetch_post(self, mock_post_cls):
         """fetch_reel uses the same logic as fetch_post."""
-        mock_post = MagicMock()
-        mock_post.shortcode = "REEL1"
-        mock_post.caption = "Reel caption"
-        mock_post.owner_username = "reeler"
-        mock_post.date_utc.isoformat.return_value = "2025-06-01T00:00:00"
-        mock_post.likes = 100
-        mock_post.comments = 10
-        mock_post.is_video = True
-        mock_post.typename = "GraphVideo"
+        mock_post = _post(
+            "REEL1",
+            text="Reel caption",
+            author="reeler",
+            likes=100,
+            comments=10,
+            is_video=True,
+        )
         mock_post_cls.from_shortcode.return_value = mock_post
 
         client = InstaloaderClient()
@@ -248,3 +442,770 @@ class TestFetchReel:
         client = InstaloaderClient()
         with pytest.raises(ValueError):
             await client.fetch_reel("https://example.com/not-instagram")
+
+
+class TestFetchPostCache:
+    """Test that fetch_post serves repeated lookups from the cache."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_second_fetch_is_cache_hit(self, mock_post_cls):
+        """Repeated fetches of a shortcode hit Instagram only once."""
+        mock_post = _post("CACHE1", text="Cached", likes=1)
+        mock_post_cls.from_shortcode.return_value = mock_post
+
+        client = InstaloaderClient()
+        first = await client.fetch_post("https://www.instagram.com/p/CACHE1/")
+        second = await client.fetch_reel("CACHE1")
+
+        assert first["cache_hit"] is False
+        assert first["cache_age_seconds"] == 0.0
+        assert second["cache_hit"] is True
+        assert second["text"] == "Cached"
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_media_id_input_shares_cache_entry(self, mock_post_cls):
+        """A media ID hits the entry cached for the post's URL."""
+        mock_post_cls.from_shortcode.return_value = _post("DRr-n4XER3x", text="Same")
+
+        client = InstaloaderClient()
+        await client.fetch_reel("https://www.instagram.com/reel/DRr-n4XER3x/")
+        by_id = await client.fetch_post("3777388131940113905")
+
+        assert by_id["cache_hit"] is True
+        assert by_id["text"] == "Same"
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_errors_are_not_cached(self, mock_post_cls):
+        """Failed fetches are retried upstream on the next call."""
+        mock_post_cls.from_shortcode.side_effect = ConnectionException("Timeout")
+
+        client = InstaloaderClient()
+        for _ in range(2):
+            with pytest.raises(ConnectionException):
+                await client.fetch_post("ERR1")
+
+        assert mock_post_cls.from_shortcode.call_count == 2
+
+
+class TestFetchPostCoalescing:
+    """Test that concurrent fetches of one shortcode share an upstream call."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_concurrent_fetches_are_coalesced(self, mock_post_cls):
+        """Only one upstream fetch runs for concurrent identical requests."""
+        mock_post = _post("SAME1", text="Shared", likes=1, is_video=True)
+
+        def slow_fetch(context, shortcode):
+            time.sleep(0.1)
+            return mock_post
+
+        mock_post_cls.from_shortcode.side_effect = slow_fetch
+
+        client = InstaloaderClient()
+        results = await asyncio.gather(
+            client.fetch_post("https://www.instagram.com/p/SAME1/"),
+            client.fetch_reel("https://www.instagram.com/reel/SAME1/"),
+            *(client.fetch_post("SAME1") for _ in range(3)),
+        )
+
+        assert mock_post_cls.from_shortcode.call_count == 1
+        assert all(r["text"] == "Shared" for r in results)
+        assert client.stats()["coalesced_requests"] == 4
+        assert client.stats()["inflight_fetches"] == 0
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_coalesced_waiters_receive_exception(self, mock_post_cls):
+        """Every waiter gets the exception raised by the shared fetch."""
+
+        def failing_fetch(context, shortcode):
+            time.sleep(0.1)
+            raise ProfileNotExistsException("Not found")
+
+        mock_post_cls.from_shortcode.side_effect = failing_fetch
+
+        client = InstaloaderClient()
+        results = await asyncio.gather(
+            *(client.fetch_post("GONE2") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert mock_post_cls.from_shortcode.call_count == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale cache entries while refreshing in the background."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_stale_entry_returned_and_refreshed(self, mock_post_cls):
+        """A stale entry is served immediately and refreshed in the background."""
+        mock_post = _post("HOT1", text="Hot", likes=500, comments=20)
+        mock_post_cls.from_shortcode.return_value = mock_post
+
+        cache = PostCache(ttl=60, stale_ttl=3600)
+        cache.memory.set(
+            _key("HOT1"),
+            compress_json(_node("HOT1", likes=10)),
+            stored_at=time.time() - 120,
+        )
+        client = InstaloaderClient(cache=cache)
+
+        result = await client.fetch_post("HOT1")
+        assert result["stale"] is True
+        assert result["likes"] == 10
+        assert result["cache_age_seconds"] >= 120
+
+        # Let the background refresh finish
+        await asyncio.gather(*client._inflight.tasks())
+
+        refreshed = await client.fetch_post("HOT1")
+        assert refreshed["stale"] is False
+        assert refreshed["likes"] == 500
+        assert mock_post_cls.from_shortcode.call_count == 1
+        assert client.stats()["background_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_failed_refresh_keeps_serving_stale(self, mock_post_cls):
+        """A failing background refresh doesn't surface to the caller."""
+        mock_post_cls.from_shortcode.side_effect = ConnectionException("Timeout")
+
+        cache = PostCache(ttl=60, stale_ttl=3600)
+        cache.memory.set(
+            _key("HOT2"),
+            compress_json(_node("HOT2", likes=10)),
+            stored_at=time.time() - 120,
+        )
+        client = InstaloaderClient(cache=cache)
+
+        result = await client.fetch_post("HOT2")
+        await asyncio.gather(*client._inflight.tasks(), return_exceptions=True)
+
+        assert result["stale"] is True
+        assert (await client.fetch_post("HOT2"))["likes"] == 10
+
+
+class TestCallUsage:
+    """Test the upstream requests and cache hits billed to the calling tool."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_cold_and_cached_fetches(self, mock_post_cls):
+        """A cold fetch bills its worker-thread requests; a cache hit bills a hit."""
+        mock_post = _post("USE1")
+
+        def from_shortcode(context, shortcode):
+            record_upstream_request()
+            return mock_post
+
+        mock_post_cls.from_shortcode.side_effect = from_shortcode
+        client = InstaloaderClient()
+
+        with track_usage() as cold:
+            await client.fetch_post("USE1")
+        with track_usage() as warm:
+            await client.fetch_post("USE1")
+
+        assert (cold.upstream_requests, cold.cache_hits) == (1, 0)
+        assert (warm.upstream_requests, warm.cache_hits) == (0, 1)
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_coalesced_waiters_bill_cache_hits(self, mock_post_cls):
+        """Only the caller that started a shared fetch pays for it."""
+
+        def from_shortcode(context, shortcode):
+            time.sleep(0.05)
+            record_upstream_request()
+            return _post("USE2")
+
+        mock_post_cls.from_shortcode.side_effect = from_shortcode
+        client = InstaloaderClient()
+
+        with track_usage() as usage:
+            await asyncio.gather(*(client.fetch_post("USE2") for _ in range(3)))
+
+        assert (usage.upstream_requests, usage.cache_hits) == (1, 2)
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_background_refresh_is_not_billed(self, mock_post_cls):
+        """A stale hit costs a cache hit even though it triggers a refresh."""
+
+        def from_shortcode(context, shortcode):
+            record_upstream_request()
+            return _post("USE3")
+
+        mock_post_cls.from_shortcode.side_effect = from_shortcode
+        cache = PostCache(ttl=60, stale_ttl=3600)
+        cache.memory.set(
+            _key("USE3"), compress_json(_node("USE3")), stored_at=time.time() - 120
+        )
+        client = InstaloaderClient(cache=cache)
+
+        with track_usage() as usage:
+            assert (await client.fetch_post("USE3"))["stale"] is True
+            await asyncio.gather(*client._inflight.tasks())
+
+        assert mock_post_cls.from_shortcode.call_count == 1
+        assert (usage.upstream_requests, usage.cache_hits) == (0, 1)
+
+
+class TestNegativeCaching:
+    """Test that not-found and private lookups are not retried upstream."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_not_found_is_negatively_cached(self, mock_post_cls):
+        """A second lookup of a missing post fails without an upstream call."""
+        mock_post_cls.from_shortcode.side_effect = ProfileNotExistsException(
+            "Not found"
+        )
+
+        client = InstaloaderClient()
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Post not found"):
+                await client.fetch_post("GONE3")
+
+        assert mock_post_cls.from_shortcode.call_count == 1
+        assert client.stats()["negative_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {"data": {"xdt_api__v1__media__shortcode__web_info": {"items": []}}},
+            QueryReturnedNotFoundException("404 Not Found"),
+        ],
+    )
+    async def test_missing_post_from_real_instaloader(self, response):
+        """instaloader's own not-found errors for a post are negatively cached."""
+        query = MagicMock(
+            side_effect=response if isinstance(response, Exception) else None,
+            return_value=response,
+        )
+        client = InstaloaderClient()
+        with patch("instaloader.InstaloaderContext.doc_id_graphql_query", query):
+            for _ in range(2):
+                with pytest.raises(ValueError, match="Post not found"):
+                    await client.fetch_post("GONE4")
+
+        assert query.call_count == 1
+        assert client.stats()["negative_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_login_required_is_negatively_cached(self, mock_post_cls):
+        """A private post keeps raising LoginRequiredException from the cache."""
+        mock_post_cls.from_shortcode.side_effect = LoginRequiredException("Login")
+
+        client = InstaloaderClient()
+        for _ in range(2):
+            with pytest.raises(LoginRequiredException, match="private"):
+                await client.fetch_post("PRIV2")
+
+        assert mock_post_cls.from_shortcode.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_anonymous_miss_does_not_mask_session(self, mock_post_cls):
+        """Loading a session bypasses failures cached for anonymous lookups."""
+        mock_post_cls.from_shortcode.side_effect = LoginRequiredException("Login")
+
+        client = InstaloaderClient()
+        with pytest.raises(LoginRequiredException):
+            await client.fetch_post("PRIV3")
+
+        client._session_loaded = True
+        with pytest.raises(LoginRequiredException):
+            await client.fetch_post("PRIV3")
+
+        assert mock_post_cls.from_shortcode.call_count == 2
+
+
+class TestAsyncFetchEngine:
+    """Test the optional httpx-based fetch engine."""
+
+    def test_unknown_engine_rejected(self):
+        """An unknown fetch engine raises ValueError."""
+        with pytest.raises(ValueError, match="fetch engine"):
+            InstaloaderClient(fetch_engine="carrier-pigeon")
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_async_engine_bypasses_executor(self, mock_post_cls):
+        """With the async engine, fetches don't touch instaloader or threads."""
+        client = InstaloaderClient(fetch_engine="async")
+        client.async_fetcher.fetch = AsyncMock(return_value=_node("ASYNC2", text="hi"))
+
+        result = await client.fetch_post("ASYNC2")
+
+        assert result["text"] == "hi"
+        assert result["cache_hit"] is False
+        mock_post_cls.from_shortcode.assert_not_called()
+        assert client.stats()["executor"]["completed_jobs"] == 0
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_http_clients(self):
+        """aclose() closes the async engine's and the link resolver's clients."""
+        client = InstaloaderClient(fetch_engine="async")
+        clients = [
+            client.async_fetcher._get_client(),
+            client.link_resolver._get_client(),
+        ]
+
+        await client.aclose()
+
+        assert all(http_client.is_closed for http_client in clients)
+
+
+class TestFetchProfilePosts:
+    """Test fetch_profile_posts with mocked instaloader Profile."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.read_feed_page")
+    @patch("src.instaloader_client.Profile")
+    async def test_returns_page_and_warms_cache(self, mock_profile_cls, mock_read):
+        """Posts come back with the next cursor and are added to the post cache."""
+        mock_read.return_value = ([_post("ABC123", text="hello")], "NEXT")
+
+        client = InstaloaderClient()
+        result = await client.fetch_profile_posts(
+            "https://www.instagram.com/SomeUser/", limit=5
+        )
+
+        assert result["username"] == "someuser"
+        assert result["count"] == 1
+        assert result["posts"][0]["text"] == "hello"
+        assert result["next_cursor"] == "NEXT"
+        assert result["has_more"] is True
+        assert mock_profile_cls.from_username.call_args[0][1] == "someuser"
+        assert mock_read.call_args[0][1:] == ("someuser", 5, None)
+        assert client.cache.get(_key("ABC123")).data["shortcode"] == "ABC123"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.read_feed_page")
+    @patch("src.instaloader_client.Profile")
+    async def test_feed_page_costs_no_request_per_post(
+        self, mock_profile_cls, mock_read
+    ):
+        """Posts from the iPhone API feed are projected without metadata lookups."""
+        client = InstaloaderClient()
+        context = client.loader.context
+        posts = [
+            Post.from_iphone_struct(
+                context,
+                {
+                    "code": f"FEED{i}",
+                    "pk": str(1000 + i),
+                    "media_type": 1,
+                    "taken_at": 1735689600,
+                    "caption": {"text": f"post {i}"},
+                    "has_liked": False,
+                    "like_count": i,
+                    "comment_count": 2 * i,
+                    "user": {
+                        "pk": "1",
+                        "username": "SomeUser",
+                        "is_private": False,
+                        "full_name": "Some User",
+                        "profile_pic_url": "https://example.com/pic.jpg",
+                    },
+                },
+            )
+            for i in range(5)
+        ]
+        mock_read.return_value = (posts, None)
+        upstream = MagicMock(side_effect=AssertionError("no upstream request"))
+
+        with (
+            patch.object(type(context), "doc_id_graphql_query", upstream),
+            patch.object(type(context), "graphql_query", upstream),
+            patch.object(type(context), "get_json", upstream),
+            patch.object(type(context), "get_iphone_json", upstream),
+        ):
+            result = await client.fetch_profile_posts("someuser", limit=5)
+
+        upstream.assert_not_called()
+        assert [post["comments"] for post in result["posts"]] == [0, 2, 4, 6, 8]
+        assert result["posts"][1] == {
+            "shortcode": "FEED1",
+            "text": "post 1",
+            "author": "someuser",
+            "timestamp": "2025-01-01T00:00:00",
+            "likes": 1,
+            "comments": 2,
+            "is_video": False,
+            "typename": "GraphImage",
+        }
+        cached = await client.fetch_post("FEED1")
+        assert cached["cache_hit"] is True
+        assert cached["comments"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_username(self):
+        """Invalid usernames raise ValueError."""
+        client = InstaloaderClient()
+        with pytest.raises(ValueError, match="Invalid Instagram profile"):
+            await client.fetch_profile_posts("not a user")
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    async def test_profile_not_exists(self, mock_profile_cls):
+        """Missing profiles are reported as ValueError."""
+        mock_profile_cls.from_username.side_effect = ProfileNotExistsException("gone")
+
+        client = InstaloaderClient()
+        with pytest.raises(ValueError, match="Profile not found"):
+            await client.fetch_profile_posts("someuser")
+
+
+def _feed_post(shortcode, day):
+    """Build a feed Post published on 2025-01-<day>."""
+    return _post(shortcode, text=shortcode, day=day)
+
+
+class TestSyncProfile:
+    """Test incremental profile syncs with a mocked feed."""
+
+    def _client(self, mock_reader_cls, feed, cursor="GAP"):
+        """Return a client whose profile feed yields ``feed``, counting reads."""
+        reads = []
+
+        def reader(iterator, username):
+            instance = MagicMock()
+
+            def iterate():
+                for post in feed:
+                    reads.append(post.shortcode)
+                    yield post
+
+            instance.__iter__.side_effect = iterate
+            instance.cursor.return_value = cursor
+            return instance
+
+        mock_reader_cls.side_effect = reader
+        return InstaloaderClient(), reads
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_first_sync_records_baseline(self, mock_reader_cls, _profile):
+        """The first sync returns the newest posts and stores the newest one."""
+        feed = [_feed_post("C3", 3), _feed_post("C2", 2), _feed_post("C1", 1)]
+        client, reads = self._client(mock_reader_cls, feed)
+
+        result = await client.sync_profile("someuser", limit=2)
+
+        assert result["first_sync"] is True
+        assert [p["shortcode"] for p in result["new_posts"]] == ["C3", "C2"]
+        assert result["truncated"] is False
+        assert reads == ["C3", "C2"]
+        assert client.sync_state.get("someuser").last_shortcode == "C3"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_sync_stops_at_last_seen_post(self, mock_reader_cls, _profile):
+        """Only posts newer than the last seen one are read and returned."""
+        feed = [_feed_post("C5", 5), _feed_post("C4", 4), _feed_post("C3", 3)]
+        feed += [_feed_post(f"OLD{i}", 2) for i in range(100)]
+        client, reads = self._client(mock_reader_cls, feed)
+        client.sync_state.set("someuser", "C3", "2025-01-03T00:00:00")
+
+        result = await client.sync_profile("someuser", limit=10)
+
+        assert [p["shortcode"] for p in result["new_posts"]] == ["C5", "C4"]
+        assert result["first_sync"] is False
+        assert result["last_shortcode"] == "C5"
+        assert reads == ["C5", "C4", "C3"]
+        assert client.sync_state.get("someuser").last_shortcode == "C5"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_old_pinned_posts_are_skipped(self, mock_reader_cls, _profile):
+        """Old posts pinned above new ones don't end the sync early."""
+        feed = [_feed_post("PIN1", 1), _feed_post("C5", 5), _feed_post("C4", 4)]
+        feed += [_feed_post("C2", 2)]
+        client, _ = self._client(mock_reader_cls, feed)
+        # The last seen post was deleted; its timestamp still bounds the sync
+        client.sync_state.set("someuser", "C3", "2025-01-03T00:00:00")
+
+        result = await client.sync_profile("someuser")
+
+        assert [p["shortcode"] for p in result["new_posts"]] == ["C5", "C4"]
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_truncated_sync_returns_gap_cursor(self, mock_reader_cls, _profile):
+        """Hitting the limit before the last seen post reports a gap cursor."""
+        feed = [_feed_post(f"N{i}", 20 - i) for i in range(10)]
+        client, _ = self._client(mock_reader_cls, feed)
+        client.sync_state.set("someuser", "C3", "2025-01-03T00:00:00")
+
+        result = await client.sync_profile("someuser", limit=3)
+
+        assert result["count"] == 3
+        assert result["truncated"] is True
+        assert result["gap_cursor"] == "GAP"
+        assert client.sync_state.get("someuser").last_shortcode == "N0"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_empty_delta_keeps_state(self, mock_reader_cls, _profile):
+        """A sync with no new posts keeps the previous newest post."""
+        client, _ = self._client(mock_reader_cls, [_feed_post("C3", 3)])
+        client.sync_state.set("someuser", "C3", "2025-01-03T00:00:00")
+
+        result = await client.sync_profile("someuser")
+
+        assert result["count"] == 0
+        assert result["last_shortcode"] == "C3"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_concurrent_syncs_return_each_post_once(
+        self, mock_reader_cls, _profile
+    ):
+        """Overlapping syncs of one profile don't both return the new posts."""
+        feed = [_feed_post("C5", 5), _feed_post("C4", 4), _feed_post("C3", 3)]
+        client, _ = self._client(mock_reader_cls, feed)
+        client.sync_state.set("someuser", "C3", "2025-01-03T00:00:00")
+
+        results = await asyncio.gather(
+            client.sync_profile("someuser"), client.sync_profile("someuser")
+        )
+
+        assert sorted(result["count"] for result in results) == [0, 2]
+        assert client.sync_state.get("someuser").last_shortcode == "C5"
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Profile")
+    @patch("src.instaloader_client.FeedReader")
+    async def test_posts_without_timestamp(self, mock_reader_cls, _profile):
+        """Posts whose feed page lacks some fields don't break the sync."""
+        client, _ = self._client(mock_reader_cls, [_feed_post("C4", 4)])
+        client._project_and_cache = lambda post: {"shortcode": post.shortcode}
+
+        result = await client.sync_profile("someuser")
+
+        assert result["new_posts"] == [{"shortcode": "C4"}]
+        assert result["last_shortcode"] == "C4"
+        assert result["last_timestamp"] is None
+
+
+class TestPollHashtag:
+    """Test hashtag polling with a mocked hashtag feed."""
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Hashtag")
+    async def test_second_poll_returns_only_new_posts(self, mock_hashtag_cls):
+        """Posts returned once are not returned again, and paging stops early."""
+        feed = [_feed_post(f"OLD{i}", 1) for i in range(50)]
+        scanned = []
+
+        def get_posts():
+            for post in feed:
+                scanned.append(post.shortcode)
+                yield post
+
+        mock_hashtag_cls.from_name.return_value.get_posts.side_effect = get_posts
+
+        client = InstaloaderClient()
+        first = await client.poll_hashtag("#Sunset", limit=50)
+        assert first["first_poll"] is True
+        assert first["count"] == 50
+
+        feed[:0] = [_feed_post("NEW1", 2), _feed_post("NEW2", 2)]
+        scanned.clear()
+        second = await client.poll_hashtag("sunset", limit=50, stop_after_seen=3)
+
+        assert [p["shortcode"] for p in second["new_posts"]] == ["NEW1", "NEW2"]
+        assert second["first_poll"] is False
+        assert second["stopped_on_seen"] is True
+        assert second["scanned"] == 5
+        assert len(scanned) == 5
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Hashtag")
+    async def test_concurrent_polls_return_each_post_once(self, mock_hashtag_cls):
+        """Overlapping polls of one hashtag don't both return the same posts."""
+        mock_hashtag_cls.from_name.return_value.get_posts.side_effect = lambda: iter(
+            [_feed_post(f"NEW{i}", 2) for i in range(5)]
+        )
+        client = InstaloaderClient()
+
+        results = await asyncio.gather(
+            client.poll_hashtag("sunset"), client.poll_hashtag("#Sunset")
+        )
+
+        assert sorted(result["count"] for result in results) == [0, 5]
+        assert len(client._poll_locks) == 0
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Hashtag")
+    async def test_failed_poll_does_not_mark_posts_seen(self, mock_hashtag_cls):
+        """Posts from a poll that failed midway are returned by the next poll."""
+
+        def failing_posts():
+            yield _feed_post("NEW1", 2)
+            raise ConnectionException("Timeout")
+
+        mock_hashtag_cls.from_name.return_value.get_posts.side_effect = failing_posts
+        client = InstaloaderClient()
+        with pytest.raises(ConnectionException):
+            await client.poll_hashtag("sunset")
+
+        mock_hashtag_cls.from_name.return_value.get_posts.side_effect = lambda: iter(
+            [_feed_post("NEW1", 2)]
+        )
+        result = await client.poll_hashtag("sunset")
+        assert result["count"] == 1
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Hashtag")
+    async def test_unknown_hashtag(self, mock_hashtag_cls):
+        """Missing hashtags are reported as ValueError."""
+        from instaloader.exceptions import QueryReturnedNotFoundException
+
+        mock_hashtag_cls.from_name.side_effect = QueryReturnedNotFoundException("404")
+        client = InstaloaderClient()
+        with pytest.raises(ValueError, match="Hashtag not found"):
+            await client.poll_hashtag("nosuchtag")
+
+
+def _comment_page(start, count, day=1):
+    """Build a page of comment dicts with ids start..start+count-1."""
+    return [
+        {"id": str(i), "text": f"c{i}", "created_at": f"2025-01-{day:02d}T00:00:00"}
+        for i in range(start, start + count)
+    ]
+
+
+class TestFetchComments:
+    """Test comment paging with mocked comment pages."""
+
+    PAGES = {
+        None: (_comment_page(0, 5, day=3), "p2"),
+        "p2": (_comment_page(5, 5, day=2), "p3"),
+        "p3": (_comment_page(10, 5, day=1), None),
+    }
+
+    def _mock_pages(self, mock_iter_pages):
+        requested = []
+
+        def iter_pages(post, page_id=None):
+            while True:
+                requested.append(page_id)
+                page, page_id = self.PAGES[page_id]
+                yield page, page_id
+                if page_id is None:
+                    return
+
+        mock_iter_pages.side_effect = iter_pages
+        return requested
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.comment_to_dict", side_effect=lambda c: c)
+    @patch("src.instaloader_client.iter_comment_pages")
+    @patch("src.instaloader_client.Post")
+    async def test_stops_at_limit_and_resumes_from_cache(
+        self, mock_post_cls, mock_iter_pages, _to_dict
+    ):
+        """Paging stops at the cap and the next call reuses cached pages."""
+        requested = self._mock_pages(mock_iter_pages)
+        client = InstaloaderClient()
+
+        first = await client.fetch_comments("ABC123", limit=7)
+        assert [c["id"] for c in first["comments"]] == [str(i) for i in range(7)]
+        assert requested == [None, "p2"]
+        assert first["pages_fetched"] == 2
+
+        second = await client.fetch_comments(
+            "ABC123", limit=7, cursor=first["next_cursor"]
+        )
+        assert [c["id"] for c in second["comments"]] == [str(i) for i in range(7, 14)]
+        assert requested == [None, "p2", "p3"]
+        assert second["pages_cached"] == 1
+        assert second["pages_fetched"] == 1
+
+        last = await client.fetch_comments(
+            "ABC123", limit=7, cursor=second["next_cursor"]
+        )
+        assert [c["id"] for c in last["comments"]] == ["14"]
+        assert last["has_more"] is False
+        assert last["pages_fetched"] == 0
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.comment_to_dict", side_effect=lambda c: c)
+    @patch("src.instaloader_client.iter_comment_pages")
+    @patch("src.instaloader_client.Post")
+    async def test_since_stops_at_older_page(
+        self, mock_post_cls, mock_iter_pages, _to_dict
+    ):
+        """A page entirely older than since ends the scan."""
+        import datetime
+
+        requested = self._mock_pages(mock_iter_pages)
+        client = InstaloaderClient()
+
+        result = await client.fetch_comments(
+            "ABC123", limit=50, since=datetime.datetime(2025, 1, 3)
+        )
+
+        assert result["count"] == 5
+        assert result["next_cursor"] is None
+        assert requested == [None, "p2"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self):
+        """Cursors for another post are rejected."""
+        from src.profile_feed import InvalidCursorError, encode_cursor
+
+        client = InstaloaderClient()
+        with pytest.raises(InvalidCursorError):
+            await client.fetch_comments(
+                "ABC123", cursor=encode_cursor("OTHER1", None, 3)
+            )
+
+    @pytest.mark.asyncio
+    @patch("src.instaloader_client.Post")
+    async def test_login_required(self, mock_post_cls):
+        """Login errors while reading comments are reported clearly."""
+        mock_post_cls.from_shortcode.return_value.comments = 100
+        mock_post_cls.from_shortcode.return_value._context.is_logged_in = False
+
+        client = InstaloaderClient()
+        with pytest.raises(LoginRequiredException, match="read comments"):
+            await client.fetch_comments("ABC123")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {"data": {"xdt_api__v1__media__shortcode__web_info": {"items": []}}},
+            QueryReturnedNotFoundException("404 Not Found"),
+        ],
+    )
+    async def test_missing_post_from_real_instaloader(self, response):
+        """instaloader's own not-found errors for the post map to Post not found."""
+        query = MagicMock(
+            side_effect=response if isinstance(response, Exception) else None,
+            return_value=response,
+        )
+        client = InstaloaderClient()
+        with patch("instaloader.InstaloaderContext.doc_id_graphql_query", query):
+            with pytest.raises(ValueError, match="Post not found"):
+                await client.fetch_comments("GONE5")
@@ -0,0 +1,170 @@
+"""Tests for share link resolution."""
+
+import asyncio
+import os
+import tempfile
+from urllib.parse import quote
+
+import pytest
+import pytest_asyncio
+from instaloader.exceptions import ConnectionException
+
+from src.call_usage import track_usage
+from src.governor import OutboundGovernor
+from src.instaloader_client import InstaloaderClient
+from src.link_resolver import ShareLinkResolver
+from src.url_parser import PostRef
+
+SHARE_LINK = "https://www.instagram.com/share/reel/BAtoken1/?igsh=abc"
+
+
+class RedirectStandIn:
+    """
+    Minimal local HTTP server answering like Instagram's share links.
+
+    ``routes`` maps a request path to the (status, Location) response;
+    unknown paths get a 200 without a Location.
+    """
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        while request_line := await reader.readline():
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            method, path, _ = request_line.decode().split(" ", 2)
+            self.requests.append((method, path))
+            await asyncio.sleep(self.delay)
+            status, location = self.routes.get(path, (200, None))
+            headers = f"HTTP/1.1 {status} X\r\nContent-Length: 0\r\n"
+            if location:
+                headers += f"Location: {location}\r\n"
+            writer.write((headers + "\r\n").encode())
+            await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def stand_in():
+    """Run a redirect stand-in server on a free local port."""
+    server = RedirectStandIn(
+        {
+            "/share/reel/BAtoken1/": (
+                301,
+                "https://www.instagram.com/reel/DRr-n4XER3x/?igsh=abc",
+            ),
+            "/share/Xy12/": (
+                302,
+                "/accounts/login/?next=" + quote("/p/DRr-n4XER3x/", safe=""),
+            ),
+            "/share/limited/": (429, None),
+        }
+    )
+    port = await server.start()
+    server.base_url = f"http://127.0.0.1:{port}"
+    yield server
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_resolves_with_one_head_request(stand_in):
+    """The first resolution sends one HEAD; later ones are cache hits."""
+    resolver = ShareLinkResolver(base_url=stand_in.base_url)
+
+    with track_usage() as usage:
+        assert await resolver.resolve(SHARE_LINK) == PostRef("reel", "DRr-n4XER3x")
+    assert usage.upstream_requests == 1
+    with track_usage() as usage:
+        assert await resolver.resolve("instagram.com/share/reel/BAtoken1") == PostRef(
+            "reel", "DRr-n4XER3x"
+        )
+    assert (usage.upstream_requests, usage.cache_hits) == (0, 1)
+
+    assert stand_in.requests == [("HEAD", "/share/reel/BAtoken1/")]
+    assert resolver.stats()["cached_links"] == 1
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_login_redirect_names_the_post(stand_in):
+    """A redirect to the login page is resolved from its ``next`` page."""
+    resolver = ShareLinkResolver(base_url=stand_in.base_url)
+    ref = await resolver.resolve("https://www.instagram.com/share/Xy12/")
+    assert ref == PostRef("post", "DRr-n4XER3x")
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_mapping_survives_restarts(stand_in):
+    """With a path, a new resolver serves known links without a request."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "share_links.sqlite3")
+        first = ShareLinkResolver(path, base_url=stand_in.base_url)
+        await first.resolve(SHARE_LINK)
+        await first.aclose()
+        first.close()
+
+        second = ShareLinkResolver(path, base_url=stand_in.base_url)
+        assert await second.resolve(SHARE_LINK) == PostRef("reel", "DRr-n4XER3x")
+        assert len(stand_in.requests) == 1
+        second.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_resolutions_are_coalesced(stand_in):
+    """Concurrent resolutions of one link share a single request."""
+    stand_in.delay = 0.05
+    resolver = ShareLinkResolver(base_url=stand_in.base_url)
+
+    refs = await asyncio.gather(*(resolver.resolve(SHARE_LINK) for _ in range(5)))
+
+    assert set(refs) == {PostRef("reel", "DRr-n4XER3x")}
+    assert len(stand_in.requests) == 1
+    assert resolver.stats()["coalesced_requests"] == 4
+    assert resolver.stats()["inflight"] == 0
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unresolvable_links(stand_in):
+    """Links that don't redirect to a post fail and aren't cached."""
+    governor = OutboundGovernor(max_rate=0)
+    resolver = ShareLinkResolver(base_url=stand_in.base_url, governor=governor)
+
+    with pytest.raises(ValueError, match="does not point to a post"):
+        await resolver.resolve("https://www.instagram.com/share/gone/")
+    with pytest.raises(ConnectionException, match="429"):
+        await resolver.resolve("https://www.instagram.com/share/limited/")
+    with pytest.raises(ValueError, match="Not an Instagram share link"):
+        await resolver.resolve("https://www.instagram.com/p/ABC123/")
+
+    assert governor.throttle_events == 1
+    assert resolver.stats()["cached_links"] == 0
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_resolves_share_links(stand_in):
+    """The client parses other inputs locally and resolves share links."""
+    client = InstaloaderClient(
+        link_resolver=ShareLinkResolver(base_url=stand_in.base_url)
+    )
+
+    assert await client.resolve_post_ref("ABC123") == PostRef("post", "ABC123")
+    assert await client.resolve_post_ref(SHARE_LINK) == PostRef("reel", "DRr-n4XER3x")
+    with pytest.raises(ValueError):
+        await client.resolve_post_ref("https://example.com/share/x/")
+    assert client.stats()["share_links"]["resolutions"] == 1
+    await client.link_resolver.aclose()
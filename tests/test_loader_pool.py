@@ -0,0 +1,205 @@
+"""Tests for the Instaloader instance pool."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from instaloader.exceptions import (
+    AbortDownloadException,
+    ConnectionException,
+    LoginRequiredException,
+    TooManyRequestsException,
+)
+
+from src.loader_pool import (
+    LoaderPool,
+    LoaderPoolTimeoutError,
+    SessionPool,
+    is_session_error,
+)
+
+
+class TestLoaderPool:
+    """Tests for LoaderPool."""
+
+    def test_instances_created_lazily(self):
+        """No instance is created until the first checkout."""
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = LoaderPool(factory, size=2)
+        assert factory.call_count == 0
+
+        with pool.checkout():
+            pass
+
+        assert factory.call_count == 1
+        assert pool.stats()["created"] == 1
+
+    def test_returned_instance_is_reused(self):
+        """Sequential checkouts reuse the same idle instance."""
+        pool = LoaderPool(lambda: MagicMock(), size=2)
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+        assert first is second
+        assert pool.stats()["checkouts"] == 2
+
+    def test_concurrent_checkouts_get_distinct_instances(self):
+        """Nested checkouts never share an instance."""
+        pool = LoaderPool(lambda: MagicMock(), size=2)
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first is not second
+            assert pool.stats()["in_use"] == 2
+        assert pool.stats()["in_use"] == 0
+
+    def test_checkout_times_out_when_exhausted(self):
+        """Checkout fails when every instance stays in use."""
+        pool = LoaderPool(lambda: MagicMock(), size=1, checkout_timeout=0.05)
+        with pool.checkout():
+            with pytest.raises(LoaderPoolTimeoutError):
+                with pool.checkout():
+                    pass
+
+    def test_waiter_receives_released_instance(self):
+        """A blocked checkout proceeds once an instance is returned."""
+        pool = LoaderPool(lambda: MagicMock(), size=1, checkout_timeout=5)
+        got = []
+
+        with pool.checkout() as held:
+            thread = threading.Thread(
+                target=lambda: got.append(pool.checkout().__enter__())
+            )
+            thread.start()
+        thread.join(5)
+
+        assert got == [held]
+
+    def test_factory_failure_frees_slot(self):
+        """A failing factory doesn't permanently consume pool capacity."""
+        factory = MagicMock(side_effect=[RuntimeError("boom"), MagicMock()])
+        pool = LoaderPool(factory, size=1)
+        with pytest.raises(RuntimeError):
+            with pool.checkout():
+                pass
+        with pool.checkout() as loader:
+            assert loader is not None
+
+
+def _loader(name: str) -> MagicMock:
+    """Build a stand-in loader, logged in unless named "anonymous"."""
+    loader = MagicMock(name=name)
+    loader.context.is_logged_in = name != "anonymous"
+    return loader
+
+
+def _session_pool(*names: str, bench_seconds: float = 60) -> SessionPool:
+    pool = SessionPool(bench_seconds=bench_seconds)
+    for name in names:
+        pool.add(name, LoaderPool(lambda name=name: _loader(name), size=2))
+    return pool
+
+
+class TestSessionPool:
+    """Tests for SessionPool."""
+
+    def test_round_robin(self):
+        """Checkouts rotate across sessions."""
+        pool = _session_pool("alice", "bob")
+        for _ in range(4):
+            with pool.checkout():
+                pass
+
+        stats = pool.stats()
+        assert stats["alice"]["requests"] == 2
+        assert stats["bob"]["requests"] == 2
+
+    def test_session_error_benches_session(self):
+        """A logged-out session is benched and skipped afterwards."""
+        pool = _session_pool("alice", "bob")
+        with pytest.raises(AbortDownloadException):
+            with pool.checkout():
+                raise AbortDownloadException("Redirected to login page")
+
+        for _ in range(3):
+            with pool.checkout():
+                pass
+
+        stats = pool.stats()
+        assert stats["alice"]["benched"] is True
+        assert stats["alice"]["requests"] == 1
+        assert stats["alice"]["error_rate"] == 1.0
+        assert stats["bob"]["requests"] == 3
+
+    def test_non_session_error_does_not_bench(self):
+        """Errors unrelated to the session leave it in rotation."""
+        pool = _session_pool("alice")
+        with pytest.raises(ValueError):
+            with pool.checkout():
+                raise ValueError("Post not found")
+
+        assert pool.stats()["alice"]["benched"] is False
+        assert pool.stats()["alice"]["errors"] == 0
+
+    def test_content_needing_login_does_not_bench(self):
+        """A private post leaves the session (even the only one) in rotation."""
+        pool = _session_pool("anonymous")
+        with pytest.raises(LoginRequiredException):
+            with pool.checkout():
+                raise LoginRequiredException("Redirected to login page")
+
+        assert pool.stats()["anonymous"]["benched"] is False
+        assert pool.stats()["anonymous"]["errors"] == 0
+
+    def test_anonymous_throttle_does_not_bench(self):
+        """A 429 on the anonymous session slows requests down but doesn't bench it."""
+        throttled = []
+        pool = _session_pool("anonymous")
+        pool.on_throttle = lambda: throttled.append(True)
+        with pytest.raises(TooManyRequestsException):
+            with pool.checkout():
+                raise TooManyRequestsException("429")
+
+        assert throttled == [True]
+        assert pool.stats()["anonymous"]["benched"] is False
+
+    def test_throttle_errors_notify_callback(self):
+        """Throttle errors (and only those) are reported to on_throttle."""
+        throttled = []
+        pool = _session_pool("alice")
+        pool.on_throttle = lambda: throttled.append(True)
+        with pytest.raises(ConnectionException):
+            with pool.checkout():
+                raise ConnectionException("Please wait a few minutes")
+        with pytest.raises(LoginRequiredException):
+            with pool.checkout():
+                raise LoginRequiredException("logged out")
+
+        assert throttled == [True]
+
+    def test_all_benched_uses_earliest_expiry(self):
+        """With every session benched, the one returning soonest is used."""
+        pool = _session_pool("alice", "bob", bench_seconds=60)
+        with pytest.raises(TooManyRequestsException):
+            with pool.checkout():
+                raise TooManyRequestsException("429")
+        pool.bench_seconds = 120
+        with pytest.raises(TooManyRequestsException):
+            with pool.checkout():
+                raise TooManyRequestsException("429")
+
+        with pool.checkout():
+            pass
+        assert pool.stats()["alice"]["requests"] == 2
+
+
+def test_is_session_error():
+    """Broken sessions and throttled logins are session errors, others are not."""
+    assert is_session_error(AbortDownloadException("checkpoint_required"))
+    assert is_session_error(AbortDownloadException("logged out"), False)
+    assert not is_session_error(LoginRequiredException("login"))
+    assert not is_session_error(TooManyRequestsException("slow down"), False)
+    assert is_session_error(TooManyRequestsException("slow down"))
+    assert is_session_error(ConnectionException("429 Too Many Requests"))
+    assert is_session_error(ConnectionException("Please wait a few minutes"))
+    assert not is_session_error(ConnectionException("Timeout"))
+    assert not is_session_error(ValueError("not found"))
@@ -1,11 +1,19 @@
 """Tests for MCP tool endpoints via FastMCP's call_tool interface."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from starlette.testclient import TestClient
 
-from src.server import app, mcp
+from src.server import app, instaloader_client, lifespan, mcp, rate_limiter
+from src.url_parser import PostRef
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Start every test with an empty rate limit budget."""
+    asyncio.run(rate_limiter.reset())
 
 
 class TestHealthCheck:
@@ -21,6 +29,34 @@ class TestHealthCheck:
         assert data["service"] == "instaloader-mcp"
 
 
+class TestStats:
+    """Test the /stats endpoint."""
+
+    def test_stats_reports_client_counters(self):
+        """Stats endpoint exposes cache and coalescing counters."""
+        client = TestClient(app)
+        response = client.get("/stats")
+        assert response.status_code == 200
+        data = response.json()
+        assert "coalesced_requests" in data
+        assert "hits" in data["cache"]
+
+
+class TestLifespan:
+    """Test the server lifespan."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.UPDATE_CHECK_INTERVAL", 0)
+    async def test_shutdown_closes_http_clients(self):
+        """Pooled HTTP clients are closed when the server stops."""
+        resolver = instaloader_client.link_resolver
+        async with lifespan(mcp):
+            http_client = resolver._get_client()
+
+        assert http_client.is_closed
+        assert resolver._client is None
+
+
 class TestMCPToolDiscovery:
     """Test that tools are properly registered and discoverable."""
 
@@ -31,18 +67,26 @@ class TestMCPToolDiscovery:
         tool_names = [t.name for t in tools]
         assert "fetch_instagram_post" in tool_names
         assert "fetch_instagram_reel" in tool_names
+        assert "fetch_instagram_posts_batch" in tool_names
+        assert "fetch_instagram_profile_posts" in tool_names
+        assert "sync_instagram_profile" in tool_names
+        assert "poll_instagram_hashtag" in tool_names
+        assert "fetch_instagram_comments" in tool_names
+        assert "extract_instagram_links" in tool_names
 
     @pytest.mark.asyncio
     async def test_tool_count(self):
-        """Should have exactly 2 tools registered."""
+        """Should have exactly 8 tools registered."""
         tools = await mcp.list_tools()
-        assert len(tools) == 2
+        assert len(tools) == 8
 
     @pytest.mark.asyncio
     async def test_tool_has_url_parameter(self):
-        """Both tools should require a 'url' parameter."""
+        """Single-item tools should require a 'url' parameter."""
         tools = await mcp.list_tools()
         for tool in tools:
+            if tool.name not in ("fetch_instagram_post", "fetch_instagram_reel"):
+                continue
             schema = tool.parameters
             assert "url" in schema.get("properties", {}), (
                 f"{tool.name} missing 'url' parameter"
@@ -57,7 +101,7 @@ class TestFetchInstagramPostTool:
 
     @pytest.mark.asyncio
     @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
-    @patch("src.server.check_for_updates", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
     async def test_successful_post_fetch(self, mock_updates, mock_fetch):
         """Successful post fetch returns combined post data + update info."""
         mock_fetch.return_value = {
@@ -87,6 +131,8 @@ class TestFetchInstagramPostTool:
         assert data["text"] == "Hello world"
         assert data["author"] == "testuser"
         assert data["update_info"]["installed_version"] == "4.15"
+        assert data["rate_limit"]["retry_after"] == 0
+        assert "remaining" in data["rate_limit"]
 
     @pytest.mark.asyncio
     async def test_invalid_url_returns_error(self):
@@ -147,6 +193,23 @@ class TestFetchInstagramPostTool:
         data = result.structured_content
         assert data["error_code"] == "POST_NOT_FOUND"
 
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    async def test_executor_busy_returns_server_busy(self, mock_fetch):
+        """ExecutorBusyError should return a retryable server-busy error dict."""
+        from src.executor import ExecutorBusyError
+
+        mock_fetch.side_effect = ExecutorBusyError("queue full")
+
+        result = await mcp.call_tool(
+            "fetch_instagram_post",
+            {"url": "https://www.instagram.com/p/ABC123/"},
+        )
+
+        data = result.structured_content
+        assert data["error_code"] == "SERVER_BUSY"
+        assert "retry" in data["retry_hint"].lower()
+
     @pytest.mark.asyncio
     @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
     async def test_unexpected_error_returns_error(self, mock_fetch):
@@ -163,12 +226,57 @@ class TestFetchInstagramPostTool:
         assert "Something broke" in data["message"]
 
 
+class TestFieldsParameter:
+    """Test the fields projection on the post and reel tools."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_fields_are_passed_to_client(self, mock_updates, mock_fetch):
+        """The requested fields are forwarded to the client."""
+        mock_fetch.return_value = {
+            "shortcode": "ABC123",
+            "text": "cap",
+            "resolved_fields": ["shortcode", "text"],
+        }
+        mock_updates.return_value = {}
+
+        result = await mcp.call_tool(
+            "fetch_instagram_post", {"url": "ABC123", "fields": ["text"]}
+        )
+
+        assert result.structured_content["resolved_fields"] == ["shortcode", "text"]
+        mock_fetch.assert_awaited_once_with(PostRef("post", "ABC123"), ["text"])
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_share_links_are_passed_to_client(self, mock_updates, mock_fetch):
+        """Share links are accepted and left to the client to resolve."""
+        mock_fetch.return_value = {"shortcode": "ABC123"}
+        mock_updates.return_value = {}
+        url = "https://www.instagram.com/share/p/BAtoken1/"
+
+        result = await mcp.call_tool("fetch_instagram_post", {"url": url})
+
+        assert result.structured_content["shortcode"] == "ABC123"
+        mock_fetch.assert_awaited_once_with(url, None)
+
+    @pytest.mark.asyncio
+    async def test_unknown_fields(self):
+        """Unknown fields return INVALID_FIELDS."""
+        result = await mcp.call_tool(
+            "fetch_instagram_reel", {"url": "ABC123", "fields": ["bogus"]}
+        )
+        assert result.structured_content["error_code"] == "INVALID_FIELDS"
+
+
 class TestFetchInstagramReelTool:
     """Test the fetch_instagram_reel tool through the MCP interface."""
 
     @pytest.mark.asyncio
     @patch("src.server.instaloader_client.fetch_reel", new_callable=AsyncMock)
-    @patch("src.server.check_for_updates", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
     async def test_successful_reel_fetch(self, mock_updates, mock_fetch):
         """Successful reel fetch returns combined reel data + update info."""
         mock_fetch.return_value = {
@@ -224,3 +332,401 @@ class TestFetchInstagramReelTool:
 
         data = result.structured_content
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
+
+
+class TestFetchInstagramPostsBatchTool:
+    """Test the fetch_instagram_posts_batch tool through the MCP interface."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_batch_dedups_and_reports_per_item_errors(
+        self, mock_updates, mock_fetch
+    ):
+        """Duplicates are fetched once and one bad item doesn't fail the batch."""
+        from instaloader.exceptions import LoginRequiredException
+
+        async def fake_fetch(ref):
+            shortcode = ref.shortcode
+            if shortcode == "PRIV1":
+                raise LoginRequiredException("Login required")
+            if shortcode == "GONE1":
+                raise ValueError("Post not found: GONE1")
+            return {"shortcode": shortcode, "text": f"text {shortcode}"}
+
+        mock_fetch.side_effect = fake_fetch
+        mock_updates.return_value = {"update_available": False}
+
+        result = await mcp.call_tool(
+            "fetch_instagram_posts_batch",
+            {
+                "urls": [
+                    "https://www.instagram.com/p/ABC123/",
+                    "https://www.instagram.com/reel/ABC123/",
+                    "ABC123",
+                    "PRIV1",
+                    "GONE1",
+                    "https://example.com/not-instagram",
+                ]
+            },
+        )
+
+        data = result.structured_content
+        assert data["requested"] == 6
+        assert data["unique"] == 3
+        assert data["succeeded"] == 1
+        assert data["failed"] == 3
+        assert mock_fetch.await_count == 3
+
+        results = data["results"]
+        assert results[0]["text"] == "text ABC123"
+        assert results[0]["url"] == "https://www.instagram.com/p/ABC123/"
+        assert results[1]["error_code"] == "AUTHENTICATION_REQUIRED"
+        assert results[2]["error_code"] == "POST_NOT_FOUND"
+        assert results[3]["error_code"] == "INVALID_URL_FORMAT"
+
+    @pytest.mark.asyncio
+    async def test_batch_too_large(self):
+        """Batches above BATCH_MAX_ITEMS are rejected up front."""
+        from src import server
+
+        with patch.object(server, "BATCH_MAX_ITEMS", 2):
+            result = await mcp.call_tool(
+                "fetch_instagram_posts_batch", {"urls": ["A1", "B2", "C3"]}
+            )
+
+        assert result.structured_content["error_code"] == "BATCH_TOO_LARGE"
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_batch_concurrency_is_bounded(self, mock_updates, mock_fetch):
+        """No more than BATCH_CONCURRENCY fetches run at once."""
+        import asyncio
+
+        from src import server
+
+        running = 0
+        peak = 0
+
+        async def fake_fetch(ref):
+            shortcode = ref.shortcode
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"shortcode": shortcode}
+
+        mock_fetch.side_effect = fake_fetch
+        mock_updates.return_value = {}
+
+        with patch.object(server, "BATCH_CONCURRENCY", 3):
+            await mcp.call_tool(
+                "fetch_instagram_posts_batch",
+                {"urls": [f"CODE{i}" for i in range(10)]},
+            )
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_batch_streams_items_to_client(self, mock_updates, mock_fetch):
+        """Connected clients get items as notifications and a compact summary."""
+        from fastmcp import Client
+
+        async def fake_fetch(ref):
+            shortcode = ref.shortcode
+            if shortcode == "GONE1":
+                raise ValueError("Post not found: GONE1")
+            return {"shortcode": shortcode}
+
+        mock_fetch.side_effect = fake_fetch
+        mock_updates.return_value = {}
+        logs = []
+        progress = []
+
+        async def log_handler(message):
+            logs.append(message.data)
+
+        async def progress_handler(done, total, message):
+            progress.append((done, total))
+
+        async with Client(mcp, log_handler=log_handler) as client:
+            result = await client.call_tool(
+                "fetch_instagram_posts_batch",
+                {"urls": ["ABC123", "GONE1", "XYZ789"]},
+                progress_handler=progress_handler,
+            )
+
+        data = result.structured_content
+        assert "results" not in data
+        assert data["streamed"] is True
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+
+        items = {log["extra"]["index"]: log["extra"]["result"] for log in logs}
+        assert items[0]["shortcode"] == "ABC123"
+        assert items[1]["error_code"] == "POST_NOT_FOUND"
+        assert items[2]["url"] == "XYZ789"
+        assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_batch_without_streaming_returns_results(
+        self, mock_updates, mock_fetch
+    ):
+        """stream=false returns every item in the final result."""
+        from fastmcp import Client
+
+        mock_fetch.side_effect = lambda ref: {"shortcode": ref.shortcode}
+        mock_updates.return_value = {}
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "fetch_instagram_posts_batch",
+                {"urls": ["ABC123", "XYZ789"], "stream": False},
+            )
+
+        data = result.structured_content
+        assert data["streamed"] is False
+        assert [item["shortcode"] for item in data["results"]] == ["ABC123", "XYZ789"]
+
+
+class TestExtractInstagramLinksTool:
+    """Test the extract_instagram_links tool through the MCP interface."""
+
+    TEXT = (
+        "alice: look https://www.instagram.com/p/ABC123/?igsh=1\n"
+        "bob: same as instagram.com/reel/ABC123 right?\n"
+        "alice: and https://www.instagram.com/someone/tv/XYZ789/ too\n"
+        "bob: not https://example.com/p/NOPE1/\n"
+    )
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    async def test_links_are_normalized_and_deduplicated(self, mock_fetch):
+        """Every post is listed once with its canonical URL; nothing is fetched."""
+        result = await mcp.call_tool("extract_instagram_links", {"text": self.TEXT})
+
+        data = result.structured_content
+        assert data["count"] == 2
+        assert data["links"] == [
+            {
+                "kind": "post",
+                "shortcode": "ABC123",
+                "url": "https://www.instagram.com/p/ABC123/",
+            },
+            {
+                "kind": "tv",
+                "shortcode": "XYZ789",
+                "url": "https://www.instagram.com/tv/XYZ789/",
+            },
+        ]
+        mock_fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_post", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_fetch_feeds_links_into_batch(self, mock_updates, mock_fetch):
+        """fetch=true fetches the links, up to BATCH_MAX_ITEMS."""
+        from src import server
+
+        mock_fetch.side_effect = lambda ref: {"shortcode": ref.shortcode}
+        mock_updates.return_value = {}
+
+        with patch.object(server, "BATCH_MAX_ITEMS", 1):
+            result = await mcp.call_tool(
+                "extract_instagram_links", {"text": self.TEXT, "fetch": True}
+            )
+
+        data = result.structured_content
+        assert data["count"] == 2
+        assert data["results"] == [
+            {"shortcode": "ABC123", "url": "https://www.instagram.com/p/ABC123/"}
+        ]
+        assert (data["succeeded"], data["failed"], data["skipped"]) == (1, 0, 1)
+        mock_fetch.assert_awaited_once_with(PostRef("post", "ABC123"))
+
+
+class TestFetchInstagramProfilePostsTool:
+    """Test the fetch_instagram_profile_posts tool through the MCP interface."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_profile_posts", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_returns_page(self, mock_updates, mock_fetch):
+        """A page of posts is returned with its cursor."""
+        mock_fetch.return_value = {
+            "username": "someuser",
+            "posts": [{"shortcode": "ABC123"}],
+            "count": 1,
+            "next_cursor": "NEXT",
+            "has_more": True,
+        }
+        mock_updates.return_value = {}
+
+        result = await mcp.call_tool(
+            "fetch_instagram_profile_posts",
+            {"username": "someuser", "limit": 1, "cursor": "PREV"},
+        )
+
+        data = result.structured_content
+        assert data["next_cursor"] == "NEXT"
+        mock_fetch.assert_awaited_once_with("someuser", 1, "PREV")
+
+    @pytest.mark.asyncio
+    async def test_invalid_username(self):
+        """Invalid usernames are rejected without fetching."""
+        result = await mcp.call_tool(
+            "fetch_instagram_profile_posts", {"username": "not a user"}
+        )
+        assert result.structured_content["error_code"] == "INVALID_USERNAME"
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_profile_posts", new_callable=AsyncMock)
+    async def test_invalid_cursor(self, mock_fetch):
+        """Bad cursors get their own error code."""
+        from src.profile_feed import InvalidCursorError
+
+        mock_fetch.side_effect = InvalidCursorError("Invalid cursor: x")
+        result = await mcp.call_tool(
+            "fetch_instagram_profile_posts", {"username": "someuser", "cursor": "x"}
+        )
+        assert result.structured_content["error_code"] == "INVALID_CURSOR"
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_profile_posts", new_callable=AsyncMock)
+    async def test_profile_not_found(self, mock_fetch):
+        """Missing profiles map to PROFILE_NOT_FOUND."""
+        mock_fetch.side_effect = ValueError("Profile not found: someuser")
+        result = await mcp.call_tool(
+            "fetch_instagram_profile_posts", {"username": "someuser"}
+        )
+        assert result.structured_content["error_code"] == "PROFILE_NOT_FOUND"
+
+
+class TestSyncInstagramProfileTool:
+    """Test the sync_instagram_profile tool through the MCP interface."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.sync_profile", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_returns_delta(self, mock_updates, mock_sync):
+        """The delta from the client is returned with update info."""
+        mock_sync.return_value = {
+            "username": "someuser",
+            "new_posts": [{"shortcode": "ABC123"}],
+            "count": 1,
+        }
+        mock_updates.return_value = {"update_available": False}
+
+        result = await mcp.call_tool(
+            "sync_instagram_profile", {"username": "@SomeUser", "limit": 5}
+        )
+
+        data = result.structured_content
+        assert data["count"] == 1
+        assert data["update_info"] == {"update_available": False}
+        mock_sync.assert_awaited_once_with("@SomeUser", 5)
+
+    @pytest.mark.asyncio
+    async def test_invalid_username(self):
+        """Invalid usernames are rejected without fetching."""
+        result = await mcp.call_tool("sync_instagram_profile", {"username": "a b"})
+        assert result.structured_content["error_code"] == "INVALID_USERNAME"
+
+
+class TestPollInstagramHashtagTool:
+    """Test the poll_instagram_hashtag tool through the MCP interface."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.poll_hashtag", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_returns_new_posts(self, mock_updates, mock_poll):
+        """New posts from the client are returned with update info."""
+        mock_poll.return_value = {"hashtag": "sunset", "new_posts": [], "count": 0}
+        mock_updates.return_value = {}
+
+        result = await mcp.call_tool(
+            "poll_instagram_hashtag", {"hashtag": "#sunset", "limit": 10}
+        )
+
+        assert result.structured_content["hashtag"] == "sunset"
+        mock_poll.assert_awaited_once_with("#sunset", 10, 12)
+
+    @pytest.mark.asyncio
+    async def test_invalid_hashtag(self):
+        """Invalid hashtags are rejected without fetching."""
+        result = await mcp.call_tool("poll_instagram_hashtag", {"hashtag": "a b"})
+        assert result.structured_content["error_code"] == "INVALID_HASHTAG"
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.poll_hashtag", new_callable=AsyncMock)
+    async def test_hashtag_not_found(self, mock_poll):
+        """Missing hashtags map to HASHTAG_NOT_FOUND."""
+        mock_poll.side_effect = ValueError("Hashtag not found: nosuchtag")
+        result = await mcp.call_tool("poll_instagram_hashtag", {"hashtag": "nosuchtag"})
+        assert result.structured_content["error_code"] == "HASHTAG_NOT_FOUND"
+
+
+class TestFetchInstagramCommentsTool:
+    """Test the fetch_instagram_comments tool through the MCP interface."""
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_comments", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_since_is_normalized_to_utc(self, mock_updates, mock_fetch):
+        """Offsets in since are converted to naive UTC before fetching."""
+        import datetime
+
+        mock_fetch.return_value = {"shortcode": "ABC123", "comments": [], "count": 0}
+        mock_updates.return_value = {}
+
+        result = await mcp.call_tool(
+            "fetch_instagram_comments",
+            {"url": "ABC123", "limit": 5, "since": "2025-01-01T02:00:00+02:00"},
+        )
+
+        assert result.structured_content["shortcode"] == "ABC123"
+        mock_fetch.assert_awaited_once_with(
+            PostRef("post", "ABC123"), 5, datetime.datetime(2025, 1, 1), None
+        )
+
+    @pytest.mark.asyncio
+    @patch("src.server.instaloader_client.fetch_comments", new_callable=AsyncMock)
+    @patch("src.server.get_update_snapshot")
+    async def test_since_accepts_z_suffix(self, mock_updates, mock_fetch):
+        """The documented "Z" form of since is accepted on every Python version."""
+        import datetime
+
+        mock_fetch.return_value = {"shortcode": "ABC123", "comments": [], "count": 0}
+        mock_updates.return_value = {}
+
+        result = await mcp.call_tool(
+            "fetch_instagram_comments",
+            {"url": "ABC123", "limit": 5, "since": "2025-01-01T00:00:00Z"},
+        )
+
+        assert result.structured_content["shortcode"] == "ABC123"
+        mock_fetch.assert_awaited_once_with(
+            PostRef("post", "ABC123"), 5, datetime.datetime(2025, 1, 1), None
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_since(self):
+        """Unparseable since values are rejected."""
+        result = await mcp.call_tool(
+            "fetch_instagram_comments", {"url": "ABC123", "since": "yesterday"}
+        )
+        assert result.structured_content["error_code"] == "INVALID_SINCE"
+
+    @pytest.mark.asyncio
+    async def test_invalid_url(self):
+        """Invalid URLs are rejected without fetching."""
+        result = await mcp.call_tool(
+            "fetch_instagram_comments", {"url": "https://example.com/x"}
+        )
+        assert result.structured_content["error_code"] == "INVALID_URL_FORMAT"
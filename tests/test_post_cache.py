@@ -0,0 +1,200 @@
+"""Tests for the two-tier post cache."""
+
+import os
+import tempfile
+import time
+
+from src.post_cache import (
+    LRUCache,
+    NegativeCache,
+    PostCache,
+    SQLiteCache,
+    compress_json,
+)
+
+
+class TestLRUCache:
+    """Tests for the in-memory LRU tier."""
+
+    def test_set_and_get(self):
+        """Stored values are returned with their timestamp."""
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", {"x": 1})
+        entry = cache.get("a")
+        assert entry is not None
+        assert entry.data == {"x": 1}
+        assert entry.tier == "memory"
+        assert entry.age < 1
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry is evicted when full."""
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
+
+    def test_expired_entry_is_dropped(self):
+        """Entries older than the TTL are treated as missing."""
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1, stored_at=time.time() - 120)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_zero_size_disables_cache(self):
+        """A cache with max_entries=0 stores nothing."""
+        cache = LRUCache(max_entries=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+class TestSQLiteCache:
+    """Tests for the persistent SQLite tier."""
+
+    def test_persists_across_instances(self):
+        """Entries survive reopening the database file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite3")
+            cache = SQLiteCache(path, ttl=60)
+            cache.set("ABC123", {"text": "hello"})
+            cache.close()
+
+            reopened = SQLiteCache(path, ttl=60)
+            entry = reopened.get("ABC123")
+            reopened.close()
+
+        assert entry is not None
+        assert entry.data == {"text": "hello"}
+        assert entry.tier == "disk"
+
+    def test_expired_entry_is_dropped(self):
+        """Entries older than the TTL are deleted on access."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteCache(os.path.join(tmpdir, "cache.sqlite3"), ttl=60)
+            cache.set("old", {"x": 1}, stored_at=time.time() - 120)
+            assert cache.get("old") is None
+            assert len(cache) == 0
+            cache.close()
+
+    def test_evicts_oldest_beyond_max_entries(self):
+        """Eviction trims the table to max_entries, oldest first."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteCache(
+                os.path.join(tmpdir, "cache.sqlite3"), max_entries=2, ttl=60
+            )
+            now = time.time()
+            cache.set("a", 1, stored_at=now - 3)
+            cache.set("b", 2, stored_at=now - 2)
+            cache.set("c", 3, stored_at=now - 1)
+            cache._evict()
+
+            assert len(cache) == 2
+            assert cache.get("a") is None
+            assert cache.get("c") is not None
+            cache.close()
+
+
+class TestPostCache:
+    """Tests for the combined two-tier cache."""
+
+    def test_miss_then_hit(self):
+        """Hit and miss counters are tracked."""
+        cache = PostCache(max_entries=10, ttl=60)
+        assert cache.get("ABC123") is None
+        cache.set("ABC123", {"shortcode": "ABC123"})
+        assert cache.get("ABC123").data == {"shortcode": "ABC123"}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_disk_hit_is_promoted_to_memory(self):
+        """An L2 hit is copied into L1 with its original timestamp."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite3")
+            PostCache(ttl=60, db_path=path).set("ABC123", {"text": "persisted"})
+
+            cache = PostCache(ttl=60, db_path=path)
+            entry = cache.get("ABC123")
+            assert entry.tier == "disk"
+            assert cache.get("ABC123").tier == "memory"
+            assert cache.memory.get("ABC123").stored_at == entry.stored_at
+            cache.disk.close()
+
+    def test_stale_entry_served_until_hard_ttl(self):
+        """Entries past the soft TTL are returned as stale until the hard TTL."""
+        cache = PostCache(ttl=60, stale_ttl=600)
+        node = compress_json({"shortcode": "OLD1"})
+        cache.memory.set("OLD1", node, stored_at=time.time() - 120)
+        cache.memory.set("DEAD1", node, stored_at=time.time() - 1200)
+
+        entry = cache.get("OLD1")
+        assert entry is not None
+        assert cache.is_fresh(entry) is False
+        assert cache.get("DEAD1") is None
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_stale_serving_disabled_by_default(self):
+        """Without stale_ttl, entries expire at the soft TTL."""
+        cache = PostCache(ttl=60)
+        cache.memory.set(
+            "OLD1", compress_json({"shortcode": "OLD1"}), stored_at=time.time() - 120
+        )
+        assert cache.get("OLD1") is None
+
+    def test_nodes_are_stored_compressed(self):
+        """Both tiers hold the node as compressed JSON bytes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PostCache(ttl=60, db_path=os.path.join(tmpdir, "cache.sqlite3"))
+            node = {"shortcode": "ABC123", "caption": "x" * 1000}
+            cache.set("ABC123", node)
+
+            blob = cache.disk.get("ABC123").data
+            assert isinstance(blob, bytes)
+            assert len(blob) < 200
+            assert cache.memory.get("ABC123").data == blob
+            assert cache.get("ABC123").data == node
+            cache.disk.close()
+
+    def test_legacy_entries_are_dropped(self):
+        """Projected dicts cached by earlier versions count as misses."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PostCache(ttl=60, db_path=os.path.join(tmpdir, "cache.sqlite3"))
+            cache.disk.set("OLD1", {"shortcode": "OLD1", "likes": 1})
+
+            assert cache.get("OLD1") is None
+            assert cache.stats()["misses"] == 1
+            assert len(cache.disk) == 0
+            cache.disk.close()
+
+
+class TestNegativeCache:
+    """Tests for the cache of failed lookups."""
+
+    def test_rebuilds_exception(self):
+        """A hit returns a fresh exception of the original type and message."""
+        cache = NegativeCache(ttl=60)
+        cache.set("GONE1", False, ValueError("Post not found: GONE1"))
+
+        exc = cache.get("GONE1", False)
+        assert isinstance(exc, ValueError)
+        assert str(exc) == "Post not found: GONE1"
+        assert cache.stats()["hits"] == 1
+
+    def test_keyed_by_authentication(self):
+        """An anonymous failure doesn't apply to authenticated lookups."""
+        cache = NegativeCache(ttl=60)
+        cache.set("PRIV1", False, ValueError("private"))
+        assert cache.get("PRIV1", True) is None
+        assert cache.get("PRIV1", False) is not None
+
+    def test_entries_expire(self):
+        """Failures are forgotten after the TTL."""
+        cache = NegativeCache(ttl=60)
+        cache._entries.set(
+            "anon:OLD1", (ValueError, "gone"), stored_at=time.time() - 120
+        )
+        assert cache.get("OLD1", False) is None
@@ -0,0 +1,107 @@
+"""Tests for post field projection."""
+
+import pytest
+
+from src.post_fields import (
+    DEFAULT_FIELDS,
+    IncompleteNodeError,
+    InvalidFieldsError,
+    normalize_fields,
+    project_loaded,
+    project_node,
+    project_post,
+)
+
+
+class CaptionOnlyPost:
+    """Post stand-in whose other properties would need upstream lookups."""
+
+    shortcode = "ABC123"
+    caption = "Only the caption"
+
+    @property
+    def owner_username(self):
+        raise AssertionError("owner_username must not be read")
+
+    @property
+    def likes(self):
+        raise AssertionError("likes must not be read")
+
+
+def test_default_fields():
+    """No projection means every field."""
+    assert normalize_fields(None) == DEFAULT_FIELDS
+
+
+def test_fields_are_canonicalized():
+    """Fields are deduplicated, ordered and always include shortcode."""
+    assert normalize_fields(["likes", "text", "likes"]) == (
+        "shortcode",
+        "text",
+        "likes",
+    )
+
+
+def test_unknown_fields_rejected():
+    """Unknown field names raise InvalidFieldsError."""
+    with pytest.raises(InvalidFieldsError, match="location"):
+        normalize_fields(["text", "location"])
+
+
+def test_projection_reads_only_requested_properties():
+    """Unrequested properties are never evaluated."""
+    post = CaptionOnlyPost()
+    assert project_post(post, normalize_fields(["text"])) == {
+        "shortcode": "ABC123",
+        "text": "Only the caption",
+    }
+
+
+def test_project_node_without_lookups():
+    """Cached nodes are projected without any upstream request."""
+    node = {
+        "shortcode": "ABC123",
+        "edge_media_to_caption": {"edges": [{"node": {"text": "hi"}}]},
+        "owner": {"id": "1", "username": "Someone"},
+        "taken_at_timestamp": 1735689600,
+        "edge_media_preview_like": {"count": 3},
+        "edge_media_to_comment": {"count": 1},
+        "is_video": False,
+        "__typename": "GraphImage",
+    }
+    assert project_node(node) == {
+        "shortcode": "ABC123",
+        "text": "hi",
+        "author": "someone",
+        "timestamp": "2025-01-01T00:00:00",
+        "likes": 3,
+        "comments": 1,
+        "is_video": False,
+        "typename": "GraphImage",
+    }
+
+
+def test_project_node_missing_data():
+    """Fields the node can't provide raise instead of fetching."""
+    node = {"shortcode": "ABC123", "is_video": False}
+    assert project_node(node, ("shortcode", "is_video")) == {
+        "shortcode": "ABC123",
+        "is_video": False,
+    }
+    with pytest.raises(IncompleteNodeError):
+        project_node(node, ("likes",))
+    with pytest.raises(IncompleteNodeError):
+        project_node(node, ("author",))
+
+
+def test_project_loaded_leaves_out_missing_fields():
+    """Fields a feed post's node lacks are left out instead of fetched."""
+    from instaloader import Post
+
+    post = Post(None, {"shortcode": "ABC123", "is_video": True, "comments": 4})
+    assert project_loaded(post) == {
+        "shortcode": "ABC123",
+        "text": "",
+        "comments": 4,
+        "is_video": True,
+    }
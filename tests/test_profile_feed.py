@@ -0,0 +1,208 @@
+"""Tests for bounded, resumable feed paging."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from instaloader import NodeIterator
+
+from src.profile_feed import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    profile_posts,
+    read_feed_page,
+    thaw_after,
+)
+
+# Three pages of five posts each: P0..P14, linked by end cursors
+PAGES = {
+    None: ["P0", "P1", "P2", "P3", "P4"],
+    "c1": ["P5", "P6", "P7", "P8", "P9"],
+    "c2": ["P10", "P11", "P12", "P13", "P14"],
+}
+NEXT = {None: "c1", "c1": "c2", "c2": None}
+
+
+def _page(after):
+    return {
+        "edges": [{"node": {"shortcode": code}} for code in PAGES[after]],
+        "page_info": {
+            "has_next_page": NEXT[after] is not None,
+            "end_cursor": NEXT[after],
+        },
+    }
+
+
+def _context():
+    context = MagicMock()
+    context.username = None
+    context.doc_id_graphql_query.side_effect = lambda doc_id, variables, referer: _page(
+        variables["after"]
+    )
+    return context
+
+
+def _open_feed(context):
+    """Return a feed opener over PAGES that, like a profile feed, reads P0..P4 upfront."""
+
+    def open_feed(after):
+        iterator = NodeIterator(
+            context=context,
+            query_hash=None,
+            edge_extractor=lambda d: d,
+            node_wrapper=lambda node: node["shortcode"],
+            query_variables={"id": "1"},
+            first_data=_page(None),
+            doc_id="feed",
+        )
+        return iterator if after is None else thaw_after(iterator, after)
+
+    return open_feed
+
+
+def _read(limit, cursor=None):
+    context = _context()
+    items, next_cursor = read_feed_page(_open_feed(context), "someuser", limit, cursor)
+    return items, next_cursor, context.doc_id_graphql_query.call_count
+
+
+class TestCursor:
+    """Tests for the opaque cursor encoding."""
+
+    def test_round_trip(self):
+        """A cursor decodes to the position it was built from."""
+        cursor = encode_cursor("someuser", "c1", 3)
+        assert decode_cursor("someuser", cursor) == ("c1", 3)
+
+    def test_rejects_garbage(self):
+        """Malformed cursors raise InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("someuser", "not-a-cursor!")
+
+    def test_rejects_other_feed(self):
+        """A cursor can't be replayed against another profile."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("otheruser", encode_cursor("someuser", None, 0))
+
+
+class TestReadFeedPage:
+    """Tests for paging over a NodeIterator."""
+
+    def test_first_page_uses_no_extra_requests(self):
+        """Reading within the first page doesn't query the next one."""
+        items, cursor, queries = _read(3)
+        assert items == ["P0", "P1", "P2"]
+        assert cursor is not None
+        assert queries == 0
+
+    def test_resume_covers_feed_without_gaps(self):
+        """Following next_cursor yields every item exactly once."""
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            items, cursor, _ = _read(4, cursor)
+            seen.extend(items)
+            pages += 1
+            if cursor is None:
+                break
+        assert seen == [f"P{i}" for i in range(15)]
+        assert pages == 4
+
+    def test_resume_fetches_only_needed_pages(self):
+        """Resuming deep in the feed starts from its page, not from the top."""
+        _, cursor, _ = _read(12)
+        items, _, queries = _read(2, cursor)
+        assert items == ["P12", "P13"]
+        assert queries == 1
+
+    def test_page_boundary_cursor_skips_refetch(self):
+        """Stopping at the end of a page points the cursor at the next page."""
+        _, cursor, _ = _read(5)
+        assert decode_cursor("someuser", cursor) == ("c1", 0)
+
+    def test_exhausted_feed_has_no_cursor(self):
+        """Reading past the end returns no cursor."""
+        items, cursor, _ = _read(50)
+        assert len(items) == 15
+        assert cursor is None
+
+
+class TestProfilePosts:
+    """Tests for opening a profile's posts feed at a cursor."""
+
+    def _iphone_page(self, codes, end_cursor):
+        return {
+            "data": {
+                "xdt_api__v1__feed__user_timeline_graphql_connection": {
+                    "edges": [
+                        {
+                            "node": {
+                                "code": code,
+                                "pk": str(i),
+                                "taken_at": 1700000000,
+                                "media_type": 1,
+                                "has_liked": False,
+                                "like_count": 0,
+                                "user": {
+                                    "pk": "1",
+                                    "username": "someuser",
+                                    "is_private": False,
+                                    "full_name": "Some User",
+                                    "profile_pic_url": "https://example.com/pic.jpg",
+                                },
+                            }
+                        }
+                        for i, code in enumerate(codes)
+                    ],
+                    "page_info": {
+                        "has_next_page": end_cursor is not None,
+                        "end_cursor": end_cursor,
+                    },
+                }
+            }
+        }
+
+    def test_logged_in_resume_costs_one_request(self):
+        """A logged-in resume requests only the page it reads from."""
+        context = MagicMock()
+        context.username = "me"
+        context.is_logged_in = True
+        context.doc_id_graphql_query.return_value = self._iphone_page(
+            ["P5", "P6"], None
+        )
+        profile = MagicMock()
+        profile.username = "someuser"
+
+        posts, cursor = read_feed_page(
+            lambda after: profile_posts(context, profile, after),
+            "someuser",
+            5,
+            encode_cursor("someuser", "c1", 1),
+        )
+
+        assert [post.shortcode for post in posts] == ["P6"]
+        assert cursor is None
+        profile.get_posts.assert_not_called()
+        context.doc_id_graphql_query.assert_called_once()
+        doc_id, variables, _ = context.doc_id_graphql_query.call_args.args
+        assert doc_id == "28975909992013618"
+        assert variables["after"] == "c1"
+        assert variables["username"] == "someuser"
+
+    def test_anonymous_resume_thaws_profile_feed(self):
+        """Anonymous feeds are resumed from Profile.get_posts() via thaw()."""
+        context = _context()
+        context.is_logged_in = False
+        profile = MagicMock()
+        profile.get_posts.side_effect = lambda: _open_feed(context)(None)
+
+        items, _ = read_feed_page(
+            lambda after: profile_posts(context, profile, after),
+            "someuser",
+            2,
+            encode_cursor("someuser", "c2", 0),
+        )
+
+        assert items == ["P10", "P11"]
+        assert context.doc_id_graphql_query.call_count == 1
@@ -0,0 +1,386 @@
+"""Tests for the rate limit storage backends."""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+
+from src.rate_limit_backends import (
+    MemoryBackend,
+    RateLimitBackendError,
+    RedisBackend,
+    SQLiteBackend,
+    gcra,
+    gcra_charge,
+)
+from src.rate_limiter import RateLimitMiddleware
+
+
+class RespStandIn:
+    """
+    Minimal local server speaking the Redis protocol.
+
+    Understands the commands RedisBackend sends; the EVAL scripts are run as
+    their Python equivalents against an in-memory dict. It only covers the
+    protocol layer (connection, auth, replies, errors); the Lua scripts
+    themselves are run by TestRealRedis.
+    """
+
+    def __init__(self, password=None, databases=16):
+        self.password = password
+        self.databases = databases
+        self.data = {}
+        self.commands = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        return args
+
+    @staticmethod
+    def _bulk(value):
+        data = str(value).encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    async def _handle(self, reader, writer):
+        authenticated = self.password is None
+        while (args := await self._read_command(reader)) is not None:
+            self.commands.append(args[0])
+            name = args[0].upper()
+            if name == "AUTH":
+                authenticated = args[-1] == self.password
+                reply = b"+OK\r\n" if authenticated else b"-WRONGPASS invalid\r\n"
+            elif not authenticated:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            elif name == "SELECT" and int(args[1]) >= self.databases:
+                reply = b"-ERR DB index is out of range\r\n"
+            elif name in ("PING", "SELECT"):
+                reply = b"+OK\r\n"
+            elif name == "EVAL" and args[1] == RedisBackend.ACQUIRE_SCRIPT:
+                key, interval, burst = args[3], float(args[4]), int(args[5])
+                tat, wait = gcra(self.data.get(key), time.time(), interval, burst)
+                self.data[key] = tat
+                reply = self._bulk(wait)
+            elif name == "EVAL" and args[1] == RedisBackend.CHARGE_SCRIPT:
+                key, interval, cost = args[3], float(args[4]), float(args[5])
+                now = time.time()
+                tat = gcra_charge(self.data.get(key), now, interval, cost)
+                if tat > now:
+                    self.data[key] = tat
+                else:
+                    self.data.pop(key, None)
+                reply = self._bulk(tat - now)
+            elif name == "EVAL" and args[1] == RedisBackend.RESET_SCRIPT:
+                prefix = args[3].rstrip("*")
+                keys = [key for key in self.data if key.startswith(prefix)]
+                for key in keys:
+                    del self.data[key]
+                reply = b":%d\r\n" % len(keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def resp_server():
+    """Run a RESP stand-in server on a free local port."""
+    server = RespStandIn(password="s3cret")
+    port = await server.start()
+    server.url = f"redis://:s3cret@127.0.0.1:{port}/2"
+    yield server
+    await server.stop()
+
+
+def test_gcra():
+    """GCRA allows a burst, then one request per interval."""
+    tat, wait = gcra(None, 100.0, 1.0, 2)
+    assert (tat, wait) == (101.0, 0.0)
+    tat, wait = gcra(tat, 100.0, 1.0, 2)
+    assert (tat, wait) == (102.0, 0.0)
+    assert gcra(tat, 100.0, 1.0, 2) == (102.0, 1.0)
+    assert gcra(tat, 101.0, 1.0, 2) == (103.0, 0.0)
+
+
+def test_gcra_charge():
+    """Charges move the arrival time freely; refunds stop at a full budget."""
+    assert gcra_charge(None, 100.0, 1.0, 3) == 103.0
+    assert gcra_charge(103.0, 100.0, 1.0, -1) == 102.0
+    assert gcra_charge(102.0, 100.0, 1.0, -5) == 100.0
+    assert gcra_charge(90.0, 100.0, 1.0, 0.5) == 100.5
+
+
+class TestMemoryBackend:
+    """Tests for the per-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_state_is_one_timestamp_per_key(self):
+        """Memory per key doesn't grow with the number of requests."""
+        backend = MemoryBackend()
+        for _ in range(500):
+            await backend.acquire("s", 0.001, 1000)
+        assert isinstance(backend._tat["s"], float)
+        assert backend.stats()["tracked_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_charge_and_refund(self):
+        """Charged debt blocks acquires until a refund (or time) clears it."""
+        backend = MemoryBackend()
+        assert await backend.acquire("s", 60.0, 2) == 0
+        assert await backend.charge("s", 60.0, 2) == pytest.approx(180, abs=1)
+        assert await backend.acquire("s", 60.0, 2) > 0
+
+        assert await backend.charge("s", 60.0, -3) == 0
+        assert "s" not in backend._tat
+        assert await backend.acquire("s", 60.0, 2) == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_evicted(self):
+        """Keys whose budget has refilled are dropped by the periodic sweep."""
+        backend = MemoryBackend(evict_interval=0)
+        for i in range(50):
+            await backend.acquire(f"gone-{i}", 0.01, 100)
+        time.sleep(0.05)
+
+        await backend.acquire("active", 0.01, 100)
+
+        assert list(backend._tat) == ["active"]
+        assert backend.stats()["evicted_sessions"] == 50
+
+
+class TestSQLiteBackend:
+    """Tests for the SQLite backend shared by workers on one host."""
+
+    @pytest.mark.asyncio
+    async def test_budget_is_shared_between_connections(self):
+        """Two workers with their own connection draw from one budget."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "limits.sqlite3")
+            first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+            assert await first.acquire("s", 60.0, 2) == 0
+            assert await second.acquire("s", 60.0, 2) == 0
+            assert await first.acquire("s", 60.0, 2) > 0
+            assert await second.acquire("s", 60.0, 2) > 0
+            assert await second.acquire("other", 60.0, 2) == 0
+            first.close()
+            second.close()
+
+    @pytest.mark.asyncio
+    async def test_charge_is_shared_between_connections(self):
+        """A cost charged by one worker is seen by the others."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "limits.sqlite3")
+            first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+            assert await first.charge("s", 60.0, 3) == pytest.approx(180, abs=1)
+            assert await second.acquire("s", 60.0, 3) > 0
+            assert await second.charge("s", 60.0, -3) == 0
+            assert first.stats()["tracked_sessions"] == 0
+            assert await first.acquire("s", 60.0, 3) == 0
+            first.close()
+            second.close()
+
+    def test_check_and_consume_is_atomic(self):
+        """Concurrent workers never admit more than the burst."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "limits.sqlite3")
+            backends = [SQLiteBackend(path) for _ in range(4)]
+
+            def worker(backend):
+                return [asyncio.run(backend.acquire("s", 60.0, 10)) for _ in range(10)]
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = [
+                    wait for waits in pool.map(worker, backends) for wait in waits
+                ]
+            for backend in backends:
+                backend.close()
+
+        assert results.count(0.0) == 10
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_write_lock_does_not_block_loop(self):
+        """A transaction waiting on another worker's lock leaves the event loop free."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "limits.sqlite3")
+            backend = SQLiteBackend(path)
+            other = sqlite3.connect(path, isolation_level=None)
+            other.execute("BEGIN IMMEDIATE")
+
+            task = asyncio.create_task(backend.acquire("s", 60.0, 1))
+            await asyncio.sleep(0.1)
+            assert not task.done()
+            other.execute("COMMIT")
+
+            assert await task == 0
+            other.close()
+            backend.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_evicted(self):
+        """Keys whose budget has refilled are deleted by the periodic sweep."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend = SQLiteBackend(os.path.join(tmpdir, "l.sqlite3"), evict_interval=0)
+            await backend.acquire("gone", 0.01, 1)
+            time.sleep(0.05)
+            await backend.acquire("active", 60.0, 1)
+
+            assert backend.stats()["tracked_sessions"] == 1
+            assert backend.stats()["evicted_sessions"] == 1
+            backend.close()
+
+
+class TestRedisBackend:
+    """Tests for the Redis-protocol backend against a local stand-in server."""
+
+    def test_parses_url(self):
+        """Host, port, password and database come from the URL."""
+        backend = RedisBackend("redis://:pw@cache.internal:6380/3")
+        assert (backend.host, backend.port, backend.password, backend.db) == (
+            "cache.internal",
+            6380,
+            "pw",
+            3,
+        )
+        with pytest.raises(ValueError):
+            RedisBackend("http://localhost")
+
+    @pytest.mark.asyncio
+    async def test_budget_is_shared_between_nodes(self, resp_server):
+        """Separate limiters (nodes) share one budget through the server."""
+        node_a = RateLimitMiddleware(
+            requests_per_window=2, backend=RedisBackend(resp_server.url)
+        )
+        node_b = RateLimitMiddleware(
+            requests_per_window=2, backend=RedisBackend(resp_server.url)
+        )
+
+        assert await node_a._acquire("s") == 0
+        assert await node_b._acquire("s") == 0
+        assert await node_a._acquire("s") > 0
+        assert await node_b._acquire("s") > 0
+        assert list(resp_server.data) == ["ratelimit:s"]
+        assert resp_server.commands[:2] == ["AUTH", "SELECT"]
+
+        await node_a.reset()
+        assert resp_server.data == {}
+        assert await node_b._acquire("s") == 0
+        await node_a.backend.aclose()
+        await node_b.backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_charge(self, resp_server):
+        """Costs are applied on the server and refunds delete the key."""
+        backend = RedisBackend(resp_server.url)
+        assert await backend.charge("s", 60.0, 2) == pytest.approx(120, abs=1)
+        assert await backend.acquire("s", 60.0, 2) > 0
+        assert await backend.charge("s", 60.0, -2) == 0
+        assert resp_server.data == {}
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_server_restart(self, resp_server):
+        """A dropped connection is reopened on the next command."""
+        backend = RedisBackend(resp_server.url)
+        assert await backend.acquire("s", 1.0, 5) == 0
+        backend._writer.close()
+        backend._writer = None
+
+        assert await backend.acquire("s", 1.0, 5) == 0
+        assert resp_server.commands.count("AUTH") == 2
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_wrong_password(self, resp_server):
+        """Server errors surface as RateLimitBackendError."""
+        backend = RedisBackend(resp_server.url.replace("s3cret", "wrong"))
+        with pytest.raises(RateLimitBackendError, match="WRONGPASS"):
+            await backend.acquire("s", 1.0, 5)
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_select_is_not_reused(self, resp_server):
+        """A connection whose handshake failed is closed, not used on db 0."""
+        resp_server.databases = 1
+        backend = RedisBackend(resp_server.url)
+        for _ in range(2):
+            with pytest.raises(RateLimitBackendError, match="DB index"):
+                await backend.acquire("s", 1.0, 5)
+
+        assert resp_server.commands == ["AUTH", "SELECT", "AUTH", "SELECT"]
+        assert resp_server.data == {}
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server(self):
+        """Connection failures surface as RateLimitBackendError."""
+        backend = RedisBackend("redis://127.0.0.1:1/0", timeout=0.5)
+        with pytest.raises(RateLimitBackendError, match="unreachable"):
+            await backend.acquire("s", 1.0, 5)
+
+
+@pytest_asyncio.fixture
+async def redis_backend():
+    """Connect to a real Redis server (TEST_REDIS_URL), or skip without one."""
+    backend = RedisBackend(
+        os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"),
+        prefix="ratelimit-test:",
+        timeout=1.0,
+    )
+    try:
+        await backend.reset()
+    except RateLimitBackendError as e:
+        pytest.skip(f"Redis unavailable: {e}")
+    yield backend
+    await backend.reset()
+    await backend.aclose()
+
+
+class TestRealRedis:
+    """Run the shipped Lua scripts on a real Redis server."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_allows_burst_then_waits(self, redis_backend):
+        """The acquire script admits the burst and then returns the wait."""
+        assert await redis_backend.acquire("s", 10.0, 2) == 0
+        assert await redis_backend.acquire("s", 10.0, 2) == 0
+        assert await redis_backend.acquire("s", 10.0, 2) == pytest.approx(10.0, abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_keys_expire_when_budget_refills(self, redis_backend):
+        """Keys carry a TTL equal to the time until their budget is full."""
+        await redis_backend.acquire("s", 2.5, 3)
+        ttl = await redis_backend._command("PTTL", "ratelimit-test:s")
+        assert 2000 < ttl <= 2500
+
+    @pytest.mark.asyncio
+    async def test_charge_and_refund(self, redis_backend):
+        """Fractional costs go into debt and a full refund deletes the key."""
+        assert await redis_backend.charge("s", 10.0, 2.5) == pytest.approx(
+            25.0, abs=0.5
+        )
+        assert await redis_backend.acquire("s", 10.0, 2) > 0
+        assert await redis_backend.charge("s", 10.0, -3) == 0
+        assert await redis_backend._command("EXISTS", "ratelimit-test:s") == 0
+        assert await redis_backend.acquire("s", 10.0, 2) == 0
@@ -4,10 +4,35 @@ import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastmcp.tools.tool import ToolResult
 
+from src.call_usage import record_cache_hit, record_upstream_request
+from src.rate_limit_backends import RateLimitBackendError
 from src.rate_limiter import RateLimitMiddleware
 
 
+def _tool(upstream_requests=0, cache_hits=0, result=None):
+    """Build a call_next that records the given usage and returns a tool result."""
+
+    async def call_next(context):
+        for _ in range(upstream_requests):
+            record_upstream_request()
+        for _ in range(cache_hits):
+            record_cache_hit()
+        return (
+            result if result is not None else ToolResult(structured_content={"ok": 1})
+        )
+
+    return call_next
+
+
+def _tool_context(session_id="s"):
+    context = MagicMock()
+    context.method = "tools/call"
+    context.session.id = session_id
+    return context
+
+
 class TestRateLimitMiddleware:
     """Tests for RateLimitMiddleware."""
 
@@ -16,6 +41,7 @@ class TestRateLimitMiddleware:
         limiter = RateLimitMiddleware()
         assert limiter.requests_per_window == 10
         assert limiter.window_seconds == 60
+        assert limiter.burst == 10
 
     def test_init_custom_values(self):
         """Test custom initialization values."""
@@ -23,58 +49,91 @@ class TestRateLimitMiddleware:
         assert limiter.requests_per_window == 5
         assert limiter.window_seconds == 30
 
-    def test_is_rate_limited_within_limit(self):
+    @pytest.mark.asyncio
+    async def test_requests_within_limit_allowed(self):
         """Test that requests within limit are not blocked."""
         limiter = RateLimitMiddleware(requests_per_window=3, window_seconds=60)
         session_id = "test-session"
 
-        # Record 2 requests (under limit of 3)
-        limiter._record_request(session_id)
-        limiter._record_request(session_id)
+        # 3 requests (at the limit) are all allowed
+        for _ in range(3):
+            assert await limiter._acquire(session_id) == 0
 
-        assert not limiter._is_rate_limited(session_id)
-
-    def test_is_rate_limited_at_limit(self):
-        """Test that requests at limit are blocked."""
+    @pytest.mark.asyncio
+    async def test_requests_over_limit_blocked(self):
+        """Test that requests past the limit are blocked."""
         limiter = RateLimitMiddleware(requests_per_window=3, window_seconds=60)
         session_id = "test-session"
 
-        # Record 3 requests (at limit)
-        limiter._record_request(session_id)
-        limiter._record_request(session_id)
-        limiter._record_request(session_id)
+        for _ in range(3):
+            await limiter._acquire(session_id)
 
-        assert limiter._is_rate_limited(session_id)
+        assert await limiter._acquire(session_id) > 0
 
-    def test_old_requests_cleaned(self):
-        """Test that old requests are cleaned from the window."""
+    @pytest.mark.asyncio
+    async def test_budget_refills(self):
+        """Test that the budget refills after the window passes."""
         limiter = RateLimitMiddleware(requests_per_window=2, window_seconds=1)
         session_id = "test-session"
 
-        # Record requests
-        limiter._record_request(session_id)
-        limiter._record_request(session_id)
+        await limiter._acquire(session_id)
+        await limiter._acquire(session_id)
 
         # At limit now
-        assert limiter._is_rate_limited(session_id)
+        assert await limiter._acquire(session_id) > 0
 
         # Wait for window to expire
         time.sleep(1.1)
 
         # Should no longer be rate limited
-        assert not limiter._is_rate_limited(session_id)
+        assert await limiter._acquire(session_id) == 0
 
-    def test_multiple_sessions_isolated(self):
+    @pytest.mark.asyncio
+    async def test_multiple_sessions_isolated(self):
         """Test that rate limiting is per-session."""
         limiter = RateLimitMiddleware(requests_per_window=2, window_seconds=60)
 
         # Fill up session1
-        limiter._record_request("session1")
-        limiter._record_request("session1")
-        assert limiter._is_rate_limited("session1")
+        await limiter._acquire("session1")
+        await limiter._acquire("session1")
+        assert await limiter._acquire("session1") > 0
 
         # session2 should still be allowed
-        assert not limiter._is_rate_limited("session2")
+        assert await limiter._acquire("session2") == 0
+
+    @pytest.mark.asyncio
+    async def test_burst_then_steady_rate(self):
+        """A burst is allowed up front, then requests refill one interval at a time."""
+        limiter = RateLimitMiddleware(requests_per_window=10, window_seconds=1, burst=3)
+
+        assert [await limiter._acquire("s") for _ in range(3)] == [0.0, 0.0, 0.0]
+        retry_after = await limiter._acquire("s")
+        assert 0 < retry_after <= 0.1
+
+        time.sleep(retry_after + 0.01)
+        assert await limiter._acquire("s") == 0.0
+        assert await limiter._acquire("s") > 0
+
+    @pytest.mark.asyncio
+    async def test_reset_restores_budgets(self):
+        """reset() forgets every session."""
+        limiter = RateLimitMiddleware(requests_per_window=1, window_seconds=60)
+        await limiter._acquire("s")
+        assert await limiter._acquire("s") > 0
+        await limiter.reset()
+        assert await limiter._acquire("s") == 0
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_fails_open(self):
+        """An unreachable shared store lets calls through and is counted."""
+        backend = MagicMock()
+        backend.acquire = AsyncMock(side_effect=RateLimitBackendError("down"))
+        backend.stats.return_value = {"backend": "redis"}
+        limiter = RateLimitMiddleware(requests_per_window=1, backend=backend)
+
+        assert await limiter._acquire("s") == 0
+        assert limiter.stats()["backend_errors"] == 1
+        assert limiter.stats()["backend"] == "redis"
 
     def test_get_session_id_default(self):
         """Test session ID extraction with no session."""
@@ -117,7 +176,7 @@ class TestRateLimitMiddleware:
         context.method = "tools/call"
         context.session.id = "test-session"
 
-        call_next = AsyncMock(return_value="tool_result")
+        call_next = _tool(upstream_requests=1, result="tool_result")
 
         # First call should succeed
         result1 = await limiter(context, call_next)
@@ -127,6 +186,9 @@ class TestRateLimitMiddleware:
         result2 = await limiter(context, call_next)
         assert result2.isError is True
         assert "Rate limit exceeded" in result2.content[0].text
+        assert "Retry in" in result2.content[0].text
+        assert result2.structuredContent["error_code"] == "RATE_LIMITED"
+        assert result2.structuredContent["rate_limit"]["retry_after"] > 0
 
     @pytest.mark.asyncio
     async def test_non_tool_calls_pass_through(self):
@@ -144,3 +206,101 @@ class TestRateLimitMiddleware:
         result2 = await limiter(context, call_next)
         assert result1 == "resource_result"
         assert result2 == "resource_result"
+
+
+class TestCostWeightedCharging:
+    """Tests for charging tool calls by the upstream work they cause."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_can_be_free(self):
+        """With no minimum charge, calls served from the cache use no budget."""
+        limiter = RateLimitMiddleware(
+            requests_per_window=2, window_seconds=60, min_call_cost=0
+        )
+        context = _tool_context()
+
+        for _ in range(10):
+            result = await limiter(context, _tool(cache_hits=1))
+            assert result.structured_content["ok"] == 1
+
+        rate_limit = result.structured_content["rate_limit"]
+        assert rate_limit["cost"] == 0
+        assert rate_limit["remaining"] == 2
+        assert rate_limit["retry_after"] == 0
+
+    @pytest.mark.asyncio
+    async def test_calls_without_upstream_work_cost_the_minimum(self):
+        """Cheap or rejected calls are charged min_call_cost and run out eventually."""
+        limiter = RateLimitMiddleware(requests_per_window=2, window_seconds=60)
+        context = _tool_context()
+
+        result = await limiter(context, _tool(cache_hits=1))
+        rate_limit = result.structured_content["rate_limit"]
+        assert rate_limit["cost"] == 0.1
+        assert rate_limit["remaining"] == 1.9
+
+        for _ in range(30):
+            result = await limiter(context, _tool())
+        assert result.isError is True
+        assert result.structuredContent["error_code"] == "RATE_LIMITED"
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_can_cost_a_fraction(self):
+        """cache_hit_cost charges a fraction of a request per cached result."""
+        limiter = RateLimitMiddleware(
+            requests_per_window=2, window_seconds=60, cache_hit_cost=0.25
+        )
+        result = await limiter(_tool_context(), _tool(cache_hits=2))
+
+        rate_limit = result.structured_content["rate_limit"]
+        assert rate_limit["cost"] == 0.5
+        assert rate_limit["remaining"] == 1.5
+
+    @pytest.mark.asyncio
+    async def test_batch_items_are_charged_individually(self):
+        """A call sending N upstream requests is charged N and goes into debt."""
+        limiter = RateLimitMiddleware(requests_per_window=5, window_seconds=60)
+        context = _tool_context()
+
+        result = await limiter(context, _tool(upstream_requests=8, cache_hits=3))
+        rate_limit = result.structured_content["rate_limit"]
+        assert rate_limit["cost"] == 8
+        assert rate_limit["upstream_requests"] == 8
+        assert rate_limit["remaining"] == 0
+        # 3 requests over the burst, plus one to have a unit again: 4 * 12s
+        assert rate_limit["retry_after"] == pytest.approx(48, abs=0.1)
+
+        rejected = await limiter(context, _tool(cache_hits=1))
+        assert rejected.isError is True
+
+    @pytest.mark.asyncio
+    async def test_failed_calls_are_charged(self):
+        """Upstream requests are charged even when the tool raises."""
+        limiter = RateLimitMiddleware(requests_per_window=2, window_seconds=60)
+        context = _tool_context()
+
+        async def failing(context):
+            record_upstream_request()
+            record_upstream_request()
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await limiter(context, failing)
+        assert await limiter._acquire("s") > 0
+
+    @pytest.mark.asyncio
+    async def test_usage_in_worker_threads_is_counted(self):
+        """Requests made on executor threads are billed to the calling tool."""
+        from src.executor import BoundedExecutor
+
+        executor = BoundedExecutor(max_workers=2)
+        limiter = RateLimitMiddleware(requests_per_window=5, window_seconds=60)
+
+        async def call_next(context):
+            await executor.run(record_upstream_request)
+            await executor.run(record_upstream_request)
+            return ToolResult(structured_content={})
+
+        result = await limiter(_tool_context(), call_next)
+        assert result.structured_content["rate_limit"]["upstream_requests"] == 2
+        assert result.structured_content["rate_limit"]["remaining"] == 3
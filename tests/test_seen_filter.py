@@ -0,0 +1,77 @@
+"""Tests for the memory-bounded seen sets."""
+
+import os
+import tempfile
+
+from src.seen_filter import BloomFilter, SeenSet, SeenSetStore
+
+
+class TestBloomFilter:
+    """Tests for the Bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Every added key is reported as present."""
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        keys = [f"CODE{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate_near_target(self):
+        """A full filter has roughly the configured false positive rate."""
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"CODE{i}")
+        false_positives = sum(f"OTHER{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestSeenSet:
+    """Tests for the rotating seen set."""
+
+    def test_add_reports_new_keys(self):
+        """add() returns False for keys already seen."""
+        seen = SeenSet(capacity=10)
+        assert seen.add("A1") is True
+        assert seen.add("A1") is False
+        assert "A1" in seen
+
+    def test_memory_is_bounded(self):
+        """Rotation keeps at most two generations of filters."""
+        seen = SeenSet(capacity=100, error_rate=0.01)
+        for i in range(10_000):
+            seen.add(f"CODE{i}")
+        single = len(BloomFilter.for_capacity(100, 0.01).bits)
+        assert seen.memory_bytes <= 2 * single
+        assert "CODE9999" in seen
+        assert len(seen) <= 200
+
+
+class TestSeenSetStore:
+    """Tests for persisting seen sets."""
+
+    def test_unknown_name_is_empty(self):
+        """A name that was never stored gets an empty set."""
+        seen, existed = SeenSetStore().get("sunset")
+        assert existed is False
+        assert len(seen) == 0
+
+    def test_round_trip_with_rotation(self):
+        """Both generations survive reopening the database."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "hashtags.sqlite3")
+            store = SeenSetStore(path, capacity=5)
+            seen, _ = store.get("sunset")
+            for i in range(8):
+                seen.add(f"CODE{i}")
+            store.set("sunset", seen)
+            store.close()
+
+            reopened = SeenSetStore(path, capacity=5)
+            loaded, existed = reopened.get("sunset")
+            reopened.close()
+
+        assert existed is True
+        assert loaded.previous is not None
+        assert all(f"CODE{i}" in loaded for i in range(8))
+        assert len(loaded) == 8
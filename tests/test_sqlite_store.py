@@ -0,0 +1,34 @@
+"""Tests for the shared SQLite setup."""
+
+import os
+import tempfile
+
+from src.sqlite_store import SQLiteStore, open_sqlite
+
+
+class _Store(SQLiteStore):
+    def __init__(self, path=None):
+        self._open_db(path, "CREATE TABLE IF NOT EXISTS items (name TEXT)")
+
+
+def test_file_database_uses_wal_and_creates_directory():
+    """File databases get their directory created and run in WAL mode."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "nested", "db.sqlite3")
+        conn = open_sqlite(path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        assert os.path.exists(path)
+        assert mode == "wal"
+
+
+def test_store_runs_schema_and_closes():
+    """The mixin opens the database, creates the schema and closes it."""
+    store = _Store()
+    with store._lock:
+        tables = store._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+    assert tables == [("items",)]
+    store.close()
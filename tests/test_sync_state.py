@@ -0,0 +1,47 @@
+"""Tests for the persistent profile sync state store."""
+
+import os
+import tempfile
+
+from src.sync_state import SyncStateStore
+
+
+def test_get_unknown_profile():
+    """Profiles that were never synced have no state."""
+    assert SyncStateStore().get("someuser") is None
+
+
+def test_set_overwrites_state():
+    """The latest state replaces the previous one."""
+    store = SyncStateStore()
+    store.set("someuser", "ABC123", "2025-01-01T00:00:00")
+    store.set("someuser", "XYZ789", "2025-01-02T00:00:00")
+
+    state = store.get("someuser")
+    assert state.last_shortcode == "XYZ789"
+    assert state.last_timestamp == "2025-01-02T00:00:00"
+    assert len(store) == 1
+
+
+def test_persists_across_instances():
+    """State stored with a path survives reopening the database."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "state", "sync.sqlite3")
+        store = SyncStateStore(path)
+        store.set("someuser", "ABC123", "2025-01-01T00:00:00")
+        store.close()
+
+        reopened = SyncStateStore(path)
+        state = reopened.get("someuser")
+        reopened.close()
+
+    assert state.last_shortcode == "ABC123"
+    assert state.last_timestamp == "2025-01-01T00:00:00"
+
+
+def test_delete():
+    """Deleted profiles start over on the next sync."""
+    store = SyncStateStore()
+    store.set("someuser", "ABC123", None)
+    store.delete("someuser")
+    assert store.get("someuser") is None
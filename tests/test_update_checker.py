@@ -1,5 +1,6 @@
 """Tests for update_checker module."""
 
+import asyncio
 import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -10,7 +11,10 @@ from src.update_checker import (
     check_for_updates,
     get_installed_version,
     get_latest_version,
+    get_update_snapshot,
     is_cache_valid,
+    refresh_updates,
+    update_refresher,
 )
 
 
@@ -260,3 +264,79 @@ async def test_check_for_updates_api_failure():
         assert result["latest_version"] is None
         assert result["update_check_error"] is not None
         assert isinstance(result["update_check_error"], str)
+
+
+def test_snapshot_before_first_check():
+    """Before any check the snapshot reports a pending check."""
+    import src.update_checker as update_checker_module
+
+    update_checker_module._update_cache = None
+    update_checker_module._cache_timestamp = None
+
+    snapshot = get_update_snapshot()
+    assert snapshot["latest_version"] is None
+    assert snapshot["update_available"] is False
+    assert snapshot["update_check_error"] == "Update check pending"
+
+
+def test_snapshot_never_refreshes():
+    """An expired snapshot is returned as is, without contacting PyPI."""
+    import src.update_checker as update_checker_module
+
+    update_checker_module._update_cache = {
+        "installed_version": "4.10.0",
+        "latest_version": "4.10.0",
+        "update_available": False,
+        "update_check_error": None,
+    }
+    update_checker_module._cache_timestamp = (
+        datetime.datetime.now() - datetime.timedelta(days=2)
+    )
+
+    with patch("src.update_checker.get_latest_version") as mock_latest:
+        assert get_update_snapshot()["latest_version"] == "4.10.0"
+    mock_latest.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_request():
+    """A burst of refreshes sends one request to PyPI."""
+
+    async def slow_latest():
+        await asyncio.sleep(0.05)
+        return "4.11.0"
+
+    with patch(
+        "src.update_checker.get_latest_version", side_effect=slow_latest
+    ) as mock_latest:
+        results = await asyncio.gather(*(refresh_updates() for _ in range(10)))
+
+    assert mock_latest.call_count == 1
+    assert {result["latest_version"] for result in results} == {"4.11.0"}
+    assert get_update_snapshot()["latest_version"] == "4.11.0"
+
+
+@pytest.mark.asyncio
+async def test_refresher_runs_on_schedule():
+    """The refresher checks at start and then every interval until stopped."""
+    with patch(
+        "src.update_checker.get_latest_version",
+        new_callable=AsyncMock,
+        return_value="4.11.0",
+    ) as mock_latest:
+        async with update_refresher(interval=0.02):
+            await asyncio.sleep(0.07)
+        calls = mock_latest.await_count
+        await asyncio.sleep(0.05)
+
+    assert calls >= 3
+    assert mock_latest.await_count == calls
+
+
+@pytest.mark.asyncio
+async def test_refresher_disabled():
+    """An interval of 0 disables background checks."""
+    with patch("src.update_checker.get_latest_version") as mock_latest:
+        async with update_refresher(interval=0):
+            await asyncio.sleep(0.01)
+    mock_latest.assert_not_called()
@@ -1,6 +1,19 @@
 """Tests for URL parser."""
 
-from src.url_parser import extract_shortcode, is_valid_instagram_url
+import pytest
+
+from src.url_parser import (
+    PostRef,
+    extract_hashtag,
+    extract_shortcode,
+    extract_username,
+    is_valid_instagram_url,
+    iter_post_links,
+    media_id_to_shortcode,
+    parse_post_ref,
+    parse_share_link,
+    shortcode_to_media_id,
+)
 
 
 def test_extract_shortcode_from_full_url():
@@ -38,3 +51,155 @@ def test_is_valid_instagram_url():
     assert is_valid_instagram_url("https://www.instagram.com/p/DRr-n4XER3x/") is True
     assert is_valid_instagram_url("DRr-n4XER3x") is True
     assert is_valid_instagram_url("https://example.com/post") is False
+
+
+def test_parse_post_ref_kinds():
+    """Post, reel and tv URLs keep their kind; bare shortcodes are posts."""
+    assert parse_post_ref("https://www.instagram.com/p/ABC123/") == PostRef(
+        "post", "ABC123"
+    )
+    assert parse_post_ref("https://instagram.com/reel/ABC123/?igsh=x") == PostRef(
+        "reel", "ABC123"
+    )
+    assert parse_post_ref("https://www.instagram.com/tv/ABC123") == PostRef(
+        "tv", "ABC123"
+    )
+    assert parse_post_ref("https://www.instagram.com/some.user/p/ABC123/") == PostRef(
+        "post", "ABC123"
+    )
+    assert parse_post_ref(" /ABC123/ ") == PostRef("post", "ABC123")
+    assert parse_post_ref("https://www.instagram.com/some.user/") is None
+    assert parse_post_ref("https") is None
+    assert parse_post_ref("two words") is None
+
+
+def test_post_ref_canonical_url_and_key():
+    """Every form of a post maps to one key; the URL is canonical per kind."""
+    post = parse_post_ref("https://instagram.com/p/ABC123?hl=en")
+    reel = parse_post_ref("https://www.instagram.com/reel/ABC123/")
+
+    assert post.url == "https://www.instagram.com/p/ABC123/"
+    assert reel.url == "https://www.instagram.com/reel/ABC123/"
+    assert post.key == reel.key == parse_post_ref("ABC123").key
+
+
+def test_parse_post_ref_is_memoized():
+    """Repeated parses of the same input are served from the memo."""
+    parse_post_ref.cache_clear()
+    first = parse_post_ref("https://www.instagram.com/p/MEMO1/")
+    assert parse_post_ref("https://www.instagram.com/p/MEMO1/") is first
+    assert parse_post_ref.cache_info().hits == 1
+
+
+def test_shortcode_media_id_round_trip():
+    """Shortcodes and media IDs convert both ways without a network call."""
+    assert shortcode_to_media_id("DRr-n4XER3x") == 3777388131940113905
+    assert media_id_to_shortcode(3777388131940113905) == "DRr-n4XER3x"
+    assert media_id_to_shortcode("3777388131940113905_25025320") == "DRr-n4XER3x"
+    assert shortcode_to_media_id("B") == 1
+
+
+def test_media_id_conversion_rejects_invalid_input():
+    """Over-long shortcodes and non-numeric IDs have no conversion."""
+    with pytest.raises(ValueError):
+        shortcode_to_media_id("DRr-n4XER3xLONGPRIVATE")
+    with pytest.raises(ValueError):
+        shortcode_to_media_id("bad!")
+    with pytest.raises(ValueError):
+        media_id_to_shortcode("12ab")
+    with pytest.raises(ValueError):
+        media_id_to_shortcode(0)
+
+
+def test_media_id_input_and_urls_share_a_key():
+    """/p/, /reel/, /tv/ and media ID inputs all map to the media ID key."""
+    refs = [
+        parse_post_ref("https://www.instagram.com/p/DRr-n4XER3x/"),
+        parse_post_ref("https://www.instagram.com/reel/DRr-n4XER3x/"),
+        parse_post_ref("https://www.instagram.com/tv/DRr-n4XER3x/"),
+        parse_post_ref("3777388131940113905"),
+        parse_post_ref(" 3777388131940113905_25025320 "),
+    ]
+    assert {ref.key for ref in refs} == {"3777388131940113905"}
+    assert refs[3] == PostRef("post", "DRr-n4XER3x")
+    # A shortcode without an ID form is its own key
+    assert parse_post_ref("DRr-n4XER3xLONGPRIVATE").key == "DRr-n4XER3xLONGPRIVATE"
+
+
+def test_iter_post_links():
+    """Links in free text are found once per post, in order of appearance."""
+    text = (
+        "first https://www.instagram.com/reel/ABC123/?igsh=x, then "
+        "instagram.com/p/ABC123 again and https://instagram.com/u.ser/tv/TV_1. "
+        "Not links: ABC999, notinstagram.com/p/NO1, https://example.com/p/NO2"
+    )
+    assert list(iter_post_links(text)) == [
+        PostRef("reel", "ABC123"),
+        PostRef("tv", "TV_1"),
+    ]
+
+
+def test_iter_post_links_across_chunks():
+    """Links split across chunk boundaries are found whatever the chunk size."""
+    text = (
+        "x " * 100 + "see https://www.instagram.com/p/SPLIT_1/ and instagram.com/p/END2"
+    )
+    expected = [PostRef("post", "SPLIT_1"), PostRef("post", "END2")]
+    for size in (1, 2, 7, 50, 1000):
+        chunks = (text[i : i + size] for i in range(0, len(text), size))
+        assert list(iter_post_links(chunks)) == expected
+
+
+def test_iter_post_links_is_lazy():
+    """Chunks are consumed only as far as needed to yield the next link."""
+    consumed = []
+
+    def chunks():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"line {i} https://www.instagram.com/p/CODE{i}/\n"
+
+    links = iter_post_links(chunks())
+    assert next(links) == PostRef("post", "CODE0")
+    assert len(consumed) == 1
+
+
+def test_extract_username():
+    """Test extracting usernames from profile URLs, handles and plain names."""
+    assert extract_username("https://www.instagram.com/Some.User_1/") == "some.user_1"
+    assert extract_username("https://instagram.com/someuser?hl=en") == "someuser"
+    assert extract_username("@someuser") == "someuser"
+    assert extract_username("someuser") == "someuser"
+    assert extract_username("https://www.instagram.com/p/DRr-n4XER3x/") is None
+    assert extract_username("https://example.com/someuser") is None
+    assert extract_username("not a user") is None
+
+
+def test_extract_hashtag():
+    """Test extracting hashtags from tag URLs, #tags and plain names."""
+    assert extract_hashtag("https://www.instagram.com/explore/tags/Sunset/") == "sunset"
+    assert extract_hashtag("#Sunset") == "sunset"
+    assert extract_hashtag("café") == "café"
+    assert extract_hashtag("https://www.instagram.com/p/DRr-n4XER3x/") is None
+    assert extract_hashtag("two words") is None
+
+
+def test_short_domain_is_parsed_locally():
+    """instagr.am links name the post directly."""
+    assert parse_post_ref("https://instagr.am/p/ABC123/") == PostRef("post", "ABC123")
+    assert parse_post_ref("instagr.am/reel/ABC123") == PostRef("reel", "ABC123")
+
+
+def test_parse_share_link():
+    """Share links are normalized but not parsed into a post."""
+    canonical = "https://www.instagram.com/share/reel/BAabc_-1/"
+    assert parse_share_link("https://instagram.com/share/reel/BAabc_-1?igsh=x") == (
+        canonical
+    )
+    assert parse_share_link(" www.instagram.com/share/reel/BAabc_-1/ ") == canonical
+    assert parse_share_link("https://www.instagram.com/share/Xy12") == (
+        "https://www.instagram.com/share/Xy12/"
+    )
+    assert parse_share_link("https://www.instagram.com/p/ABC123/") is None
+    assert parse_post_ref("https://www.instagram.com/share/reel/BAabc_-1/") is None
+    assert parse_post_ref("https://www.instagram.com/share/p/BAabc_-1/") is None